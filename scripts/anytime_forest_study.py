@@ -0,0 +1,72 @@
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.data.load_data import load_processed_data
+from src.features.feature_pipeline import build_feature_pipeline
+from src.models.anytime_forest import AnytimeForest
+from src.models.model import build_rf_model
+from src.utils.config import load_config, resolve_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy vs. trees evaluated for anytime RF inference")
+    parser.add_argument("--output", default=os.path.join(PROJECT_ROOT, "reports", "anytime_forest_study.txt"))
+    args = parser.parse_args()
+
+    config = load_config()
+    df = load_processed_data(resolve_path(config["data"]["processed_path"]))
+    X = df.drop(columns=["target"])
+    y = (df["target"] > 0).astype(int)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+
+    features = build_feature_pipeline(
+        config["preprocessing"]["numerical_features"], config["preprocessing"]["categorical_features"]
+    )
+    Xt_train = features.fit_transform(X_train)
+    Xt_test = np.asarray(features.transform(X_test))
+    forest = build_rf_model().set_params(n_jobs=1).fit(Xt_train, y_train)
+    full = forest.predict(Xt_test)
+
+    rows = []
+    # Fixed prefixes of the forest: the accuracy-vs-trees curve
+    for k in (1, 5, 10, 20, 50, 100, 150, 200):
+        proba = np.mean([tree.predict_proba(Xt_test)[:, 1] for tree in forest.estimators_[:k]], axis=0)
+        pred = (proba > 0.5).astype(int)
+        rows.append({"mode": f"first {k} trees", "accuracy": (pred == y_test).mean(),
+                     "agreement": (pred == full).mean(), "mean_trees": k})
+
+    # Anytime engine at several confidence levels
+    for delta in (0.0, 0.001, 0.01, 0.05, 0.1):
+        engine = AnytimeForest(forest, batch_size=10, delta=delta)
+        start = time.perf_counter()
+        proba, used = engine.predict_proba_anytime(Xt_test)
+        elapsed = time.perf_counter() - start
+        pred = proba.argmax(axis=1)
+        rows.append({"mode": f"anytime delta={delta}", "accuracy": (pred == y_test).mean(),
+                     "agreement": (pred == full).mean(), "mean_trees": used.mean(),
+                     "ms_per_batch": elapsed * 1000})
+
+    start = time.perf_counter()
+    forest.predict_proba(Xt_test)
+    rows.append({"mode": "sklearn predict_proba", "accuracy": (full == y_test).mean(), "agreement": 1.0,
+                 "mean_trees": len(forest.estimators_), "ms_per_batch": (time.perf_counter() - start) * 1000})
+
+    table = pd.DataFrame(rows).set_index("mode")
+    text = f"holdout rows={len(y_test)}\n\n" + table.to_string(float_format=lambda v: f"{v:.3f}") + "\n"
+    print(text)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    main()
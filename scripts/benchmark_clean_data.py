@@ -0,0 +1,102 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from src.data.load_data import load_raw_data
+from src.data.preprocess import clean_csv_in_chunks, clean_data
+from src.data.schema import EXPECTED_COLUMNS, MISSING_MARKERS
+
+
+def legacy_clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The replace -> apply(to_numeric) -> astype(str) implementation this
+    benchmark compares against.
+    """
+    df = df.replace(MISSING_MARKERS, np.nan)
+    df = df.apply(pd.to_numeric, errors="coerce")
+    if (df.astype(str) == "?").any().any():
+        raise ValueError("'?' still present after cleaning!")
+    return df
+
+
+def make_raw_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Synthetic raw frame shaped like the UCI file: numeric columns plus `ca`
+    and `thal` as strings with '?' markers.
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        rng.integers(0, 200, size=(n_rows, len(EXPECTED_COLUMNS))).astype(np.float64),
+        columns=EXPECTED_COLUMNS,
+    )
+    for col in ["ca", "thal"]:
+        values = df[col].astype(str).to_numpy(dtype=object)
+        values[rng.random(n_rows) < 0.02] = "?"
+        df[col] = values
+    return df
+
+
+def measure(func, *args):
+    """
+    Time one untraced call, then take peak memory from a second, traced call
+    (tracemalloc slows allocation-heavy code too much to time it).
+    """
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def legacy_read_and_clean(path):
+    return legacy_clean_data(pd.read_csv(path))
+
+
+def read_and_clean(path):
+    return clean_data(load_raw_data(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark clean_data against the legacy implementation")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    parser.add_argument("--skip-legacy", action="store_true", help="Legacy needs several GB at 10M rows")
+    args = parser.parse_args()
+
+    df = make_raw_frame(args.rows)
+    print(f"rows={args.rows:,}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        raw_path = os.path.join(tmpdir, "raw.csv")
+        df.to_csv(raw_path, index=False)
+
+        runs = [("clean_data (in memory)", clean_data, df)]
+        runs.append(("read_csv + clean_data", read_and_clean, raw_path))
+        if not args.skip_legacy:
+            runs.insert(0, ("legacy clean_data (in memory)", legacy_clean_data, df))
+            runs.insert(2, ("legacy read_csv + clean_data", legacy_read_and_clean, raw_path))
+
+        for name, func, arg in runs:
+            elapsed, peak_mb = measure(func, arg)
+            print(f"{name:<34} {elapsed:8.2f}s  peak {peak_mb:10.1f} MB")
+
+        out_path = os.path.join(tmpdir, "clean.csv")
+        elapsed, peak_mb = measure(clean_csv_in_chunks, raw_path, out_path, args.chunksize)
+        print(f"{'clean_csv_in_chunks':<34} {elapsed:8.2f}s  peak {peak_mb:10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
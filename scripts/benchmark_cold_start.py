@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Budgets for a fresh interpreter on a single CPU; the run fails when any
+# median exceeds its budget or the serving import pulls in a heavy module.
+IMPORT_BUDGET_MS = 1000
+STARTUP_BUDGET_MS = 5000
+LAZY_MODULES = ["sklearn", "scipy", "pandas", "joblib", "matplotlib", "mlflow"]
+
+# Time to import the API, then to load the model and answer one request
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.api.app
+imported = time.perf_counter()
+result = {"import_ms": (imported - start) * 1000,
+          "heavy_modules": [m for m in sys.argv[1].split(",") if m in sys.modules]}
+if sys.argv[2] == "1":
+    from src.models.predict import get_bundle, predict
+    bundle = get_bundle()
+    columns = bundle.get("raw_feature_names") or []
+    predict({column: 1.0 for column in columns})
+    result["startup_ms"] = (time.perf_counter() - start) * 1000
+print(json.dumps(result))
+"""
+
+
+def probe(with_model: bool) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE, ",".join(LAZY_MODULES), "1" if with_model else "0"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT,
+        env=env,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median(values: list) -> float:
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import and startup time of the serving API")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--skip-startup", action="store_true", help="Only measure the import (no model needed)")
+    args = parser.parse_args()
+
+    model_path = os.environ.get("MODEL_PATH", os.path.join(PROJECT_ROOT, "artifacts", "model.pkl"))
+    with_model = not args.skip_startup and os.path.exists(model_path)
+    if not args.skip_startup and not with_model:
+        print(f"No model at {model_path}; measuring the import only")
+
+    runs = [probe(with_model) for _ in range(args.repeats)]
+    failures = []
+
+    import_ms = median([run["import_ms"] for run in runs])
+    print(f"import src.api.app: median {import_ms:.0f} ms (budget {args.import_budget_ms:.0f} ms)")
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import took {import_ms:.0f} ms")
+
+    heavy = sorted({module for run in runs for module in run["heavy_modules"]})
+    if heavy:
+        failures.append(f"serving import loaded {', '.join(heavy)}")
+
+    if with_model:
+        startup_ms = median([run["startup_ms"] for run in runs])
+        print(f"import + model load + first prediction: median {startup_ms:.0f} ms (budget {args.startup_budget_ms:.0f} ms)")
+        if startup_ms > args.startup_budget_ms:
+            failures.append(f"startup took {startup_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"BUDGET EXCEEDED: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
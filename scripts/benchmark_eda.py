@@ -0,0 +1,78 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from benchmark_load_data import make_processed_frame
+from src.data.eda import compute_eda_stats, render_eda_figures
+from src.data.load_data import parquet_path_for, save_processed_data
+
+
+def legacy_eda(df, output_dir):
+    """
+    The previous whole-frame implementation, kept for comparison.
+    """
+    plt.figure(figsize=(6, 4))
+    sns.countplot(x="target", data=df)
+    plt.savefig(os.path.join(output_dir, "class_balance.png"))
+    plt.close()
+    df.hist(figsize=(16, 12), bins=20)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, "feature_histograms.png"))
+    plt.close()
+    plt.figure(figsize=(14, 10))
+    sns.heatmap(df.corr(), cmap="coolwarm")
+    plt.savefig(os.path.join(output_dir, "correlation_heatmap.png"))
+    plt.close()
+
+
+def measure(name, func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<36} {elapsed:8.2f}s  peak {peak / 1e6:9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EDA figure generation")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=500_000)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    df = make_processed_frame(args.rows)
+    print(f"rows={args.rows:,}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = os.path.join(tmpdir, "clean.csv")
+        save_processed_data(df, csv_path)
+
+        if not args.skip_legacy:
+            measure("legacy (in-memory frame)", legacy_eda, df, tmpdir)
+        del df
+
+        measure(
+            "streaming (parquet chunks)",
+            lambda: render_eda_figures(
+                compute_eda_stats(parquet_path_for(csv_path), "target", chunksize=args.chunksize),
+                tmpdir,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+
+from benchmark_load_data import make_processed_frame
+from src.data.load_data import compact_dtypes
+from src.features.feature_pipeline import feature_engineering_pipeline
+from src.utils.config import load_config
+
+
+def measure(name, func):
+    """
+    Time one untraced call, then take peak memory from a second, traced call.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nbytes = result.data.nbytes if hasattr(result, "toarray") else result.memory_usage(deep=True).sum() \
+        if hasattr(result, "memory_usage") else result.nbytes
+    print(f"{name:<38} {elapsed:7.2f}s  peak {peak / 1e6:9.1f} MB  output {nbytes / 1e6:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak-memory benchmark of the feature pipeline")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    config = load_config()
+    numeric_cols = config["preprocessing"]["numerical_features"]
+    categorical_cols = config["preprocessing"]["categorical_features"]
+
+    df = make_processed_frame(args.rows).drop(columns=["target"])
+    df_compact = compact_dtypes(df.copy())
+    print(f"rows={args.rows:,}")
+
+    measure(
+        "float64 frame -> DataFrame (default)",
+        lambda: feature_engineering_pipeline(df, numeric_cols, categorical_cols),
+    )
+    measure(
+        "compact frame -> float32 ndarray",
+        lambda: feature_engineering_pipeline(
+            df_compact, numeric_cols, categorical_cols, dtype=np.float32, as_frame=False
+        ),
+    )
+    measure(
+        "compact frame -> float32 sparse",
+        lambda: feature_engineering_pipeline(
+            df_compact, numeric_cols, categorical_cols, dtype=np.float32, sparse=True, as_frame=False
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
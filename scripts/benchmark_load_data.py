@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from src.data.load_data import (load_processed_data, load_raw_data,
+                                save_processed_data)
+from src.data.schema import COLUMN_SPECS
+
+
+def make_processed_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Synthetic processed frame drawn from each column's declared domain.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for spec in COLUMN_SPECS:
+        if spec.allowed is not None:
+            data[spec.name] = rng.choice(spec.allowed, size=n_rows).astype(np.float64)
+        else:
+            data[spec.name] = np.round(rng.uniform(spec.min_value, spec.max_value, n_rows), 1)
+    return pd.DataFrame(data)
+
+
+def measure(name, func, *args):
+    start = time.perf_counter()
+    df = func(*args)
+    elapsed = time.perf_counter() - start
+    memory_mb = df.memory_usage(deep=True).sum() / 1e6
+    print(f"{name:<32} {elapsed:8.3f}s  {memory_mb:9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark processed-data loading formats")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = make_processed_frame(args.rows)
+    print(f"rows={args.rows:,}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = os.path.join(tmpdir, "clean.csv")
+        save_processed_data(df, csv_path)
+
+        measure("pd.read_csv (untyped)", pd.read_csv, csv_path)
+        measure("load_raw_data (typed, c)", lambda p: load_raw_data(p, engine="c"), csv_path)
+        measure("load_raw_data (typed, pyarrow)", load_raw_data, csv_path)
+        measure("load_processed_data (parquet)", load_processed_data, csv_path)
+
+
+if __name__ == "__main__":
+    main()
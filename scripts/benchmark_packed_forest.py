@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+
+from src.data.load_data import load_processed_data
+from src.features.feature_pipeline import build_feature_pipeline
+from src.models.model import build_rf_model
+from src.models.packed_forest import PackedForest
+from src.utils.config import load_config, resolve_path
+
+
+def best_of(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Packed-array vs. sklearn random forest scoring throughput")
+    parser.add_argument("--sizes", default="1,10,100,1000,100000,1000000")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--output", default=os.path.join(PROJECT_ROOT, "reports", "packed_forest_benchmark.txt"))
+    args = parser.parse_args()
+
+    config = load_config()
+    df = load_processed_data(resolve_path(config["data"]["processed_path"]))
+    X = df.drop(columns=["target"])
+    y = (df["target"] > 0).astype(int)
+    features = build_feature_pipeline(
+        config["preprocessing"]["numerical_features"], config["preprocessing"]["categorical_features"]
+    )
+    Xt = np.asarray(features.fit_transform(X), dtype=np.float32)
+    forest = build_rf_model().set_params(n_jobs=1).fit(Xt, y)
+    packed = PackedForest(forest)
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for n_rows in (int(size) for size in args.sizes.split(",")):
+        batch = Xt[rng.integers(0, len(Xt), n_rows)]
+        repeats = 20 if n_rows <= 1000 else 1
+        sklearn_s, expected = best_of(lambda: forest.predict_proba(batch), repeats)
+        packed_s, actual = best_of(lambda: packed.predict_proba(batch, n_threads=args.threads), repeats)
+        rows.append({
+            "rows": n_rows,
+            "sklearn_ms": sklearn_s * 1000,
+            "packed_ms": packed_s * 1000,
+            "speedup": sklearn_s / packed_s,
+            "packed_rows_per_s": n_rows / packed_s,
+            "bit_identical": np.array_equal(expected, actual),
+        })
+        print(rows[-1])
+
+    table = pd.DataFrame(rows).set_index("rows")
+    text = (
+        f"trees={packed.n_trees} max_depth={packed.max_depth} packed_mb={packed.nbytes / 1e6:.2f} "
+        f"threads={args.threads} cpus={os.cpu_count()}\n\n"
+        + table.to_string(float_format=lambda v: f"{v:.3f}")
+        + "\n"
+    )
+    print(text)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import joblib
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from src.data.load_data import load_processed_data
+from src.features.feature_pipeline import build_feature_pipeline
+from src.models.model import build_rf_model
+from src.models.quantize import (artifact_footprint, quantization_parity,
+                                 quantize_bundle)
+from src.utils.config import load_config, resolve_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Holdout parity and footprint of quantized random forest artifacts")
+    parser.add_argument("--output", default=os.path.join(PROJECT_ROOT, "reports", "quantization_benchmark.txt"))
+    args = parser.parse_args()
+
+    config = load_config()
+    df = load_processed_data(resolve_path(config["data"]["processed_path"]))
+    X = df.drop(columns=["target"])
+    y = (df["target"] > 0).astype(int)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+    features = build_feature_pipeline(
+        config["preprocessing"]["numerical_features"], config["preprocessing"]["categorical_features"]
+    )
+    model = Pipeline(steps=[("features", features), ("model", build_rf_model())]).fit(X_train, y_train)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original_path = os.path.join(tmp, "model.pkl")
+        joblib.dump({"model": model}, original_path)
+        original = artifact_footprint(original_path)
+        rows = [{"variant": "sklearn", **original}]
+        for thresholds in ("float32", "codebook", "float16"):
+            for value_bits in (8, 16):
+                bundle = quantize_bundle({"model": model}, thresholds, value_bits)
+                path = os.path.join(tmp, f"model_{thresholds}_{value_bits}.pkl")
+                joblib.dump(bundle, path)
+                parity = quantization_parity(model, bundle["model"], X_test, y_test)
+                rows.append(
+                    {
+                        "variant": f"{thresholds}/{value_bits}-bit",
+                        **artifact_footprint(path),
+                        "label_agreement": parity["label_agreement"],
+                        "max_abs_proba_diff": parity["max_abs_proba_diff"],
+                        "roc_auc": parity["quantized_roc_auc"],
+                    }
+                )
+                print(rows[-1])
+
+    table = pd.DataFrame(rows).set_index("variant")
+    text = (
+        f"trees={len(model[-1].estimators_)} holdout_rows={len(X_test)} "
+        f"sklearn_roc_auc={parity['roc_auc']:.4f}\n\n"
+        + table.to_string(float_format=lambda v: f"{v:.4f}")
+        + "\n"
+    )
+    print(text)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    main()
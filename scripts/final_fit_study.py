@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold, cross_validate, train_test_split
+
+from src.data.load_data import load_processed_data
+from src.features.feature_pipeline import build_feature_pipeline
+from src.models.model import build_logestic_model, build_rf_model
+from src.models.train import model_from_folds
+from src.utils.config import load_config, resolve_path
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Final refit vs. fold ensemble vs. warm start from CV fits")
+    parser.add_argument("--output", default=os.path.join(PROJECT_ROOT, "reports", "final_fit_study.txt"))
+    args = parser.parse_args()
+
+    config = load_config()
+    df = load_processed_data(resolve_path(config["data"]["processed_path"]))
+    X = df.drop(columns=["target"])
+    y = (df["target"] > 0).astype(int)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+
+    # Same setup as training with the feature store: one shared transform
+    features = build_feature_pipeline(
+        config["preprocessing"]["numerical_features"], config["preprocessing"]["categorical_features"]
+    )
+    Xt_train = np.asarray(features.fit_transform(X_train), dtype=np.float32)
+    Xt_test = np.asarray(features.transform(X_test), dtype=np.float32)
+    cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+
+    rows = []
+    for name, model in {"Logistic Regression": build_logestic_model(), "Random Forest": build_rf_model()}.items():
+        cv_results, cv_seconds = timed(
+            lambda: cross_validate(model, Xt_train, y_train, cv=cv, scoring="roc_auc", return_estimator=True)
+        )
+        folds = cv_results["estimator"]
+        builders = {
+            "refit": lambda: clone(model).fit(Xt_train, y_train),
+            "fold_ensemble": lambda: model_from_folds(model, folds, "fold_ensemble"),
+            "warm_start": lambda: model_from_folds(model, folds, "warm_start", Xt_train, y_train),
+        }
+        for strategy, build in builders.items():
+            final, final_seconds = timed(build)
+            proba = final.predict_proba(Xt_test)[:, 1]
+            rows.append({
+                "model": name,
+                "final_fit": strategy,
+                "cv_s": cv_seconds,
+                "final_s": final_seconds,
+                "total_s": cv_seconds + final_seconds,
+                "holdout_roc_auc": roc_auc_score(y_test, proba),
+                "holdout_accuracy": accuracy_score(y_test, proba > 0.5),
+            })
+
+    table = pd.DataFrame(rows).set_index(["model", "final_fit"])
+    refit_total = table.xs("refit", level="final_fit")["total_s"]
+    table["saved_s"] = [refit_total[model] - total for (model, _), total in table["total_s"].items()]
+    table["saved_pct"] = [
+        100 * saved / refit_total[model] for (model, _), saved in table["saved_s"].items()
+    ]
+
+    text = f"train rows={len(y_train)} holdout rows={len(y_test)} cv folds={cv.n_splits}\n\n"
+    text += table.to_string(float_format=lambda v: f"{v:.3f}") + "\n"
+    print(text)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,42 @@
+import argparse
 import os
 import sys
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, PROJECT_ROOT)
 
-import yaml
-from src.data.download_data import download_dataset
-from src.data.load_data import load_raw_data
-from src.data.preprocess import preprocess_pipeline
-from src.data.eda import (
-    plot_class_balance,
-    plot_histograms,
-    plot_correlation_heatmap
-)
+from src.pipeline.stages import build_runner
+from src.utils.config import DATA_CONFIG_PATH
 
 
-def main():
-    with open("configs/data_config.yaml") as f:
-        config = yaml.safe_load(f)
-
-    raw_path = config["data"]["raw_path"]
-    processed_path = config["data"]["processed_path"]
-    figures_path = config["eda"]["figures_path"]
-
-    os.makedirs("data/processed", exist_ok=True)
-    os.makedirs(figures_path, exist_ok=True)
-
-    if not os.path.exists(raw_path):
-        download_dataset()
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Run the download -> preprocess -> EDA (-> train) pipeline, "
+        "skipping stages whose inputs have not changed."
+    )
+    parser.add_argument("--config", default=DATA_CONFIG_PATH)
+    parser.add_argument(
+        "--train", action="store_true", help="Also run model training"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-run stages even if up to date"
+    )
+    parser.add_argument("--workers", type=int, default=2)
+    return parser.parse_args()
 
-    df_raw = load_raw_data(raw_path)
 
-    df_clean = preprocess_pipeline(
-        df_raw,
-        config["preprocessing"]["categorical_features"],
-        config["preprocessing"]["numerical_features"]
-    )
+def main():
+    args = parse_args()
 
-    df_clean.to_csv(processed_path, index=False)
+    targets = ["download", "preprocess", "eda"]
+    if args.train:
+        targets.append("train")
 
-    plot_class_balance(df_clean, config["schema"]["target"], figures_path)
-    plot_histograms(df_clean, figures_path)
-    plot_correlation_heatmap(df_clean, figures_path)
+    runner = build_runner(config_path=args.config, max_workers=args.workers)
+    status = runner.run(targets=targets, force=args.force)
 
+    for name, outcome in status.items():
+        print(f"{name}: {outcome}")
     print(" Data pipeline executed successfully")
 
 
@@ -5,4 +5,10 @@ setup(
     version="0.1",
     packages=find_packages(),
     include_package_data=True,
+    entry_points={
+        "console_scripts": [
+            "heart-train=src.models.train:main",
+            "heart-retrain=src.models.incremental:main",
+        ],
+    },
 )
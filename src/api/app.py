@@ -1,13 +1,30 @@
+import asyncio
+import hmac
+import os
 import time
 import traceback
-from typing import Optional
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import List, Optional
 
 from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
 
-from src.models.predict import predict
+from src.models.predict import get_bundle, get_model_version, memory_usage, predict, predict_batch
+from src.monitoring.audit import get_audit_sink
+from src.monitoring.profiler import (
+    PROFILING_TOKEN_ENV_VAR,
+    CaptureInProgress,
+    collapsed_stacks,
+    sample_stacks,
+    top_functions,
+)
 from src.utils.logger import get_logger
+from src.utils.memory import peak_rss_bytes
 
 
 logger = get_logger(__name__)
@@ -25,8 +42,68 @@ PREDICTION_CONFIDENCE = Histogram(
     "Distribution of prediction confidence",
     buckets=[0.0, 0.25, 0.5, 0.75, 0.9, 1.0],
 )
+CASCADE_PREDICTIONS = Counter(
+    "cascade_predictions_total",
+    "Cascade predictions by the stage that produced them (fast or escalated)",
+    ["stage"],
+)
+INFERENCE_EXPIRED = Counter(
+    "inference_expired_total",
+    "Inference skipped because its deadline had passed when a worker picked it up",
+    ["endpoint"],
+)
+INFERENCE_CANCELLED = Counter(
+    "inference_cancelled_total",
+    "Queued inference cancelled because its deadline passed before a worker was free",
+    ["endpoint"],
+)
+BATCH_ROWS_EXPIRED = Counter(
+    "batch_rows_expired_total",
+    "Batch rows dropped unscored because the request deadline passed",
+)
+PEAK_RSS = Gauge("process_peak_resident_memory_bytes", "Highest resident memory of the serving process")
+SERVING_MEMORY = Gauge(
+    "serving_memory_bytes",
+    "Memory held by the model bundle (RSS added on load) and serving caches",
+    ["component"],
+)
+INFERENCE_ALLOCATION = Histogram(
+    "inference_peak_allocation_bytes",
+    "Peak Python/NumPy allocation while scoring a request (only with MEMORY_TRACE_REQUESTS)",
+    ["endpoint"],
+    buckets=[1e4, 1e5, 1e6, 4e6, 16e6, 64e6, 256e6],
+)
+
+# Tracing every allocation slows inference noticeably, so per-request
+# accounting is opt-in; figures are approximate when requests overlap.
+if os.environ.get("MEMORY_TRACE_REQUESTS") and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+# Inference runs off the event loop on a bounded pool; requests beyond its
+# size queue, and queued work whose deadline passes is cancelled.
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("INFERENCE_WORKERS", os.cpu_count() or 1)),
+    thread_name_prefix="inference",
+)
+
+
+def preload_model() -> None:
+    try:
+        get_bundle()
+    except Exception:  # pragma: no cover - the first request reports it
+        logger.exception("Model preload failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model (and the sklearn/pandas imports it needs) in the
+    # background so the server starts listening without waiting for it
+    if os.environ.get("PRELOAD_MODEL", "1") != "0":
+        _executor.submit(preload_model)
+    yield
+
 
-app = FastAPI(title="Heart Disease Risk API", version="0.1.0")
+app = FastAPI(title="Heart Disease Risk API", version="0.1.0", lifespan=lifespan)
 
 
 class PredictRequest(BaseModel):
@@ -48,6 +125,120 @@ class PredictRequest(BaseModel):
 class PredictResponse(BaseModel):
     prediction: int
     confidence: Optional[float] = None
+    # Only set when a cascade model served the request
+    escalated: Optional[bool] = None
+    # Only set when a random forest was served in anytime mode
+    trees_used: Optional[int] = None
+
+
+class BatchPredictResponse(BaseModel):
+    predictions: List[Optional[PredictResponse]]
+    validation: dict
+    # Rows dropped because the request deadline passed before they were scored
+    expired_rows: Optional[List[int]] = None
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def request_deadline(request: Request) -> Optional[float]:
+    """
+    The request's deadline as a ``time.perf_counter()`` value, taken from
+    ``X-Request-Deadline`` (Unix epoch seconds) or ``X-Request-Timeout``
+    (seconds from now). None when the client sent neither.
+    """
+    deadline = request.headers.get("X-Request-Deadline")
+    timeout = request.headers.get("X-Request-Timeout")
+    try:
+        if deadline is not None:
+            return time.perf_counter() + float(deadline) - time.time()
+        if timeout is not None:
+            return time.perf_counter() + float(timeout)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid deadline header") from None
+    return None
+
+
+def _start_before_deadline(endpoint: str, deadline: float, fn, *args):
+    if time.perf_counter() >= deadline:
+        INFERENCE_EXPIRED.labels(endpoint).inc()
+        raise DeadlineExceeded(endpoint)
+    return fn(*args)
+
+
+def _traced(endpoint: str, fn, *args):
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    try:
+        return fn(*args)
+    finally:
+        INFERENCE_ALLOCATION.labels(endpoint).observe(max(tracemalloc.get_traced_memory()[1] - base, 0))
+
+
+async def run_inference(endpoint: str, deadline: Optional[float], fn, *args):
+    """
+    Run ``fn(*args)`` on the inference pool. With a deadline, work still
+    queued when it passes is cancelled, and work picked up after it is
+    skipped; both raise DeadlineExceeded. Work already running is left to
+    finish (batches stop at their next chunk).
+    """
+    loop = asyncio.get_running_loop()
+    if tracemalloc.is_tracing():
+        fn, args = _traced, (endpoint, fn, *args)
+    if deadline is None:
+        return await loop.run_in_executor(_executor, fn, *args)
+
+    if time.perf_counter() >= deadline:
+        INFERENCE_EXPIRED.labels(endpoint).inc()
+        raise DeadlineExceeded(endpoint)
+    future = _executor.submit(_start_before_deadline, endpoint, deadline, fn, *args)
+    wrapped = asyncio.wrap_future(future)
+    try:
+        return await asyncio.wait_for(asyncio.shield(wrapped), max(deadline - time.perf_counter(), 0))
+    except asyncio.TimeoutError:
+        if future.cancel():
+            INFERENCE_CANCELLED.labels(endpoint).inc()
+            raise DeadlineExceeded(endpoint) from None
+        return await wrapped
+
+
+def deadline_exceeded(endpoint: str) -> HTTPException:
+    logger.warning("Deadline exceeded before %s inference started", endpoint)
+    return HTTPException(status_code=504, detail="Deadline exceeded")
+
+
+def audit_predictions(request: Request, endpoint: str, inputs: list, outputs: list, latency: float) -> None:
+    """
+    Queue one audit record per prediction; a no-op unless AUDIT_LOG_DIR is set.
+    """
+    sink = get_audit_sink()
+    if sink is None:
+        return
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    timestamp = datetime.now(timezone.utc).isoformat()
+    model_version = get_model_version()
+    for i, (record, output) in enumerate(zip(inputs, outputs)):
+        sink.submit(
+            {
+                "request_id": request_id if len(inputs) == 1 else f"{request_id}-{i}",
+                "timestamp": timestamp,
+                "endpoint": endpoint,
+                "model_version": model_version,
+                "inputs": record,
+                "output": output,
+                "latency_ms": round(latency * 1000, 3),
+            }
+        )
+
+
+def observe_prediction(result: dict) -> None:
+    confidence = result.get("confidence")
+    if confidence is not None:
+        PREDICTION_CONFIDENCE.observe(confidence)
+    escalated = result.get("escalated")
+    if escalated is not None:
+        CASCADE_PREDICTIONS.labels("escalated" if escalated else "fast").inc()
 
 
 @app.middleware("http")
@@ -83,19 +274,65 @@ async def health():
     return {"status": "ok"}
 
 
+def update_memory_gauges() -> None:
+    PEAK_RSS.set(peak_rss_bytes())
+    for component, value in memory_usage().items():
+        if value is not None:
+            SERVING_MEMORY.labels(component).set(value)
+
+
 @app.get("/metrics")
 def metrics():
+    update_memory_gauges()
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
-@app.post("/predict")
-async def predict_endpoint(input_data: PredictRequest) -> PredictResponse:
+MAX_PROFILE_SECONDS = 60
+
+
+@app.post("/admin/profile")
+async def profile_endpoint(request: Request, seconds: float = 10.0, top: int = 20):
+    """
+    Sample the live process's stacks for ``seconds`` and return them in
+    collapsed (flamegraph) format with a top-``top`` summary of functions in
+    the prediction path, sklearn and pandas. Only exists when
+    $PROFILING_TOKEN is set, and requires it in ``X-Profiling-Token``.
+    """
+    token = os.environ.get(PROFILING_TOKEN_ENV_VAR)
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(request.headers.get("X-Profiling-Token", ""), token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise HTTPException(status_code=422, detail=f"seconds must be in (0, {MAX_PROFILE_SECONDS}]")
+
+    try:
+        capture = await asyncio.to_thread(sample_stacks, seconds)
+    except CaptureInProgress as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return {
+        "seconds": seconds,
+        "samples": capture["samples"],
+        "idle_samples": capture["idle"],
+        "top": top_functions(capture["stacks"], n=top),
+        "collapsed": collapsed_stacks(capture["stacks"]),
+    }
+
+
+@app.post("/predict", response_model_exclude_unset=True)
+async def predict_endpoint(input_data: PredictRequest, request: Request) -> PredictResponse:
     try:
-        result = predict(input_data.model_dump())
-        confidence = result.get("confidence")
-        if confidence is not None:
-            PREDICTION_CONFIDENCE.observe(confidence)
+        start_time = time.perf_counter()
+        deadline = request_deadline(request)
+        inputs = input_data.model_dump()
+        result = await run_inference("/predict", deadline, predict, inputs, deadline)
+        audit_predictions(request, "/predict", [inputs], [result], time.perf_counter() - start_time)
+        observe_prediction(result)
         return PredictResponse(**result)
+    except HTTPException:
+        raise
+    except DeadlineExceeded as exc:
+        raise deadline_exceeded("/predict") from exc
     except FileNotFoundError as exc:  # pragma: no cover - runtime guard
         logger.error("Model artifact not found: %s", exc)
         raise HTTPException(
@@ -105,3 +342,46 @@ async def predict_endpoint(input_data: PredictRequest) -> PredictResponse:
     except Exception as exc:  # pragma: no cover - runtime guard
         logger.exception("Prediction failed: %s", traceback.format_exc())
         raise HTTPException(status_code=500, detail="Prediction failed") from exc
+
+
+@app.post("/predict/batch", response_model=BatchPredictResponse, response_model_exclude_unset=True)
+async def predict_batch_endpoint(request: Request):
+    """
+    Bulk scoring. The body is ``{"records": [{...}, ...]}``; records are
+    validated together by the schema engine rather than one pydantic model
+    per row.
+    """
+    payload = await request.json()
+    records = payload.get("records") if isinstance(payload, dict) else None
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise HTTPException(
+            status_code=422, detail="Body must be an object with a 'records' list"
+        )
+
+    try:
+        start_time = time.perf_counter()
+        deadline = request_deadline(request)
+        result = await run_inference("/predict/batch", deadline, predict_batch, records, deadline)
+        audit_predictions(
+            request, "/predict/batch", records, result["predictions"], time.perf_counter() - start_time
+        )
+    except HTTPException:
+        raise
+    except DeadlineExceeded as exc:
+        raise deadline_exceeded("/predict/batch") from exc
+    except FileNotFoundError as exc:  # pragma: no cover - runtime guard
+        logger.error("Model artifact not found: %s", exc)
+        raise HTTPException(
+            status_code=500,
+            detail="Model artifact missing. Run training to generate artifacts/model.pkl",
+        ) from exc
+    except Exception as exc:  # pragma: no cover - runtime guard
+        logger.exception("Batch prediction failed: %s", traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Prediction failed") from exc
+
+    for row in result["predictions"]:
+        if row is not None:
+            observe_prediction(row)
+    if result.get("expired_rows"):
+        BATCH_ROWS_EXPIRED.inc(len(result["expired_rows"]))
+    return result
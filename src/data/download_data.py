@@ -1,18 +1,45 @@
+import hashlib
+import http.client
+import json
 import os
+import shutil
+import tempfile
+import threading
+import time
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
-import pandas as pd
+from src.utils.hashing import hash_file
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 # Get project root directory (heart-disease-mlops)
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
 RAW_DATA_DIR = os.path.join(PROJECT_ROOT, "data", "raw")
 OUTPUT_FILE = "heart_disease.csv"
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "downloads")
+
+UCI_BASE_URL = "https://archive.ics.uci.edu/ml/machine-learning-databases/heart-disease/"
+
+# The processed subsets in the UCI directory, by source name
+UCI_SOURCES = {
+    "cleveland": UCI_BASE_URL + "processed.cleveland.data",
+    "hungarian": UCI_BASE_URL + "processed.hungarian.data",
+    "switzerland": UCI_BASE_URL + "processed.switzerland.data",
+    "va": UCI_BASE_URL + "processed.va.data",
+}
+
+DATA_URL = UCI_SOURCES["cleveland"]
 
-DATA_URL = (
-    "https://archive.ics.uci.edu/ml/machine-learning-databases/"
-    "heart-disease/processed.cleveland.data"
-)
+# Overrides the configured mirror, e.g. an internal artifact proxy
+MIRROR_ENV_VAR = "HEART_DATA_MIRROR_URL"
+
+# Read size for streaming downloads and copies
+CHUNK_SIZE = 64 * 1024
+INDEX_FILE = "index.json"
 
 
 COLUMN_NAMES = [
@@ -33,16 +60,326 @@ COLUMN_NAMES = [
 ]
 
 
-def download_dataset():
-    os.makedirs(RAW_DATA_DIR, exist_ok=True)
-    output_path = os.path.join(RAW_DATA_DIR, OUTPUT_FILE)
+class DownloadError(RuntimeError):
+    """Raised when a file cannot be fetched from any candidate URL."""
+
+
+class ChecksumError(ValueError):
+    """Raised when downloaded content does not match the expected SHA-256."""
+
+
+TRANSPORT_ERRORS = (OSError, http.client.HTTPException, DownloadError)
+
+
+class DownloadCache:
+    """
+    Content-addressed store of downloaded files.
+
+    Objects live under ``objects/<sha256[:2]>/<sha256>``. An index maps each
+    source URL to the digest it last produced and the response's HTTP
+    validators (ETag, Last-Modified), which ``fetch`` uses to revalidate a
+    URL seen before with a conditional request. Objects are re-hashed on
+    every read, so a corrupted entry is dropped rather than reused. Index
+    updates are serialized, so one cache can serve concurrent fetches.
+    """
+
+    def __init__(self, root: str = CACHE_DIR):
+        self.root = root
+        self._index_lock = threading.Lock()
+
+    def object_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "objects", sha256[:2], sha256)
+
+    def partial_path(self, url: str) -> str:
+        name = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.root, "partial", name)
+
+    def entry(self, url: str) -> dict:
+        """
+        Index entry for ``url`` ({"sha256", and "etag"/"last_modified" when
+        the server sent them}), or None.
+        """
+        entry = self._load_index().get(url)
+        # Older indexes stored the bare digest
+        return {"sha256": entry} if isinstance(entry, str) else entry
+
+    def lookup(self, url: str = None, sha256: str = None):
+        """
+        Return the path of a verified cached object, or None.
+        """
+        sha256 = sha256 or (self.entry(url) or {}).get("sha256")
+        if not sha256:
+            return None
+        path = self.object_path(sha256)
+        if not os.path.exists(path):
+            return None
+        if hash_file(path) != sha256:
+            logger.warning("Cached object %s is corrupt, discarding it", sha256)
+            os.remove(path)
+            return None
+        return path
+
+    def add(self, src_path: str, sha256: str, url: str, validators: dict = None) -> str:
+        path = self.object_path(sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(src_path, path)
+        with self._index_lock:
+            index = self._load_index()
+            index[url] = {"sha256": sha256, **(validators or {})}
+            self._save_index(index)
+        return path
+
+    def _load_index(self) -> dict:
+        path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_index(self, index: dict) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = os.path.join(self.root, f"{INDEX_FILE}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(self.root, INDEX_FILE))
+
+
+def _response_validators(headers) -> dict:
+    validators = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+    return {key: value for key, value in validators.items() if value}
+
+
+def _load_validators(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _discard_partial(part_path: str) -> None:
+    for path in (part_path, part_path + ".json"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _fetch_once(url: str, part_path: str, timeout: float, cached: dict = None, verified: bool = False):
+    """
+    Stream ``url`` into ``part_path``, resuming from its current size with
+    an HTTP Range request. The validators of the response the partial
+    bytes came from are kept next to them and sent as ``If-Range``, so a
+    resource that changed since is sent whole rather than spliced; without
+    one, partial bytes are resumed only when the caller ``verified`` the
+    result against a checksum. With ``cached`` (validators of a cached
+    copy) a fresh request is conditional, and None is returned when the
+    server answers 304 Not Modified. Otherwise returns the validators of
+    the downloaded content. Raises on any transport error or short read.
+    """
+    meta_path = part_path + ".json"
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    partial = _load_validators(meta_path)
+    if_range = partial.get("etag") or partial.get("last_modified")
+    if offset and not (if_range or verified):
+        logger.info("Discarding unvalidated partial download of %s", url)
+        _discard_partial(part_path)
+        offset = 0
+
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+        if if_range:
+            request.add_header("If-Range", if_range)
+    elif cached:
+        if cached.get("etag"):
+            request.add_header("If-None-Match", cached["etag"])
+        if cached.get("last_modified"):
+            request.add_header("If-Modified-Since", cached["last_modified"])
+
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304 and cached and not offset:
+            return None
+        if exc.code == 416 and offset:
+            # The partial file is stale or larger than the resource; start over.
+            _discard_partial(part_path)
+        raise
+
+    with response:
+        if offset and response.status == 206:
+            mode = "ab"
+            logger.info("Resuming %s from byte %d", url, offset)
+        else:
+            mode = "wb"
+            offset = 0
+            partial = _response_validators(response.headers)
+            with open(meta_path, "w") as f:
+                json.dump(partial, f)
+        length = response.headers.get("Content-Length")
+        expected = int(length) if length is not None else None
+
+        received = 0
+        with open(part_path, mode) as f:
+            for block in iter(lambda: response.read(CHUNK_SIZE), b""):
+                f.write(block)
+                received += len(block)
+
+    if expected is not None and received < expected:
+        raise DownloadError(f"Short read from {url}: {offset + received} bytes, expected {offset + expected}")
+    return partial
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code >= 500 or exc.code in (408, 416, 429)
+    return True
+
+
+def _fetch_with_retries(
+    url: str, part_path: str, retries: int, backoff: float, timeout: float, cached: dict = None, verified: bool = False
+):
+    for attempt in range(retries + 1):
+        try:
+            return _fetch_once(url, part_path, timeout, cached=cached, verified=verified)
+        except TRANSPORT_ERRORS as exc:
+            if attempt == retries or not _is_retryable(exc):
+                raise
+            delay = backoff * 2**attempt
+            logger.warning("Attempt %d for %s failed (%s), retrying in %.1fs", attempt + 1, url, exc, delay)
+            time.sleep(delay)
+
+
+def fetch(
+    url: str,
+    sha256: str = None,
+    mirror_url: str = None,
+    cache: DownloadCache = None,
+    retries: int = 3,
+    backoff: float = 0.5,
+    timeout: float = 30.0,
+) -> str:
+    """
+    Return a local, verified path for ``url``, downloading it if needed.
+
+    With ``sha256`` the cached object of that digest is used as is. A
+    copy cached by URL alone is revalidated with a conditional request on
+    its ETag/Last-Modified and kept while the server answers 304 (or
+    cannot be reached); a changed resource is downloaded again. The
+    mirror, then the primary URL, are tried in turn, each with
+    ``retries`` resumable attempts and exponential backoff.
+    """
+    cache = cache or DownloadCache()
+    validators = None
+    if sha256:
+        cached = cache.lookup(sha256=sha256)
+        if cached:
+            logger.info("Using cached copy of %s", url)
+            return cached
+    else:
+        entry = cache.entry(url) or {}
+        cached = cache.lookup(sha256=entry.get("sha256")) if entry else None
+        validators = {key: entry[key] for key in ("etag", "last_modified") if key in entry} if cached else None
+
+    errors, mismatches = [], []
+    for candidate in [u for u in (mirror_url, url) if u]:
+        part_path = cache.partial_path(candidate)
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+        try:
+            fetched = _fetch_with_retries(
+                candidate, part_path, retries, backoff, timeout, cached=validators, verified=bool(sha256)
+            )
+        except TRANSPORT_ERRORS as exc:
+            logger.warning("Giving up on %s: %s", candidate, exc)
+            errors.append(f"{candidate}: {exc}")
+            continue
+        if fetched is None:
+            logger.info("Cached copy of %s is up to date", url)
+            return cached
+
+        digest = hash_file(part_path)
+        if sha256 and digest != sha256:
+            _discard_partial(part_path)
+            logger.warning("Checksum mismatch for %s: got %s", candidate, digest)
+            mismatches.append(f"{candidate}: got {digest}")
+            continue
+        logger.info("Downloaded %s (sha256 %s)", candidate, digest)
+        path = cache.add(part_path, digest, url, fetched)
+        _discard_partial(part_path)
+        return path
+
+    if cached and not mismatches:
+        logger.warning("Could not revalidate %s (%s); using the cached copy", url, "; ".join(errors))
+        return cached
+    if mismatches:
+        raise ChecksumError(f"Checksum mismatch for {url}, expected {sha256}: " + "; ".join(mismatches))
+    raise DownloadError(f"Could not download {url}: " + "; ".join(errors))
+
+
+def write_with_header(src_path: str, output_path: str, columns: list = COLUMN_NAMES) -> None:
+    """
+    Copy a headerless CSV to ``output_path`` with a header line prepended,
+    streaming the bytes rather than parsing and rewriting the data.
+    """
+    out_dir = os.path.dirname(output_path) or "."
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as dst, open(src_path, "rb") as src:
+            dst.write((",".join(columns) + "\n").encode())
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def download_dataset(
+    url: str = DATA_URL,
+    output_path: str = None,
+    sha256: str = None,
+    mirror_url: str = None,
+    cache_dir: str = None,
+) -> str:
+    output_path = output_path or os.path.join(RAW_DATA_DIR, OUTPUT_FILE)
+    mirror_url = os.environ.get(MIRROR_ENV_VAR) or mirror_url
+    cache = DownloadCache(cache_dir or CACHE_DIR)
+
+    source = fetch(url, sha256=sha256, mirror_url=mirror_url, cache=cache)
+    write_with_header(source, output_path)
+    logger.info("Dataset with column headers written to %s", output_path)
+    return output_path
+
+
+def download_sources(sources: dict, output_dir: str, cache_dir: str = None, max_workers: int = 4) -> dict:
+    """
+    Fetch one raw file per named source concurrently and write each to
+    ``<output_dir>/<name>.csv`` with the column header. ``sources`` maps a
+    name to its URL, or to a dict with ``url`` and optional ``sha256`` and
+    ``mirror_url``. Every source is attempted; failures are raised together
+    as one DownloadError. Returns {name: output path}.
+    """
+    cache = DownloadCache(cache_dir or CACHE_DIR)
+    specs = {name: spec if isinstance(spec, dict) else {"url": spec} for name, spec in sources.items()}
 
-    urllib.request.urlretrieve(DATA_URL, output_path)
-    print(f"Dataset downloaded to {output_path}")
+    def download(name: str) -> str:
+        spec = specs[name]
+        source = fetch(spec["url"], sha256=spec.get("sha256"), mirror_url=spec.get("mirror_url"), cache=cache)
+        output_path = os.path.join(output_dir, f"{name}.csv")
+        write_with_header(source, output_path)
+        return output_path
 
-    df = pd.read_csv(output_path, header=None, names=COLUMN_NAMES)
-    df.to_csv(output_path, index=False)
-    print("Column headers added successfully")
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(specs)))) as pool:
+        futures = {name: pool.submit(download, name) for name in specs}
+    paths, errors = {}, []
+    for name, future in futures.items():
+        try:
+            paths[name] = future.result()
+        except (DownloadError, ChecksumError) as exc:
+            errors.append(f"{name}: {exc}")
+    if errors:
+        raise DownloadError("Could not download every source: " + "; ".join(errors))
+    logger.info("Downloaded %d sources to %s", len(paths), output_dir)
+    return paths
 
 
 if __name__ == "__main__":
@@ -1,34 +1,246 @@
+import math
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 import seaborn as sns
+from matplotlib.figure import Figure
 
+from src.data.load_data import iter_raw_chunks
+from src.data.schema import COLUMN_SPECS
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+HISTOGRAM_BINS = 20
+
+_SPECS = {spec.name: spec for spec in COLUMN_SPECS}
+
+
+def _default_range(col: str):
+    """
+    Fixed histogram range for a column from its declared domain, if any.
+    """
+    spec = _SPECS.get(col)
+    if spec is None:
+        return None
+    if spec.allowed is not None:
+        return min(spec.allowed) - 0.5, max(spec.allowed) + 0.5
+    if spec.min_value is not None and spec.max_value is not None:
+        return float(spec.min_value), float(spec.max_value)
+    return None
+
+
+class StreamingStats:
+    """
+    Single-pass EDA aggregates over a stream of chunks: class counts,
+    fixed-bin histograms and the moments needed for a pairwise-complete
+    Pearson correlation matrix (the same definition as ``DataFrame.corr``).
+
+    Histogram edges span ``ranges`` (``compute_eda_stats`` passes the
+    observed min/max), else the schema's declared domain, else the first
+    chunk's values; values outside the edges are counted in the outermost
+    bins.
+    """
+
+    def __init__(self, target_col: str, bins: int = HISTOGRAM_BINS, ranges: dict = None):
+        self.target_col = target_col
+        self.bins = bins
+        self.ranges = ranges or {}
+        self.columns = None
+        self.n_rows = 0
+        self.class_counts = pd.Series(dtype="int64")
+        self.edges = {}
+        self.hist_counts = {}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if self.columns is None:
+            self._init(chunk)
+        X = chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.n_rows += len(X)
+
+        counts = chunk[self.target_col].value_counts(dropna=True)
+        self.class_counts = self.class_counts.add(counts, fill_value=0).astype("int64")
+
+        for j, col in enumerate(self.columns):
+            values = X[:, j]
+            values = values[~np.isnan(values)]
+            edges = self.edges[col]
+            idx = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, self.bins - 1)
+            self.hist_counts[col] += np.bincount(idx, minlength=self.bins)
+
+        present = ~np.isnan(X)
+        M = present.astype(np.float64)
+        Xc = np.where(present, X - self._shift, 0.0)
+        self._n += M.T @ M
+        self._sum += Xc.T @ M
+        self._sumsq += (Xc * Xc).T @ M
+        self._cross += Xc.T @ Xc
+
+    def correlation(self) -> pd.DataFrame:
+        n, s, ss, p = self._n, self._sum, self._sumsq, self._cross
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = n * p - s * s.T
+            var_i = n * ss - s * s
+            corr = cov / np.sqrt(var_i * var_i.T)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def histogram(self, col: str) -> tuple:
+        return self.hist_counts[col], self.edges[col]
+
+    def _init(self, chunk: pd.DataFrame) -> None:
+        self.columns = _numeric_columns(chunk)
+        X = chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        k = len(self.columns)
+
+        for j, col in enumerate(self.columns):
+            lo_hi = self.ranges.get(col) or _default_range(col)
+            if lo_hi is None:
+                finite = X[:, j][~np.isnan(X[:, j])]
+                lo_hi = (finite.min(), finite.max()) if len(finite) else (0.0, 1.0)
+            lo, hi = lo_hi
+            if hi <= lo:
+                lo, hi = lo - 0.5, hi + 0.5
+            self.edges[col] = np.linspace(lo, hi, self.bins + 1)
+            self.hist_counts[col] = np.zeros(self.bins, dtype=np.int64)
+
+        # Shifting by a first-chunk estimate of the mean keeps the raw moment
+        # sums small and avoids cancellation in the variance terms.
+        with np.errstate(invalid="ignore"):
+            shift = np.nanmean(X, axis=0) if len(X) else np.zeros(k)
+        self._shift = np.nan_to_num(shift)
+        self._n = np.zeros((k, k))
+        self._sum = np.zeros((k, k))
+        self._sumsq = np.zeros((k, k))
+        self._cross = np.zeros((k, k))
+
+
+def _iter_chunks(source, chunksize: int):
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+    elif str(source).endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from iter_raw_chunks(source, chunksize=chunksize)
+
+
+def _numeric_columns(chunk: pd.DataFrame) -> list:
+    return [col for col in chunk.columns if chunk[col].dtype.kind in "biuf"]
+
+
+def observed_ranges(source, chunksize: int = 500_000) -> dict:
+    """
+    Per-column (min, max) of the values in ``source``, for histogram edges
+    that fit the data. A declared schema domain only clamps the range, so
+    out-of-domain values still land in the outermost bins.
+    """
+    low = high = None
+    for chunk in _iter_chunks(source, chunksize):
+        numeric = chunk[_numeric_columns(chunk)].astype(np.float64)
+        low = numeric.min() if low is None else np.fmin(low, numeric.min())
+        high = numeric.max() if high is None else np.fmax(high, numeric.max())
+
+    ranges = {}
+    for col in [] if low is None else low.index:
+        lo, hi = low[col], high[col]
+        if np.isnan(lo):
+            continue
+        spec = _SPECS.get(col)
+        if spec is not None and spec.allowed is not None:
+            # Categorical codes sit in the middle of their bins
+            lo, hi = lo - 0.5, hi + 0.5
+        domain = _default_range(col)
+        if domain is not None:
+            lo, hi = np.clip([lo, hi], *domain)
+        ranges[col] = (float(lo), float(hi))
+    return ranges
+
+
+def compute_eda_stats(source, target_col: str, chunksize: int = 500_000, bins: int = HISTOGRAM_BINS):
+    """
+    Stream a DataFrame, CSV or Parquet file and return its StreamingStats.
+    A first pass reads only each column's min/max for the histogram edges.
+    """
+    logger.info("Computing streaming EDA statistics")
+    stats = StreamingStats(target_col, bins=bins, ranges=observed_ranges(source, chunksize))
+    for chunk in _iter_chunks(source, chunksize):
+        stats.update(chunk)
+    logger.info("Aggregated %d rows", stats.n_rows)
+    return stats
+
+
+def render_class_balance(stats: StreamingStats, output_dir: str) -> str:
+    fig = Figure(figsize=(6, 4))
+    ax = fig.add_subplot()
+    counts = stats.class_counts.sort_index()
+    sns.barplot(x=[str(int(v)) if float(v).is_integer() else str(v) for v in counts.index], y=counts.to_numpy(), ax=ax)
+    ax.set_xlabel(stats.target_col)
+    ax.set_ylabel("count")
+    ax.set_title("Target Class Distribution")
+    path = os.path.join(output_dir, "class_balance.png")
+    fig.savefig(path)
+    return path
+
+
+def render_histograms(stats: StreamingStats, output_dir: str) -> str:
+    fig = Figure(figsize=(16, 12))
+    n_cols = math.ceil(math.sqrt(len(stats.columns)))
+    n_rows = math.ceil(len(stats.columns) / n_cols)
+    for i, col in enumerate(stats.columns):
+        ax = fig.add_subplot(n_rows, n_cols, i + 1)
+        counts, edges = stats.histogram(col)
+        ax.stairs(counts, edges, fill=True)
+        ax.set_title(col)
+        ax.grid(True)
+    fig.tight_layout()
+    path = os.path.join(output_dir, "feature_histograms.png")
+    fig.savefig(path)
+    return path
+
+
+def render_correlation_heatmap(stats: StreamingStats, output_dir: str) -> str:
+    fig = Figure(figsize=(14, 10))
+    ax = fig.add_subplot()
+    sns.heatmap(stats.correlation(), cmap="coolwarm", ax=ax)
+    ax.set_title("Correlation Heatmap")
+    path = os.path.join(output_dir, "correlation_heatmap.png")
+    fig.savefig(path)
+    return path
+
+
+RENDERERS = [render_class_balance, render_histograms, render_correlation_heatmap]
+
+
+def render_eda_figures(stats: StreamingStats, output_dir: str, max_workers: int = None) -> list:
+    """
+    Render every EDA figure from the aggregates, in parallel processes
+    (one per figure, capped at the CPU count). Figures are drawn on
+    standalone Agg figures, never through pyplot.
+    """
+    if max_workers is None:
+        max_workers = min(len(RENDERERS), os.cpu_count() or 1)
+    if max_workers <= 1:
+        return [render(stats, output_dir) for render in RENDERERS]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(render, stats, output_dir) for render in RENDERERS]
+        return [future.result() for future in futures]
+
 
 def plot_class_balance(df, target_col, output_dir):
     logger.info("Creating class balance plot")
-    plt.figure(figsize=(6, 4))
-    sns.countplot(x=target_col, data=df)
-    plt.title("Target Class Distribution")
-    plt.savefig(os.path.join(output_dir, "class_balance.png"))
-    plt.close()
+    render_class_balance(compute_eda_stats(df, target_col), output_dir)
 
 
 def plot_histograms(df, output_dir):
     logger.info("Creating feature histograms")
-    df.hist(figsize=(16, 12), bins=20)
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "feature_histograms.png"))
-    plt.close()
+    render_histograms(compute_eda_stats(df, target_col=df.columns[-1]), output_dir)
 
 
 def plot_correlation_heatmap(df, output_dir):
     logger.info("Creating correlation heatmap")
-    plt.figure(figsize=(14, 10))
-    sns.heatmap(df.corr(), cmap="coolwarm")
-    plt.title("Correlation Heatmap")
-    plt.savefig(os.path.join(output_dir, "correlation_heatmap.png"))
-    plt.close()
+    render_correlation_heatmap(compute_eda_stats(df, target_col=df.columns[-1]), output_dir)
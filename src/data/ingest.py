@@ -0,0 +1,114 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.data.load_data import (load_processed_data, load_raw_data,
+                                save_processed_data)
+from src.data.preprocess import clean_data, impute_missing, validate_data
+from src.data.schema import EXPECTED_COLUMNS, SOURCE_COLUMN
+from src.utils.hashing import hash_file
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+# Measurements some sources record as 0 when they were not taken (all of
+# Switzerland's cholesterol values, for example)
+ZERO_MEANS_MISSING = ["trestbps", "chol"]
+
+
+def normalize_source(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    """
+    Put one source's rows onto EXPECTED_COLUMNS (absent columns become
+    missing, extra ones are dropped), coerce them to numbers, turn
+    physiologically impossible zeros into missing values and tag every row
+    with the source's name.
+    """
+    df = clean_data(df.reindex(columns=EXPECTED_COLUMNS))
+    for col in ZERO_MEANS_MISSING:
+        df[col] = df[col].mask(df[col] == 0)
+    df[SOURCE_COLUMN] = name
+    return df
+
+
+def parse_source(raw_path: str, name: str) -> pd.DataFrame:
+    df = normalize_source(load_raw_data(raw_path), name)
+    validate_data(df)
+    logger.info("Parsed %d rows from source %s", len(df), name)
+    return df
+
+
+def load_manifest(directory: str) -> dict:
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(directory: str, manifest: dict) -> None:
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_FILE))
+
+
+def ingest_sources(
+    raw_paths: dict, processed_path: str, partitions_dir: str, numeric_cols: list, max_workers: int = 4
+) -> dict:
+    """
+    Merge per-source raw files ({name: path}) into the processed store.
+
+    Each source is kept as its own normalized partition under
+    ``partitions_dir``, with a manifest of the raw file's SHA-256 it was
+    built from. Only sources whose raw file changed (or whose partition is
+    missing) are parsed again, concurrently; the partitions are then
+    concatenated in ``raw_paths`` order, numeric gaps are imputed across
+    all of them and the result is written to ``processed_path``.
+
+    Returns {name: {"sha256", "rows", "status"}} with status "processed"
+    or "unchanged".
+    """
+    manifest = load_manifest(partitions_dir)
+    digests = {name: hash_file(path) for name, path in raw_paths.items()}
+    partition_paths = {name: os.path.join(partitions_dir, f"{name}.csv") for name in raw_paths}
+    changed = [
+        name
+        for name in raw_paths
+        if manifest.get(name, {}).get("sha256") != digests[name] or not os.path.exists(partition_paths[name])
+    ]
+
+    if changed:
+        os.makedirs(partitions_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(changed)))) as pool:
+            parsed = dict(zip(changed, pool.map(lambda name: parse_source(raw_paths[name], name), changed)))
+        for name, df in parsed.items():
+            save_processed_data(df, partition_paths[name])
+            manifest[name] = {"sha256": digests[name], "rows": len(df)}
+        save_manifest(partitions_dir, manifest)
+
+    df = pd.concat([load_processed_data(partition_paths[name]) for name in raw_paths], ignore_index=True)
+    df = impute_missing(df, [col for col in numeric_cols if df[col].notna().any()])
+    os.makedirs(os.path.dirname(processed_path) or ".", exist_ok=True)
+    save_processed_data(df, processed_path)
+
+    summary = {
+        name: {
+            "sha256": digests[name],
+            "rows": manifest[name]["rows"],
+            "status": "processed" if name in changed else "unchanged",
+        }
+        for name in raw_paths
+    }
+    logger.info(
+        "Ingested %d rows from %d sources (%d reprocessed) into %s",
+        len(df),
+        len(raw_paths),
+        len(changed),
+        processed_path,
+    )
+    return summary
@@ -1,12 +1,155 @@
+import functools
+import glob
+import os
+
 import pandas as pd
 
+from src.data.schema import COLUMN_SPECS, MISSING_MARKERS
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Columns are read as float32 (NaN-capable) and category codes are narrowed
+# to int8 once they are known to be complete.
+READ_DTYPES = {spec.name: "float32" for spec in COLUMN_SPECS}
+CODE_COLUMNS = [spec.name for spec in COLUMN_SPECS if spec.dtype == "int8"]
+MEASUREMENT_COLUMNS = [spec.name for spec in COLUMN_SPECS if spec.dtype == "float32"]
+
+
+@functools.lru_cache(maxsize=None)
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logger.warning(
+            "pyarrow is not installed: processed data is stored as CSV only and parsed with the C engine"
+        )
+        return False
+    return True
+
 
-def load_raw_data(path: str) -> pd.DataFrame:
+def default_engine() -> str:
+    return "pyarrow" if _has_pyarrow() else "c"
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Narrow measurements to float32 and complete, integral category codes to
+    int8, in place.
+    """
+    for col in MEASUREMENT_COLUMNS:
+        if col in df.columns and df[col].dtype.kind in "iuf" and df[col].dtype != "float32":
+            df[col] = df[col].astype("float32")
+    for col in CODE_COLUMNS:
+        if col in df.columns and df[col].dtype.kind in "iuf" and df[col].dtype != "int8":
+            values = df[col]
+            if not values.isna().any() and (values == values.round()).all():
+                df[col] = values.astype("int8")
+    return df
+
+
+def load_raw_data(
+    path: str, usecols: list = None, typed: bool = True, engine: str = None
+) -> pd.DataFrame:
+    """
+    Read a CSV, parsing missing markers as NaN. With ``typed`` the schema's
+    columns are read as float32 and complete category codes become int8.
+    """
     logger.info(f"Loading raw data from: {path}")
-    df = pd.read_csv(path)
+    read_kwargs = dict(na_values=MISSING_MARKERS, usecols=usecols, engine=engine or default_engine())
+    try:
+        df = pd.read_csv(path, dtype=READ_DTYPES if typed else None, **read_kwargs)
+    except ValueError as exc:
+        # Unparseable values are left for clean_data to coerce.
+        logger.warning(f"Typed read failed ({exc}); falling back to inferred dtypes")
+        df = pd.read_csv(path, **read_kwargs)
+    if typed:
+        compact_dtypes(df)
     logger.info(f"Data shape: {df.shape}")
     return df
+
+
+def iter_raw_chunks(path: str, chunksize: int):
+    """
+    Stream a raw CSV in chunks, parsing missing markers as NaN on read.
+    """
+    return pd.read_csv(path, na_values=MISSING_MARKERS, chunksize=chunksize)
+
+
+def parquet_path_for(path: str) -> str:
+    return os.path.splitext(str(path))[0] + ".parquet"
+
+
+def save_processed_data(df: pd.DataFrame, path: str) -> None:
+    """
+    Write processed data as CSV plus a typed Parquet copy next to it.
+    """
+    df = compact_dtypes(df.copy(deep=False))
+    df.to_csv(path, index=False)
+    if _has_pyarrow():
+        df.to_parquet(parquet_path_for(path), index=False)
+    logger.info(f"Processed data saved to: {path}")
+
+
+def processed_source(path: str) -> str:
+    """
+    Path to read processed data from: the Parquet copy when it exists and is
+    at least as new as the CSV, otherwise the CSV itself.
+    """
+    parquet_path = parquet_path_for(path)
+    if (
+        _has_pyarrow()
+        and os.path.exists(parquet_path)
+        and (
+            not os.path.exists(path)
+            or os.path.getmtime(parquet_path) >= os.path.getmtime(path)
+        )
+    ):
+        return parquet_path
+    return path
+
+
+def load_processed_data(path: str, usecols: list = None) -> pd.DataFrame:
+    """
+    Load processed data, preferring the Parquet copy when it exists and is
+    at least as new as the CSV.
+    """
+    source = processed_source(path)
+    if source != path:
+        logger.info(f"Loading processed data from: {source}")
+        df = pd.read_parquet(source, columns=usecols)
+        logger.info(f"Data shape: {df.shape}")
+        return df
+    return load_raw_data(path, usecols=usecols)
+
+
+def save_processed_increment(df: pd.DataFrame, directory: str, name: str) -> str:
+    """
+    Store newly arrived processed rows as their own partition ``name``
+    next to the processed data; returns the partition's CSV path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.csv")
+    save_processed_data(df, path)
+    return path
+
+
+def processed_increment_paths(directory: str, after: str = None) -> list:
+    """
+    CSV paths of the stored increments in name (arrival) order, only those
+    named after ``after`` when given.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, "*.csv")))
+    names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    return [path for path, name in zip(paths, names) if after is None or name > after]
+
+
+def load_processed_increments(directory: str, after: str = None) -> pd.DataFrame:
+    """
+    All stored increments (see ``processed_increment_paths``) as one frame,
+    or None when there are none.
+    """
+    paths = processed_increment_paths(directory, after)
+    if not paths:
+        return None
+    return pd.concat([load_processed_data(path) for path in paths], ignore_index=True)
@@ -1,22 +1,67 @@
-import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
 from sklearn.impute import SimpleImputer
 
-from src.data.schema import MISSING_MARKERS
+from src.data.load_data import iter_raw_chunks
+from src.data.schema import get_validator
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce every column to a numeric dtype, turning missing markers into NaN.
+
+    The result is always a new (shallow) frame, so later steps can assign
+    columns without touching the caller's. Columns that are already numeric
+    (e.g. when markers were parsed at read time) share their data instead
+    of being copied; only object columns are converted. Every marker in
+    MISSING_MARKERS is non-numeric, so coercion maps them to NaN without a
+    separate replace pass.
+    """
     logger.info("Replacing custom missing markers with NaN")
-    df = df.replace(MISSING_MARKERS, np.nan)
-    df = df.apply(pd.to_numeric, errors="coerce")
-    if (df.astype(str) == "?").any().any():
-        raise ValueError("'?' still present after cleaning!")
+    df = df.copy(deep=False)
+    for col in df.columns:
+        if not is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
     return df
 
 
+def clean_csv_in_chunks(src_path: str, dst_path: str, chunksize: int = 1_000_000) -> int:
+    """
+    Clean a CSV that may not fit in memory, writing the result chunk by chunk.
+    Returns the number of rows written.
+    """
+    logger.info("Cleaning %s in chunks of %d rows", src_path, chunksize)
+    n_rows = 0
+    for i, chunk in enumerate(iter_raw_chunks(src_path, chunksize=chunksize)):
+        cleaned = clean_data(chunk)
+        cleaned.to_csv(dst_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        n_rows += len(cleaned)
+    return n_rows
+
+
+def validate_data(df: pd.DataFrame):
+    """
+    Check dtypes, ranges and category codes of the spec'd columns present in
+    ``df`` and log any violations. Returns the ValidationReport.
+    """
+    validator = get_validator()
+    report = validator.validate_frame(
+        df, columns=[col for col in validator.specs if col in df.columns]
+    )
+    for violation in report.violations:
+        logger.warning(
+            "Schema violation: %s %s in %d rows (e.g. rows %s)",
+            violation.column,
+            violation.rule,
+            violation.count,
+            violation.rows,
+        )
+    return report
+
+
 def impute_missing(df: pd.DataFrame, numeric_cols: list) -> pd.DataFrame:
     logger.info("Imputing missing values (median strategy)")
     imputer = SimpleImputer(strategy="median")
@@ -33,6 +78,7 @@ def preprocess_pipeline(
     df: pd.DataFrame, categorical_cols: list, numeric_cols: list
 ) -> pd.DataFrame:
     df = clean_data(df)
+    validate_data(df)
     df = impute_missing(df, numeric_cols)
     # df = encode_categorical(df, categorical_cols)
     logger.info("Preprocessing completed")
@@ -1,3 +1,7 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
 EXPECTED_COLUMNS = [
     "age",
     "sex",
@@ -15,4 +19,211 @@ EXPECTED_COLUMNS = [
     "target",
 ]
 
+FEATURE_COLUMNS = [col for col in EXPECTED_COLUMNS if col != "target"]
+
+# Name of the UCI subset a processed row came from (not a model input)
+SOURCE_COLUMN = "source"
+
 MISSING_MARKERS = ["?", "NA", "NULL", ""]
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    Declared type and domain of one column.
+
+    ``allowed`` lists the valid integer codes of a categorical column; a
+    ``None`` bound means unbounded on that side.
+    """
+
+    name: str
+    dtype: str
+    min_value: float = None
+    max_value: float = None
+    allowed: tuple = None
+    nullable: bool = True
+
+
+# Category codes cover both the UCI encoding (cp 1-4, slope 1-3, thal 3/6/7)
+# and the zero-based variant used by common re-distributions of the dataset.
+COLUMN_SPECS = [
+    ColumnSpec("age", "float32", min_value=1, max_value=120),
+    ColumnSpec("sex", "int8", allowed=(0, 1)),
+    ColumnSpec("cp", "int8", allowed=(0, 1, 2, 3, 4)),
+    ColumnSpec("trestbps", "float32", min_value=0, max_value=300),
+    ColumnSpec("chol", "float32", min_value=0, max_value=1000),
+    ColumnSpec("fbs", "int8", allowed=(0, 1)),
+    ColumnSpec("restecg", "int8", allowed=(0, 1, 2)),
+    ColumnSpec("thalach", "float32", min_value=0, max_value=250),
+    ColumnSpec("exang", "int8", allowed=(0, 1)),
+    ColumnSpec("oldpeak", "float32", min_value=-10, max_value=10),
+    ColumnSpec("slope", "int8", allowed=(0, 1, 2, 3)),
+    ColumnSpec("ca", "int8", allowed=(0, 1, 2, 3, 4)),
+    ColumnSpec("thal", "int8", allowed=(0, 1, 2, 3, 6, 7)),
+    ColumnSpec("target", "int8", allowed=(0, 1, 2, 3, 4), nullable=False),
+]
+
+
+@dataclass
+class Violation:
+    column: str
+    rule: str
+    count: int
+    rows: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"column": self.column, "rule": self.rule, "count": self.count, "rows": self.rows}
+
+
+@dataclass
+class ValidationReport:
+    """
+    Structured result of validating a frame or array. ``invalid_rows`` is a
+    boolean mask of rows with at least one violation.
+    """
+
+    n_rows: int
+    violations: list
+    invalid_rows: np.ndarray
+
+    @property
+    def valid(self) -> bool:
+        return not self.violations
+
+    def to_dict(self) -> dict:
+        return {
+            "n_rows": self.n_rows,
+            "n_invalid_rows": int(self.invalid_rows.sum()),
+            "violations": [v.to_dict() for v in self.violations],
+        }
+
+
+class SchemaValidator:
+    """
+    Vectorized validator compiled from a list of ColumnSpecs.
+
+    Bounds become per-column arrays and category domains become boolean
+    lookup tables, so a whole frame is checked with a handful of NumPy
+    operations instead of per-row model parsing.
+    """
+
+    def __init__(self, specs: list = None, max_examples: int = 5):
+        self.specs = {spec.name: spec for spec in (specs or COLUMN_SPECS)}
+        self.max_examples = max_examples
+        self._lookup = {}
+        for spec in self.specs.values():
+            if spec.allowed is not None:
+                table = np.zeros(max(spec.allowed) + 1, dtype=bool)
+                table[list(spec.allowed)] = True
+                self._lookup[spec.name] = table
+
+    def validate_frame(self, df, columns: list = None) -> ValidationReport:
+        """
+        Validate the spec'd columns of a DataFrame.
+        """
+        columns = list(self.specs) if columns is None else columns
+        present = [col for col in columns if col in df.columns]
+        violations = [
+            Violation(col, "missing_column", len(df)) for col in columns if col not in df.columns
+        ]
+
+        numeric = []
+        for col in present:
+            if df[col].dtype.kind in "biuf":
+                numeric.append(col)
+            else:
+                violations.append(Violation(col, "not_numeric", len(df)))
+
+        X = df[numeric].to_numpy(dtype=np.float64, na_value=np.nan) if numeric else np.empty((len(df), 0))
+        report = self.validate_array(X, numeric)
+        report.violations = violations + report.violations
+        if len(numeric) < len(present):
+            report.invalid_rows[:] = True
+        return report
+
+    def validate_array(self, X: np.ndarray, columns: list) -> ValidationReport:
+        """
+        Validate a 2-D float array whose columns are named by ``columns``.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        n_rows = X.shape[0]
+        invalid_rows = np.zeros(n_rows, dtype=bool)
+        violations = []
+
+        specs = [self.specs.get(col) or ColumnSpec(col, "float64") for col in columns]
+        lo = np.array([-np.inf if s.min_value is None else s.min_value for s in specs])
+        hi = np.array([np.inf if s.max_value is None else s.max_value for s in specs])
+        nullable = np.array([s.nullable for s in specs], dtype=bool)
+
+        missing = np.isnan(X)
+        checks = {
+            "null": missing & ~nullable,
+            "below_min": X < lo,
+            "above_max": X > hi,
+        }
+
+        for j, spec in enumerate(specs):
+            table = self._lookup.get(spec.name)
+            if table is None:
+                continue
+            values = X[:, j]
+            in_range = (values >= 0) & (values < len(table)) & (values == np.floor(values))
+            codes = np.where(in_range, values, 0).astype(np.intp)
+            bad = ~missing[:, j] & ~(in_range & table[codes])
+            self._collect(violations, invalid_rows, spec.name, "not_allowed", bad)
+
+        for rule, mask in checks.items():
+            for j in np.flatnonzero(mask.any(axis=0)):
+                self._collect(violations, invalid_rows, columns[j], rule, mask[:, j])
+
+        return ValidationReport(n_rows=n_rows, violations=violations, invalid_rows=invalid_rows)
+
+    def validate_records(self, records: list, columns: list = None) -> tuple:
+        """
+        Validate a list of JSON-like dicts. Returns the parsed float array and
+        the report; non-numeric values become NaN and are reported.
+        """
+        columns = list(FEATURE_COLUMNS) if columns is None else columns
+        rows = [[record.get(col) for col in columns] for record in records]
+        not_numeric = None
+        try:
+            X = np.array(rows, dtype=np.float64).reshape(len(rows), len(columns))
+        except (TypeError, ValueError):
+            raw = np.array(rows, dtype=object).reshape(len(rows), len(columns))
+            X = np.vectorize(_to_float, otypes=[np.float64])(raw)
+            not_numeric = np.isnan(X) & np.not_equal(raw, None)
+
+        report = self.validate_array(X, columns)
+        if not_numeric is not None:
+            extra = []
+            for j in np.flatnonzero(not_numeric.any(axis=0)):
+                self._collect(extra, report.invalid_rows, columns[j], "not_numeric", not_numeric[:, j])
+            report.violations = extra + report.violations
+        return X, report
+
+    def _collect(self, violations, invalid_rows, column, rule, mask) -> None:
+        count = int(mask.sum())
+        if count:
+            rows = np.flatnonzero(mask)[: self.max_examples].tolist()
+            violations.append(Violation(column, rule, count, rows))
+            invalid_rows |= mask
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+_default_validator = None
+
+
+def get_validator() -> SchemaValidator:
+    """
+    Shared validator compiled once from COLUMN_SPECS.
+    """
+    global _default_validator
+    if _default_validator is None:
+        _default_validator = SchemaValidator()
+    return _default_validator
@@ -9,24 +9,44 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Engineered numeric features and the input columns each is computed from
+ENGINEERED_FEATURES = {
+    "age_thalach_ratio": ["age", "thalach"],
+    "chol_bp_product": ["chol", "trestbps"],
+}
+
 
 def create_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Create domain-specific engineered features.
+
+    Each engineered column is computed once and joined onto the input without
+    copying its existing columns; the input frame is left untouched.
     """
     logger.info("Creating engineered features")
 
-    df = df.copy()
+    def missing():
+        return pd.Series(np.nan, index=df.index)
 
     # Example engineered features (Heart Disease dataset)
-    df["age_thalach_ratio"] = np.nan
-    df["chol_bp_product"] = np.nan
-
-    if {"age", "thalach"}.issubset(df.columns):
-        df["age_thalach_ratio"] = df["age"] / (df["thalach"] + 1)
-
-    if {"chol", "trestbps"}.issubset(df.columns):
-        df["chol_bp_product"] = df["chol"] * df["trestbps"]
+    engineered = {
+        "age_thalach_ratio": (
+            df["age"] / (df["thalach"] + 1)
+            if {"age", "thalach"}.issubset(df.columns)
+            else missing()
+        ),
+        "chol_bp_product": (
+            df["chol"] * df["trestbps"]
+            if {"chol", "trestbps"}.issubset(df.columns)
+            else missing()
+        ),
+    }
+
+    # A shallow copy shares the input's column buffers; setting the new
+    # columns adds blocks instead of rebuilding the existing ones.
+    df = df.copy(deep=False)
+    for name, values in engineered.items():
+        df[name] = values
 
     return df
 
@@ -45,7 +65,7 @@ def get_numeric_pipeline() -> Pipeline:
     )
 
 
-def get_categorical_pipeline() -> Pipeline:
+def get_categorical_pipeline(dtype=np.float64, sparse: bool = False) -> Pipeline:
     """
     Categorical feature processing pipeline.
     """
@@ -56,14 +76,14 @@ def get_categorical_pipeline() -> Pipeline:
             ("imputer", SimpleImputer(strategy="most_frequent")),
             (
                 "encoder",
-                OneHotEncoder(handle_unknown="ignore", sparse_output=False),
+                OneHotEncoder(handle_unknown="ignore", sparse_output=sparse, dtype=dtype),
             ),
         ]
     )
 
 
 def build_feature_transformer(
-    numeric_cols: list, categorical_cols: list
+    numeric_cols: list, categorical_cols: list, dtype=np.float64, sparse: bool = False
 ) -> ColumnTransformer:
     """
     Column-wise feature engineering transformer.
@@ -73,49 +93,112 @@ def build_feature_transformer(
     return ColumnTransformer(
         transformers=[
             ("num", get_numeric_pipeline(), numeric_cols),
-            ("cat", get_categorical_pipeline(), categorical_cols),
+            ("cat", get_categorical_pipeline(dtype=dtype, sparse=sparse), categorical_cols),
         ],
         remainder="drop",
+        # Keep the stacked output sparse whenever the one-hot block is sparse.
+        sparse_threshold=1.0 if sparse else 0.3,
     )
 
 
-def build_feature_pipeline(numeric_cols: list, categorical_cols: list) -> Pipeline:
-    logger.info("Building full feature pipeline")
+def _as_dtype(X, dtype):
+    return X.astype(dtype, copy=False)
 
-    numeric_cols = list(dict.fromkeys(numeric_cols + ["age_thalach_ratio", "chol_bp_product"]))
 
-    return Pipeline(
-        steps=[
-            ("feature_create", FunctionTransformer(create_features, validate=False)),
-            (
-                "preprocess",
-                build_feature_transformer(
-                    numeric_cols=numeric_cols,
-                    categorical_cols=categorical_cols,
-                ),
+def build_feature_pipeline(
+    numeric_cols: list, categorical_cols: list, dtype=None, sparse: bool = False, engineered: list = None
+) -> Pipeline:
+    """
+    Full feature pipeline. ``dtype`` (e.g. np.float32) fixes the output
+    dtype; ``sparse`` keeps the one-hot block as a sparse matrix.
+    ``engineered`` limits the engineered features used (default: all of
+    ENGINEERED_FEATURES).
+    """
+    logger.info("Building full feature pipeline")
+
+    engineered = list(ENGINEERED_FEATURES) if engineered is None else list(engineered)
+    numeric_cols = list(dict.fromkeys(list(numeric_cols) + engineered))
+
+    steps = [
+        ("feature_create", FunctionTransformer(create_features, validate=False)),
+        (
+            "preprocess",
+            build_feature_transformer(
+                numeric_cols=numeric_cols,
+                categorical_cols=categorical_cols,
+                dtype=dtype or np.float64,
+                sparse=sparse,
             ),
-        ]
-    )
+        ),
+    ]
+    if dtype is not None:
+        steps.append(
+            ("cast", FunctionTransformer(_as_dtype, kw_args={"dtype": dtype}, accept_sparse=True))
+        )
+    return Pipeline(steps=steps)
+
+
+def get_feature_names(feature_pipeline: Pipeline) -> list:
+    names = feature_pipeline.named_steps["preprocess"].get_feature_names_out()
+    return [str(name) for name in names]
+
+
+def feature_groups(feature_pipeline: Pipeline) -> dict:
+    """
+    Indices of the transformed columns computed from each column the
+    fitted pipeline encodes: one per numeric column (engineered ones
+    included) and the one-hot block of each categorical column.
+    """
+    groups, offset = {}, 0
+    for name, transformer, cols in feature_pipeline.named_steps["preprocess"].transformers_:
+        if name == "num":
+            widths = [1] * len(cols)
+        elif name == "cat":
+            widths = [len(categories) for categories in transformer.named_steps["encoder"].categories_]
+        else:
+            continue
+        for col, width in zip(cols, widths):
+            groups[col] = list(range(offset, offset + width))
+            offset += width
+    return groups
 
 
 def feature_engineering_pipeline(
-    df: pd.DataFrame, numeric_cols: list, categorical_cols: list
-) -> pd.DataFrame:
+    df: pd.DataFrame,
+    numeric_cols: list,
+    categorical_cols: list,
+    dtype=None,
+    sparse: bool = False,
+    as_frame: bool = True,
+):
     """
     Full feature engineering pipeline.
+
+    With ``as_frame=False`` the transformed ndarray (or sparse matrix when
+    ``sparse=True``) is returned as produced, without wrapping it in a
+    DataFrame.
     """
     logger.info("Starting feature engineering pipeline")
 
     feature_pipeline = build_feature_pipeline(
         numeric_cols=numeric_cols,
         categorical_cols=categorical_cols,
+        dtype=dtype,
+        sparse=sparse,
     )
 
     transformed_array = feature_pipeline.fit_transform(df)
-    feature_names = feature_pipeline.named_steps["preprocess"].get_feature_names_out()
-    feature_names = [str(name) for name in feature_names]
 
-    df_transformed = pd.DataFrame(transformed_array, columns=feature_names)
+    if not as_frame:
+        logger.info("Feature engineering completed successfully")
+        return transformed_array
+
+    feature_names = get_feature_names(feature_pipeline)
+
+    if sparse:
+        df_transformed = pd.DataFrame.sparse.from_spmatrix(transformed_array, columns=feature_names)
+    else:
+        df_transformed = pd.DataFrame(transformed_array, columns=feature_names, copy=False)
 
     logger.info("Feature engineering completed successfully")
 
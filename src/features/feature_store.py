@@ -0,0 +1,290 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.features.feature_pipeline import (build_feature_pipeline,
+                                           get_feature_names)
+from src.utils.config import PROJECT_ROOT
+from src.utils.hashing import hash_file, module_source
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_STORE_PATH = os.path.join(PROJECT_ROOT, "data", "features")
+
+# Bump when the on-disk layout changes so old entries are not reused.
+FORMAT_VERSION = 1
+
+PIPELINE_FILE = "feature_pipeline.joblib"
+METADATA_FILE = "metadata.json"
+
+
+def hash_frame(df) -> str:
+    """
+    Content hash of a DataFrame or Series (values, dtypes and column names).
+    """
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    names = list(df.columns) if isinstance(df, pd.DataFrame) else [df.name]
+    digest.update(json.dumps([str(name) for name in names]).encode())
+    return digest.hexdigest()
+
+
+class FeatureStore:
+    """
+    Versioned on-disk store of transformed feature matrices.
+
+    Each entry is a directory of ``.npy`` arrays plus metadata (column
+    names, shapes, the config that produced it). Arrays are opened with
+    ``mmap_mode="r"``, so repeated runs load instantly and joblib workers
+    share the same pages instead of each holding a copy.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_PATH):
+        self.root = root
+
+    def make_key(self, data_hash: str, config: dict) -> str:
+        payload = {
+            "format_version": FORMAT_VERSION,
+            "data_hash": data_hash,
+            "config": config,
+            "code": hash_file(module_source("src.features.feature_pipeline")),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.path_for(key), METADATA_FILE))
+
+    def save(self, key: str, arrays: dict, metadata: dict, pipeline=None) -> str:
+        """
+        Write ``arrays`` (name -> ndarray) atomically under ``key``.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=self.root, prefix=f".{key}-")
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+            if pipeline is not None:
+                joblib.dump(pipeline, os.path.join(tmp_dir, PIPELINE_FILE))
+
+            metadata = dict(metadata)
+            metadata["arrays"] = {
+                name: {"shape": list(array.shape), "dtype": str(array.dtype)}
+                for name, array in arrays.items()
+            }
+            with open(os.path.join(tmp_dir, METADATA_FILE), "w") as f:
+                json.dump(metadata, f, indent=2, default=str)
+
+            final_dir = self.path_for(key)
+            if os.path.exists(final_dir):
+                shutil.rmtree(final_dir)
+            os.replace(tmp_dir, final_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        logger.info("Stored feature set %s", key)
+        return final_dir
+
+    def load(self, key: str, mmap_mode: str = "r") -> tuple:
+        """
+        Return (arrays, metadata, pipeline) for ``key``; arrays are memory-mapped.
+        """
+        entry = self.path_for(key)
+        with open(os.path.join(entry, METADATA_FILE)) as f:
+            metadata = json.load(f)
+
+        arrays = {
+            name: np.load(os.path.join(entry, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in metadata["arrays"]
+        }
+
+        pipeline = None
+        pipeline_path = os.path.join(entry, PIPELINE_FILE)
+        if os.path.exists(pipeline_path):
+            pipeline = joblib.load(pipeline_path)
+        return arrays, metadata, pipeline
+
+    def prune(self, keep) -> list:
+        """
+        Delete every entry whose key is not in ``keep`` (fingerprints of
+        older data, configs or feature code); returns the removed keys.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        keep = set(keep)
+        removed = [
+            name
+            for name in sorted(os.listdir(self.root))
+            if name not in keep and not name.startswith(".") and self.exists(name)
+        ]
+        for name in removed:
+            shutil.rmtree(self.path_for(name), ignore_errors=True)
+        if removed:
+            logger.info("Pruned %d stale feature sets from %s", len(removed), self.root)
+        return removed
+
+
+@dataclass
+class FoldFeatures:
+    X_train: np.ndarray
+    y_train: np.ndarray
+    X_valid: np.ndarray
+    y_valid: np.ndarray
+    train_index: np.ndarray
+    valid_index: np.ndarray
+    pipeline: object
+    key: str
+
+
+@dataclass
+class TrainingFeatures:
+    X_train: np.ndarray
+    y_train: np.ndarray
+    X_test: np.ndarray
+    y_test: np.ndarray
+    feature_names: list
+    pipeline: object
+    key: str
+    folds: list = field(default_factory=list)
+
+
+def _combined_hash(parts) -> str:
+    return hashlib.sha256("".join(hash_frame(part) for part in parts).encode()).hexdigest()
+
+
+def _load_or_build(store: FeatureStore, key: str, build) -> tuple:
+    # ``build`` returns (arrays, metadata, pipeline) and only runs on a miss
+    if store.exists(key):
+        logger.info("Feature store hit for %s", key)
+    else:
+        logger.info("Feature store miss for %s, transforming features", key)
+        store.save(key, *build())
+    return store.load(key)
+
+
+def materialize_fold_features(
+    X_train,
+    y_train,
+    splits: list,
+    numeric_cols: list,
+    categorical_cols: list,
+    store: FeatureStore = None,
+    dtype: str = "float32",
+) -> list:
+    """
+    Feature matrices for cross-validation, one store entry per fold. For
+    each (train, validation) index pair in ``splits`` the pipeline is fit
+    on the fold's training rows only, so no imputer, scaler or encoder
+    statistics leak from the rows the fold is scored on. The fold index
+    and its rows are part of each entry's key.
+    """
+    store = store or FeatureStore()
+    data_hash = _combined_hash((X_train, y_train))
+    folds = []
+    for fold, (train_index, valid_index) in enumerate(splits):
+        config = {
+            "numeric_cols": list(numeric_cols),
+            "categorical_cols": list(categorical_cols),
+            "dtype": dtype,
+            "fold": fold,
+            "n_folds": len(splits),
+            "rows": hashlib.sha256(np.asarray(train_index, dtype=np.int64).tobytes()).hexdigest(),
+        }
+        key = store.make_key(data_hash, config)
+
+        def build(train_index=train_index, valid_index=valid_index, config=config):
+            pipeline = build_feature_pipeline(
+                numeric_cols=numeric_cols,
+                categorical_cols=categorical_cols,
+                dtype=np.dtype(dtype),
+            )
+            arrays = {
+                "X_train": pipeline.fit_transform(X_train.iloc[train_index]),
+                "y_train": np.asarray(y_train)[train_index],
+                "X_valid": pipeline.transform(X_train.iloc[valid_index]),
+                "y_valid": np.asarray(y_train)[valid_index],
+                "train_index": np.asarray(train_index),
+                "valid_index": np.asarray(valid_index),
+            }
+            metadata = {"data_hash": data_hash, "config": config, "feature_names": get_feature_names(pipeline)}
+            return arrays, metadata, pipeline
+
+        arrays, _, pipeline = _load_or_build(store, key, build)
+        folds.append(FoldFeatures(pipeline=pipeline, key=key, **arrays))
+    return folds
+
+
+def materialize_training_features(
+    X_train,
+    y_train,
+    X_test,
+    y_test,
+    numeric_cols: list,
+    categorical_cols: list,
+    store: FeatureStore = None,
+    dtype: str = "float32",
+    splits: list = None,
+) -> TrainingFeatures:
+    """
+    Fit the feature pipeline on the training split and persist the
+    transformed train/test matrices, or open them from the store when an
+    entry for the same data and config already exists. With ``splits``
+    (CV index pairs over X_train) the per-fold matrices of
+    ``materialize_fold_features`` are returned too, as ``folds``.
+    """
+    store = store or FeatureStore()
+    config = {
+        "numeric_cols": list(numeric_cols),
+        "categorical_cols": list(categorical_cols),
+        "dtype": dtype,
+    }
+    data_hash = _combined_hash((X_train, y_train, X_test, y_test))
+    key = store.make_key(data_hash, config)
+
+    def build():
+        pipeline = build_feature_pipeline(
+            numeric_cols=numeric_cols,
+            categorical_cols=categorical_cols,
+            dtype=np.dtype(dtype),
+        )
+        arrays = {
+            "X_train": pipeline.fit_transform(X_train),
+            "y_train": np.asarray(y_train),
+            "X_test": pipeline.transform(X_test),
+            "y_test": np.asarray(y_test),
+        }
+        metadata = {
+            "data_hash": data_hash,
+            "config": config,
+            "feature_names": get_feature_names(pipeline),
+        }
+        return arrays, metadata, pipeline
+
+    arrays, metadata, pipeline = _load_or_build(store, key, build)
+    folds = []
+    if splits is not None:
+        folds = materialize_fold_features(
+            X_train, y_train, splits, numeric_cols, categorical_cols, store=store, dtype=dtype
+        )
+    return TrainingFeatures(
+        X_train=arrays["X_train"],
+        y_train=arrays["y_train"],
+        X_test=arrays["X_test"],
+        y_test=arrays["y_test"],
+        feature_names=metadata["feature_names"],
+        pipeline=pipeline,
+        key=key,
+        folds=folds,
+    )
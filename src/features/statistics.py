@@ -0,0 +1,130 @@
+import numpy as np
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def feature_columns(feature_pipeline) -> tuple:
+    """
+    (numeric, categorical) input columns of a fitted feature pipeline,
+    including the engineered numeric ones.
+    """
+    preprocess = feature_pipeline.named_steps["preprocess"]
+    columns = {name: list(cols) for name, _, cols in preprocess.transformers_ if name in ("num", "cat")}
+    return columns["num"], columns["cat"]
+
+
+def _value_counts(values: np.ndarray) -> dict:
+    values = np.asarray(values, dtype=np.float64)
+    present = values[~np.isnan(values)]
+    unique, counts = np.unique(present, return_counts=True)
+    return {"values": unique, "counts": counts, "missing": int(len(values) - len(present))}
+
+
+def feature_statistics(feature_pipeline, X) -> dict:
+    """
+    Exact value counts of every column the feature pipeline's imputers and
+    scaler see, computed on the raw rows ``X``. Counts merge without the
+    original rows (``merge_statistics``), and medians, modes, means and
+    variances are all read off them, so they can be kept up to date as
+    new rows arrive.
+    """
+    numeric_cols, categorical_cols = feature_columns(feature_pipeline)
+    frame = feature_pipeline.named_steps["feature_create"].transform(X)
+    return {
+        "n_rows": len(frame),
+        "numeric": {col: _value_counts(frame[col]) for col in numeric_cols},
+        "categorical": {col: _value_counts(frame[col]) for col in categorical_cols},
+    }
+
+
+def _merge_counts(a: dict, b: dict) -> dict:
+    values, inverse = np.unique(np.concatenate([a["values"], b["values"]]), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([a["counts"], b["counts"]]), minlength=len(values))
+    return {"values": values, "counts": counts.astype(np.int64), "missing": a["missing"] + b["missing"]}
+
+
+def merge_statistics(stats: dict, new: dict) -> dict:
+    return {
+        "n_rows": stats["n_rows"] + new["n_rows"],
+        **{
+            kind: {col: _merge_counts(stats[kind][col], new[kind][col]) for col in stats[kind]}
+            for kind in ("numeric", "categorical")
+        },
+    }
+
+
+def median(counts: dict) -> float:
+    """
+    Median of the non-missing values; the mean of the middle two for an
+    even count, as ``SimpleImputer(strategy="median")`` computes it.
+    """
+    cumulative = np.cumsum(counts["counts"])
+    n = cumulative[-1]
+    low = counts["values"][np.searchsorted(cumulative, (n - 1) // 2, side="right")]
+    high = counts["values"][np.searchsorted(cumulative, n // 2, side="right")]
+    return float((low + high) / 2)
+
+
+def mode(counts: dict) -> float:
+    # argmax takes the first (smallest) value on ties, like most_frequent
+    return float(counts["values"][np.argmax(counts["counts"])])
+
+
+def imputed_moments(counts: dict, fill: float) -> tuple:
+    """
+    Mean and (population) variance of a column once its missing values are
+    filled with ``fill``.
+    """
+    values = np.append(counts["values"], fill)
+    weights = np.append(counts["counts"], counts["missing"]).astype(np.float64)
+    mean = np.average(values, weights=weights)
+    return float(mean), float(np.average((values - mean) ** 2, weights=weights))
+
+
+def new_categories(stats: dict, feature_pipeline) -> dict:
+    """
+    Categorical values seen in ``stats`` that the fitted one-hot encoder
+    does not know; they encode as all zeros until a full retrain.
+    """
+    encoder = feature_pipeline.named_steps["preprocess"].named_transformers_["cat"].named_steps["encoder"]
+    unseen = {}
+    for col, categories in zip(stats["categorical"], encoder.categories_):
+        extra = np.setdiff1d(stats["categorical"][col]["values"], np.asarray(categories, dtype=np.float64))
+        if len(extra):
+            unseen[col] = extra.tolist()
+    return unseen
+
+
+def refresh_feature_pipeline(feature_pipeline, stats: dict) -> tuple:
+    """
+    Set the fitted pipeline's imputer and scaler statistics to the ones a
+    full refit on the rows behind ``stats`` would learn. One-hot categories
+    are left alone so the output width does not change.
+
+    Returns (scale, shift) arrays over the scaled numeric outputs (the
+    first columns of the transformed matrix) such that
+    ``old_output = scale * new_output + shift``; models fit on the old
+    outputs can be re-expressed on the new ones with them.
+    """
+    preprocess = feature_pipeline.named_steps["preprocess"]
+    numeric = preprocess.named_transformers_["num"]
+    categorical = preprocess.named_transformers_["cat"]
+    imputer, scaler = numeric.named_steps["imputer"], numeric.named_steps["scaler"]
+
+    medians = np.array([median(stats["numeric"][col]) for col in stats["numeric"]])
+    moments = np.array([imputed_moments(stats["numeric"][col], fill) for col, fill in zip(stats["numeric"], medians)])
+    new_mean, new_var = moments[:, 0], moments[:, 1]
+    # StandardScaler leaves constant columns unscaled
+    new_std = np.where(new_var > 0, np.sqrt(new_var), 1.0)
+
+    old_mean, old_std = scaler.mean_.copy(), scaler.scale_.copy()
+    imputer.statistics_ = medians.astype(imputer.statistics_.dtype)
+    scaler.mean_, scaler.var_, scaler.scale_ = new_mean, new_var, new_std
+    scaler.n_samples_seen_ = stats["n_rows"]
+    categorical.named_steps["imputer"].statistics_ = np.array(
+        [mode(stats["categorical"][col]) for col in stats["categorical"]],
+        dtype=categorical.named_steps["imputer"].statistics_.dtype,
+    )
+    return new_std / old_std, (new_mean - old_mean) / old_std
@@ -0,0 +1,80 @@
+import math
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AnytimeForest:
+    """
+    Early-stopping inference over a fitted binary RandomForestClassifier.
+
+    Trees are evaluated in batches of ``batch_size``. After each batch a
+    row stops as soon as its class is settled, either exactly (the
+    remaining trees cannot move the mean probability across 0.5) or
+    statistically: treating the trees as a random sample drawn without
+    replacement, the Hoeffding-Serfling bound puts the full-forest mean
+    within ``eps`` of the partial mean with probability ``1 - delta``.
+    Evaluation also stops for every row once ``deadline`` (a
+    ``time.perf_counter()`` value) has passed.
+
+    Probabilities are the partial means over the trees used. With
+    ``delta=0`` and no deadline only the exact rule applies, so predicted
+    classes always match ``forest.predict``.
+    """
+
+    def __init__(self, forest: RandomForestClassifier, batch_size: int = 10, delta: float = 0.01, min_trees: int = 10):
+        if len(forest.classes_) != 2:
+            raise ValueError("AnytimeForest supports binary classifiers only")
+        self.forest = forest
+        self.batch_size = batch_size
+        self.delta = delta
+        self.min_trees = min_trees
+        self.classes_ = forest.classes_
+
+    def _settled(self, sums: np.ndarray, t: int) -> np.ndarray:
+        n_trees = len(self.forest.estimators_)
+        # Exact: even all-0 or all-1 remaining trees cannot flip the class
+        # (argmax breaks a 0.5 tie towards class 0).
+        settled = (sums > n_trees / 2) | (sums + (n_trees - t) <= n_trees / 2)
+        if self.delta > 0 and t >= self.min_trees and t < n_trees:
+            eps = math.sqrt((1 - (t - 1) / n_trees) * math.log(2 / self.delta) / (2 * t))
+            settled |= np.abs(sums / t - 0.5) > eps
+        return settled
+
+    def predict_proba_anytime(self, X, deadline: float = None) -> tuple:
+        """
+        Return (probabilities, number of trees used per row).
+        """
+        X = self.forest._validate_X_predict(X)
+        n_rows = X.shape[0]
+        trees = self.forest.estimators_
+        sums = np.zeros(n_rows)
+        used = np.zeros(n_rows, dtype=np.int64)
+        active = np.arange(n_rows)
+
+        t = 0
+        while len(active) and t < len(trees):
+            batch = trees[t : t + self.batch_size]
+            X_active = X[active]
+            for tree in batch:
+                sums[active] += tree.predict_proba(X_active, check_input=False)[:, 1]
+            t += len(batch)
+            used[active] = t
+
+            active = active[~self._settled(sums[active], t)]
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        positive = sums / used
+        return np.column_stack([1 - positive, positive]), used
+
+    def predict_proba(self, X, deadline: float = None):
+        return self.predict_proba_anytime(X, deadline)[0]
+
+    def predict(self, X, deadline: float = None):
+        return self.classes_[np.argmax(self.predict_proba(X, deadline), axis=1)]
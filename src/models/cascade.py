@@ -0,0 +1,138 @@
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.pipeline import Pipeline
+from sklearn.utils import _safe_indexing
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CascadeClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Two-stage binary classifier: ``fast`` scores every row and ``slow`` is
+    consulted only for rows whose fast positive-class probability falls
+    strictly inside ``(lower, upper)``. An empty band (lower == upper)
+    never escalates.
+    """
+
+    def __init__(self, fast, slow, lower: float = 0.5, upper: float = 0.5):
+        self.fast = fast
+        self.slow = slow
+        self.lower = lower
+        self.upper = upper
+
+    @classmethod
+    def from_fitted(cls, fast, slow, lower: float, upper: float):
+        """
+        Assemble a cascade from two already-fitted models without refitting.
+        """
+        cascade = cls(fast, slow, lower=lower, upper=upper)
+        cascade.fast_, cascade.slow_, cascade.classes_ = fast, slow, fast.classes_
+        return cascade
+
+    def fit(self, X, y):
+        self.fast_ = clone(self.fast).fit(X, y)
+        self.slow_ = clone(self.slow).fit(X, y)
+        self.classes_ = self.fast_.classes_
+        return self
+
+    def escalation_mask(self, fast_proba: np.ndarray) -> np.ndarray:
+        positive = fast_proba[:, 1]
+        return (positive > self.lower) & (positive < self.upper)
+
+    def predict_proba_with_escalation(self, X) -> tuple:
+        """
+        Return (probabilities, boolean mask of rows sent to the slow model).
+        """
+        proba = np.asarray(self.fast_.predict_proba(X), dtype=np.float64)
+        escalated = self.escalation_mask(proba)
+        if escalated.any():
+            rows = np.flatnonzero(escalated)
+            proba[rows] = self.slow_.predict_proba(_safe_indexing(X, rows))
+        return proba, escalated
+
+    def predict_proba(self, X):
+        return self.predict_proba_with_escalation(X)[0]
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def find_cascade(model):
+    """
+    The CascadeClassifier at the end of ``model`` (bare or in a Pipeline), or None.
+    """
+    final = model.steps[-1][1] if isinstance(model, Pipeline) else model
+    return final if isinstance(final, CascadeClassifier) else None
+
+
+def _candidates(scores: np.ndarray, n_candidates: int) -> np.ndarray:
+    unique = np.unique(scores)
+    if len(unique) <= n_candidates:
+        return unique
+    return np.unique(np.quantile(unique, np.linspace(0, 1, n_candidates)))
+
+
+def choose_uncertainty_band(
+    fast_proba: np.ndarray,
+    slow_proba: np.ndarray,
+    y,
+    tolerance: float = 0.01,
+    n_candidates: int = 1000,
+) -> dict:
+    """
+    Pick (lower, upper) minimizing the escalation rate while keeping the
+    cascade's accuracy within ``tolerance`` of the better single model.
+
+    Inputs are positive-class probabilities for the same held-out rows
+    (e.g. out-of-fold predictions). Every candidate pair is evaluated at
+    once from cumulative counts over the sorted fast scores.
+    """
+    fast_proba = np.asarray(fast_proba, dtype=np.float64)
+    y = np.asarray(y)
+    fast_correct = (fast_proba > 0.5).astype(int) == y
+    slow_correct = (np.asarray(slow_proba) > 0.5).astype(int) == y
+    target = max(fast_correct.mean(), slow_correct.mean()) - tolerance
+
+    # Candidate thresholds sit just outside each distinct fast score (or its
+    # quantiles, for many distinct scores) on either side of 0.5, so the
+    # band includes that score; 0.5 itself stands for "no band".
+    lowers = np.concatenate([[0.5], np.nextafter(_candidates(fast_proba[fast_proba < 0.5], n_candidates), -np.inf)])
+    uppers = np.concatenate([[0.5], np.nextafter(_candidates(fast_proba[fast_proba > 0.5], n_candidates), np.inf)])
+
+    # gain[i] = accuracy change from sending row i to the slow model
+    gain = slow_correct.astype(int) - fast_correct.astype(int)
+    order = np.argsort(fast_proba, kind="stable")
+    scores = fast_proba[order]
+    cum_gain = np.concatenate([[0], np.cumsum(gain[order])])
+    start = np.searchsorted(scores, lowers, side="right")[:, None]
+    stop = np.searchsorted(scores, uppers, side="left")[None, :]
+    stop = np.maximum(stop, start)
+
+    n = len(y)
+    escalated = (stop - start) / n
+    accuracy = fast_correct.mean() + (cum_gain[stop] - cum_gain[start]) / n
+
+    feasible = accuracy >= target - 1e-12
+    if not feasible.any():
+        lower, upper = 0.0, 1.0
+        rate, acc = 1.0, slow_correct.mean()
+    else:
+        # Fewest escalations first, then the most accurate among those
+        key = np.where(feasible, escalated - accuracy * 1e-9, np.inf)
+        i, j = np.unravel_index(np.argmin(key), key.shape)
+        lower, upper = float(lowers[i]), float(uppers[j])
+        rate, acc = float(escalated[i, j]), float(accuracy[i, j])
+
+    logger.info(
+        "Cascade band (%.4f, %.4f): escalation rate %.3f, accuracy %.4f (target %.4f)",
+        lower, upper, rate, acc, target,
+    )
+    return {
+        "lower": lower,
+        "upper": upper,
+        "escalation_rate": rate,
+        "accuracy": acc,
+        "target_accuracy": float(target),
+    }
@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+METRICS = ["accuracy", "precision", "recall", "f1", "roc_auc"]
+
+# Bootstrap weights are built this many (resample, row) cells at a time
+BOOTSTRAP_CHUNK_CELLS = 1 << 22
+
+
+def _divide(numerator, denominator):
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=np.float64), denominator)
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator > 0)
+
+
+class SortedScores:
+    """
+    Binary labels and scores sorted once by descending score. Every
+    threshold's confusion counts are read off cumulative sums, so a full
+    sweep, the ROC-AUC and point metrics cost one sort plus O(n).
+
+    A row is predicted positive when its score is strictly greater than
+    the threshold, which matches ``predict`` (argmax) at 0.5.
+    """
+
+    def __init__(self, y_true, scores):
+        scores = np.asarray(scores, dtype=np.float64)
+        order = np.argsort(-scores, kind="stable")
+        self.scores = scores[order]
+        self.y = np.asarray(y_true)[order].astype(np.int64)
+        self.n = len(self.y)
+        self.n_pos = int(self.y.sum())
+        self.n_neg = self.n - self.n_pos
+        # Index just past each run of equal scores: the cut points of a sweep
+        self.cuts = np.flatnonzero(np.r_[self.scores[1:] != self.scores[:-1], True]) + 1
+
+    def n_above(self, threshold: float) -> int:
+        return int(np.searchsorted(-self.scores, -threshold, side="left"))
+
+    def counts(self, weights: np.ndarray = None, cuts: np.ndarray = None) -> tuple:
+        """
+        (tp, fp) for the top ``cuts`` rows. With a (B, n) ``weights`` matrix
+        of per-row resample counts, returns (B, len(cuts)) arrays.
+        """
+        cuts = self.cuts if cuts is None else np.asarray(cuts)
+        y = self.y if weights is None else weights * self.y
+        neg = 1 - self.y if weights is None else weights - y
+        tp = np.concatenate([np.zeros(y.shape[:-1] + (1,), dtype=np.int64), np.cumsum(y, axis=-1)], axis=-1)
+        fp = np.concatenate([np.zeros(neg.shape[:-1] + (1,), dtype=np.int64), np.cumsum(neg, axis=-1)], axis=-1)
+        return tp[..., cuts], fp[..., cuts]
+
+
+def _metrics_from_counts(tp, fp, n_pos, n_neg, curve_tp, curve_fp) -> dict:
+    """
+    Point metrics from counts at the chosen threshold plus ROC-AUC from the
+    (tp, fp) curve over every cut; works elementwise over resamples.
+    """
+    fn, tn = n_pos - tp, n_neg - fp
+    precision = _divide(tp, tp + fp)
+    recall = _divide(tp, n_pos)
+    tpr = _divide(np.concatenate([np.zeros_like(curve_tp[..., :1]), curve_tp], axis=-1), np.expand_dims(n_pos, -1))
+    fpr = _divide(np.concatenate([np.zeros_like(curve_fp[..., :1]), curve_fp], axis=-1), np.expand_dims(n_neg, -1))
+    return {
+        "accuracy": _divide(tp + tn, n_pos + n_neg),
+        "precision": precision,
+        "recall": recall,
+        "f1": _divide(2 * precision * recall, precision + recall),
+        "roc_auc": np.sum(np.diff(fpr, axis=-1) * (tpr[..., 1:] + tpr[..., :-1]) / 2, axis=-1),
+    }
+
+
+def threshold_sweep(sorted_scores: SortedScores) -> pd.DataFrame:
+    """
+    Confusion counts and metrics at every distinct score, predicting
+    positive for scores at or above ``threshold`` (as ``roc_curve`` does).
+    """
+    s = sorted_scores
+    tp, fp = s.counts()
+    fn, tn = s.n_pos - tp, s.n_neg - fp
+    precision = _divide(tp, tp + fp)
+    recall = _divide(tp, s.n_pos)
+    return pd.DataFrame(
+        {
+            "threshold": s.scores[s.cuts - 1],
+            "tp": tp,
+            "fp": fp,
+            "fn": fn,
+            "tn": tn,
+            "precision": precision,
+            "recall": recall,
+            "fpr": _divide(fp, s.n_neg),
+            "accuracy": (tp + tn) / s.n,
+            "f1": _divide(2 * precision * recall, precision + recall),
+        }
+    )
+
+
+def bootstrap_metrics(sorted_scores: SortedScores, threshold: float, n_bootstrap: int, seed: int = 0) -> dict:
+    """
+    Metrics for ``n_bootstrap`` resamples (rows drawn with replacement).
+    Each resample is a row of per-row counts in sorted order, so all of
+    them are scored with the same cumulative sums, in chunks of at most
+    BOOTSTRAP_CHUNK_CELLS cells. Returns {metric: array of n_bootstrap}.
+    """
+    s = sorted_scores
+    rng = np.random.default_rng(seed)
+    k = s.n_above(threshold)
+    cuts = np.r_[k, s.cuts]
+    chunk = max(1, BOOTSTRAP_CHUNK_CELLS // max(s.n, 1))
+
+    parts = []
+    for start in range(0, n_bootstrap, chunk):
+        b = min(chunk, n_bootstrap - start)
+        draws = rng.integers(0, s.n, size=(b, s.n)) + (np.arange(b) * s.n)[:, None]
+        weights = np.bincount(draws.ravel(), minlength=b * s.n).reshape(b, s.n)
+        tp, fp = s.counts(weights, cuts)
+        n_pos = weights @ s.y
+        parts.append(_metrics_from_counts(tp[:, 0], fp[:, 0], n_pos, s.n - n_pos, tp[:, 1:], fp[:, 1:]))
+    return {metric: np.concatenate([part[metric] for part in parts]) for metric in METRICS}
+
+
+def evaluate_scores(
+    y_true,
+    scores,
+    threshold: float = 0.5,
+    n_bootstrap: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> dict:
+    """
+    Holdout evaluation from one sort: point metrics at ``threshold``,
+    percentile bootstrap confidence intervals, the full threshold sweep
+    and the thresholds that maximize F1 and Youden's J.
+    """
+    s = SortedScores(y_true, scores)
+    k = s.n_above(threshold)
+    tp, fp = s.counts(cuts=np.r_[k, s.cuts])
+    point = {
+        metric: float(value)
+        for metric, value in _metrics_from_counts(tp[0], fp[0], s.n_pos, s.n_neg, tp[1:], fp[1:]).items()
+    }
+    confusion = {"tp": int(tp[0]), "fp": int(fp[0]), "fn": s.n_pos - int(tp[0]), "tn": s.n_neg - int(fp[0])}
+
+    intervals = {}
+    if n_bootstrap:
+        samples = bootstrap_metrics(s, threshold, n_bootstrap, seed)
+        tail = (1 - confidence) / 2 * 100
+        intervals = {
+            metric: tuple(float(v) for v in np.percentile(values, [tail, 100 - tail]))
+            for metric, values in samples.items()
+        }
+
+    sweep = threshold_sweep(s)
+    best_f1 = sweep.loc[sweep["f1"].idxmax()]
+    best_j = sweep.loc[(sweep["recall"] - sweep["fpr"]).idxmax()]
+    logger.info(
+        "Evaluated %d rows at threshold %.2f: ROC-AUC %.4f, %d bootstrap resamples",
+        s.n, threshold, point["roc_auc"], n_bootstrap,
+    )
+    return {
+        "n": s.n,
+        "threshold": threshold,
+        "metrics": point,
+        "confusion": confusion,
+        "confidence": confidence,
+        "intervals": intervals,
+        "sweep": sweep,
+        "best_f1_threshold": float(best_f1["threshold"]),
+        "best_youden_threshold": float(best_j["threshold"]),
+    }
+
+
+def evaluation_metrics(result: dict, prefix: str = "test") -> dict:
+    """
+    Flat metrics for MLflow: ``{prefix}_{metric}`` plus ``_ci_low``/``_ci_high``.
+    """
+    metrics = {f"{prefix}_{metric}": value for metric, value in result["metrics"].items()}
+    for metric, (low, high) in result["intervals"].items():
+        metrics[f"{prefix}_{metric}_ci_low"] = low
+        metrics[f"{prefix}_{metric}_ci_high"] = high
+    return metrics
+
+
+def write_evaluation_report(result: dict, path: str, sweep_path: str = None) -> None:
+    with open(path, "w") as f:
+        f.write(f"rows={result['n']} threshold={result['threshold']}\n")
+        f.write(" ".join(f"{key}={value}" for key, value in result["confusion"].items()) + "\n\n")
+        level = int(round(result["confidence"] * 100))
+        for metric, value in result["metrics"].items():
+            interval = result["intervals"].get(metric)
+            ci = f"  [{interval[0]:.4f}, {interval[1]:.4f}] {level}% CI" if interval else ""
+            f.write(f"{metric:<10} {value:.4f}{ci}\n")
+        f.write(f"\nbest_f1_threshold={result['best_f1_threshold']:.4f}\n")
+        f.write(f"best_youden_threshold={result['best_youden_threshold']:.4f}\n")
+    if sweep_path is not None:
+        result["sweep"].to_csv(sweep_path, index=False)
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, get_scorer, roc_auc_score
+from sklearn.pipeline import Pipeline
+
+from src.features.feature_pipeline import (ENGINEERED_FEATURES,
+                                           build_feature_pipeline)
+from src.models.serving_cost import measure_row_latency
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _permuted_score(model, X, y, columns: list, seed: list, scorer) -> float:
+    rng = np.random.default_rng(seed)
+    X_permuted = np.array(X, copy=True)
+    X_permuted[:, columns] = X_permuted[np.ix_(rng.permutation(len(X_permuted)), columns)]
+    return scorer(model, X_permuted, y)
+
+
+def permutation_importance(
+    model, X, y, groups: dict, n_repeats: int = 5, n_jobs: int = None, seed: int = 0, scoring: str = "roc_auc"
+) -> pd.DataFrame:
+    """
+    Drop in ``scoring`` on the transformed holdout ``X`` when the columns of
+    one group (see ``feature_groups``) are shuffled together, for every
+    group. X is transformed once by the caller and shared by every
+    (group, repeat) task; the tasks run in parallel with joblib, which
+    memory-maps large arrays instead of copying them to each worker.
+    Returns one row per group, most important first.
+    """
+    scorer = get_scorer(scoring)
+    baseline = scorer(model, X, y)
+    names = list(groups)
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_permuted_score)(model, X, y, groups[name], [seed, i, repeat], scorer)
+        for i, name in enumerate(names)
+        for repeat in range(n_repeats)
+    )
+    drops = baseline - np.asarray(scores).reshape(len(names), n_repeats)
+    importances = pd.DataFrame(
+        {
+            "importance_mean": drops.mean(axis=1),
+            "importance_std": drops.std(axis=1),
+            "n_columns": [len(groups[name]) for name in names],
+        },
+        index=pd.Index(names, name="feature"),
+    )
+    logger.info("Permutation importance of %d features x %d repeats (baseline %s %.4f)",
+                len(names), n_repeats, scoring, baseline)
+    return importances.sort_values("importance_mean", ascending=False)
+
+
+def reduced_feature_sets(importances: pd.DataFrame, keep_top: list) -> dict:
+    """
+    Feature sets to try, by name: every feature, the ones whose shuffling
+    hurt the score, and the ``k`` most important for each k in ``keep_top``.
+    Sets identical to an earlier one are skipped.
+    """
+    ranked = list(importances.index)
+    candidates = {
+        "all": ranked,
+        "positive_importance": [name for name in ranked if importances.loc[name, "importance_mean"] > 0],
+    }
+    for k in sorted(keep_top, reverse=True):
+        candidates[f"top_{k}"] = ranked[:k]
+
+    sets, seen = {}, set()
+    for name, features in candidates.items():
+        key = frozenset(features)
+        if features and key not in seen:
+            seen.add(key)
+            sets[name] = features
+    return sets
+
+
+def build_reduced_pipeline(model, features: list, numeric_cols: list, categorical_cols: list) -> tuple:
+    """
+    Unfitted copy of ``model`` behind a feature pipeline that encodes only
+    ``features``; returns (pipeline, raw input columns it needs).
+    """
+    numeric = [col for col in numeric_cols if col in features]
+    categorical = [col for col in categorical_cols if col in features]
+    engineered = [col for col in ENGINEERED_FEATURES if col in features]
+    needed = set(numeric + categorical).union(*(ENGINEERED_FEATURES[col] for col in engineered))
+    inputs = [col for col in list(numeric_cols) + list(categorical_cols) if col in needed]
+    inputs += sorted(needed - set(inputs))
+    pipeline = Pipeline(
+        steps=[
+            ("features", build_feature_pipeline(numeric, categorical, engineered=engineered)),
+            ("model", clone(model)),
+        ]
+    )
+    return pipeline, inputs
+
+
+def evaluate_reduced_variants(
+    model, feature_sets: dict, X_train, y_train, X_test, y_test, numeric_cols: list, categorical_cols: list
+) -> pd.DataFrame:
+    """
+    Fit ``model`` on each feature set and report holdout accuracy and
+    ROC-AUC against single-row serving latency (and the number of raw
+    inputs a request must carry).
+    """
+    rows = {}
+    for name, features in feature_sets.items():
+        pipeline, inputs = build_reduced_pipeline(model, features, numeric_cols, categorical_cols)
+        pipeline.fit(X_train[inputs], y_train)
+        proba = pipeline.predict_proba(X_test[inputs])[:, 1]
+        latency_ms = measure_row_latency(pipeline, X_test[inputs])
+        rows[name] = {
+            "n_features": len(features),
+            "n_inputs": len(inputs),
+            "n_columns": pipeline[:-1].transform(X_test[inputs].iloc[:1]).shape[1],
+            "accuracy": accuracy_score(y_test, proba > 0.5),
+            "roc_auc": roc_auc_score(y_test, proba),
+            "p50_ms": float(np.percentile(latency_ms, 50)),
+            "p99_ms": float(np.percentile(latency_ms, 99)),
+            "dropped": ", ".join(sorted(set(feature_sets["all"]) - set(features))) if "all" in feature_sets else "",
+        }
+    table = pd.DataFrame(rows).T
+    table.index.name = "variant"
+    return table
+
+
+def write_feature_importance_report(importances: pd.DataFrame, variants: pd.DataFrame, path: str) -> None:
+    with open(path, "w") as f:
+        f.write("Permutation importance on the holdout (score drop when shuffled)\n\n")
+        f.write(importances.to_string(float_format=lambda v: f"{v:.4f}") + "\n\n")
+        f.write("Reduced-feature variants: holdout accuracy vs. single-row latency\n\n")
+        f.write(variants.to_string(float_format=lambda v: f"{v:.4f}") + "\n")
@@ -0,0 +1,109 @@
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.tree._tree import Tree
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FoldEnsembleClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Soft-voting ensemble of classifiers trained on different folds: the
+    probability is the mean of the members' ``predict_proba``. Built from
+    already-fitted CV estimators with ``from_fitted``, it serves without
+    a final refit.
+    """
+
+    def __init__(self, estimators):
+        self.estimators = estimators
+
+    @classmethod
+    def from_fitted(cls, estimators):
+        ensemble = cls(list(estimators))
+        ensemble.estimators_ = list(estimators)
+        ensemble.classes_ = ensemble.estimators_[0].classes_
+        return ensemble
+
+    def fit(self, X, y):
+        self.estimators_ = [clone(estimator).fit(X, y) for estimator in self.estimators]
+        self.classes_ = self.estimators_[0].classes_
+        return self
+
+    def predict_proba(self, X):
+        return np.mean([estimator.predict_proba(X) for estimator in self.estimators_], axis=0)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def _reused_trees(fold_models: list, n_trees: int) -> list:
+    # Round-robin over folds so every fold contributes equally
+    pools = [list(model.estimators_) for model in fold_models]
+    trees = []
+    while len(trees) < n_trees and any(pools):
+        for pool in pools:
+            if pool and len(trees) < n_trees:
+                trees.append(pool.pop(0))
+    return trees
+
+
+def expand_inputs(model, columns: np.ndarray, n_features: int):
+    """
+    Re-express a fitted model on a wider input: its input ``i`` becomes
+    column ``columns[i]`` of ``n_features``, and the added columns are
+    ignored (zero coefficients, no tree splits). A fold fit whose one-hot
+    encoder never saw some categories is mapped this way onto the full
+    split's columns; an unseen category encodes as all zeros in the fold,
+    so the predictions do not change. Modifies ``model`` in place.
+    """
+    columns = np.asarray(columns, dtype=np.intp)
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        for tree in model.estimators_:
+            state = tree.tree_.__getstate__()
+            nodes = state["nodes"].copy()
+            split = nodes["feature"] >= 0
+            nodes["feature"][split] = columns[nodes["feature"][split]]
+            state["nodes"] = nodes
+            tree.tree_ = Tree(n_features, tree.tree_.n_classes, tree.tree_.n_outputs)
+            tree.tree_.__setstate__(state)
+            tree.n_features_in_ = n_features
+    elif hasattr(model, "coef_"):
+        coef = np.zeros((model.coef_.shape[0], n_features), dtype=model.coef_.dtype)
+        coef[:, columns] = model.coef_
+        model.coef_ = coef
+    else:
+        raise TypeError(f"Cannot expand the inputs of {type(model).__name__}")
+    model.n_features_in_ = n_features
+    return model
+
+
+def warm_start_fit(model, fold_models: list, X, y):
+    """
+    Fit ``model`` on (X, y) starting from its fitted CV folds.
+
+    Forests keep ``1 - 1/k`` of their trees from the k folds and grow only
+    the rest on all of X, cutting the fit cost by the same fraction. Linear
+    models with a solver that supports ``warm_start`` start from the mean
+    fold coefficients. Anything else is fit from scratch.
+    """
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        n_reused = int(round(model.n_estimators * (1 - 1 / len(fold_models))))
+        forest = clone(model).set_params(warm_start=True)
+        forest.estimators_ = _reused_trees(fold_models, n_reused)
+        forest.fit(X, y)
+        forest.set_params(warm_start=False)
+        logger.info("Warm-started forest: %d fold trees reused, %d grown", n_reused, len(forest.estimators_) - n_reused)
+        return forest
+
+    params = model.get_params()
+    if "warm_start" in params and params.get("solver") != "liblinear" and hasattr(fold_models[0], "coef_"):
+        estimator = clone(model).set_params(warm_start=True)
+        estimator.coef_ = np.mean([fold.coef_ for fold in fold_models], axis=0)
+        estimator.intercept_ = np.mean([fold.intercept_ for fold in fold_models], axis=0)
+        estimator.fit(X, y)
+        return estimator.set_params(warm_start=False)
+
+    logger.info("%s cannot warm start; fitting from scratch", type(model).__name__)
+    return clone(model).fit(X, y)
@@ -0,0 +1,345 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+
+from src.data.load_data import (load_processed_increments, load_raw_data,
+                                save_processed_increment)
+from src.data.preprocess import clean_data, validate_data
+from src.features.statistics import (feature_statistics, median,
+                                     merge_statistics, new_categories,
+                                     refresh_feature_pipeline)
+from src.models.cascade import CascadeClassifier
+from src.models.quantize import quantize_bundle
+from src.monitoring.drift import profile_drift
+from src.utils.config import PROJECT_ROOT, load_config, resolve_path
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TARGET = "target"
+
+MODEL_PATH = os.path.join(PROJECT_ROOT, "artifacts", "model.pkl")
+
+# Exit status of the CLI when a guard asks for a full retrain instead
+FULL_RETRAIN_EXIT_CODE = 3
+
+
+class FullRetrainRequired(Exception):
+    """
+    An incremental update was refused; only a full retrain may publish.
+    """
+
+
+def rescale_inputs(model, scale: np.ndarray, shift: np.ndarray):
+    """
+    Re-express a fitted model on rescaled inputs. Its first ``len(scale)``
+    inputs were ``old = scale * new + shift`` of the new ones (see
+    ``refresh_feature_pipeline``); afterwards the model gives the same
+    predictions on the new inputs as it did on the old. Tree thresholds
+    and linear coefficients are transformed in place. A forest can still
+    send an input the other way at a split that sits within float32
+    rounding of the input (trees often split there).
+    """
+    n_scaled = len(scale)
+    if isinstance(model, CascadeClassifier):
+        rescale_inputs(model.fast_, scale, shift)
+        rescale_inputs(model.slow_, scale, shift)
+    elif isinstance(model, RandomForestClassifier):
+        for tree in model.estimators_:
+            # threshold is a view of the tree's node array
+            feature, threshold = tree.tree_.feature, tree.tree_.threshold
+            split = (feature >= 0) & (feature < n_scaled)
+            threshold[split] = (threshold[split] - shift[feature[split]]) / scale[feature[split]]
+    elif isinstance(model, (LogisticRegression, SGDClassifier)):
+        coef = model.coef_.copy()
+        model.intercept_ = model.intercept_ + coef[:, :n_scaled] @ shift
+        coef[:, :n_scaled] *= scale
+        model.coef_ = coef
+    else:
+        raise FullRetrainRequired(f"{type(model).__name__} has no incremental update")
+    return model
+
+
+def grow_forest(forest, X, y, settings: dict, n_rows_before: int):
+    """
+    Add warm-started trees fit on the new rows only: as many as the rows'
+    share of the data (at least ``min_new_trees``), so each row carries
+    about the same weight. The oldest trees beyond ``max_trees`` are dropped.
+    """
+    n_trees = len(forest.estimators_)
+    n_new = max(settings.get("min_new_trees", 10), int(round(n_trees * len(y) / n_rows_before)))
+    forest.set_params(warm_start=True, n_estimators=n_trees + n_new)
+    forest.fit(X, y)
+    max_trees = settings.get("max_trees")
+    if max_trees and len(forest.estimators_) > max_trees:
+        forest.estimators_ = forest.estimators_[-max_trees:]
+    forest.set_params(warm_start=False, n_estimators=len(forest.estimators_))
+    logger.info("Grew forest by %d trees to %d", n_new, len(forest.estimators_))
+    return forest
+
+
+def sgd_update(model, X, y, settings: dict, n_rows_before: int, n_rows: int):
+    """
+    Continue a linear model with SGD epochs over the new rows, starting from
+    its coefficients. Logistic regression becomes an ``SGDClassifier`` with
+    log loss and the same L2 strength per row (alpha = 1 / (C * n)).
+    """
+    sgd_settings = settings.get("sgd", {})
+    if isinstance(model, SGDClassifier):
+        sgd = clone(model).set_params(alpha=model.alpha * n_rows_before / n_rows)
+    else:
+        sgd = SGDClassifier(loss="log_loss", alpha=1.0 / (model.C * n_rows), random_state=42)
+    sgd.set_params(
+        learning_rate="constant",
+        eta0=sgd_settings.get("eta0", 0.01),
+        max_iter=sgd_settings.get("epochs", 5),
+        tol=None,
+    )
+    return sgd.fit(X, y, coef_init=model.coef_, intercept_init=model.intercept_)
+
+
+def update_estimator(model, X, y, settings: dict, n_rows_before: int, n_rows: int):
+    if isinstance(model, CascadeClassifier):
+        model.fast_ = update_estimator(model.fast_, X, y, settings, n_rows_before, n_rows)
+        model.slow_ = update_estimator(model.slow_, X, y, settings, n_rows_before, n_rows)
+        return model
+    if isinstance(model, RandomForestClassifier):
+        return grow_forest(model, X, y, settings, n_rows_before)
+    if isinstance(model, (LogisticRegression, SGDClassifier)):
+        return sgd_update(model, X, y, settings, n_rows_before, n_rows)
+    raise FullRetrainRequired(f"{type(model).__name__} has no incremental update")
+
+
+def prepare_new_rows(df: pd.DataFrame, bundle: dict, numeric_cols: list) -> pd.DataFrame:
+    """
+    Clean and validate newly arrived labelled rows into the processed
+    layout. Unlabelled rows are dropped and missing measurements take the
+    running medians, as preprocessing does for the full dataset.
+    """
+    df = clean_data(df)
+    validate_data(df)
+    df = df[df[TARGET].notna()].copy()
+    medians = bundle["feature_statistics"]["numeric"]
+    for col in numeric_cols:
+        if df[col].isna().any():
+            df[col] = df[col].fillna(median(medians[col]))
+    return df[list(bundle["raw_feature_names"]) + [TARGET]]
+
+
+def guard_reasons(lineage: dict, n_new: int, drift_rows: pd.DataFrame, profile: dict, unseen: dict, settings: dict):
+    """
+    Why the update must wait for a full retrain (empty when it may go
+    ahead), plus the worst feature PSI of the rows since the last full
+    retrain against its training profile.
+    """
+    reasons = []
+    max_updates = settings.get("max_updates", 20)
+    if lineage["incremental_updates"] + 1 > max_updates:
+        reasons.append(f"{max_updates} incremental updates since the last full retrain")
+    max_fraction = settings.get("max_new_row_fraction", 0.5)
+    if lineage["rows_since_full"] + n_new > max_fraction * lineage["base_rows"]:
+        reasons.append(f"new rows exceed {max_fraction:.0%} of the last full retrain's rows")
+
+    worst_psi = None
+    if profile is not None and len(drift_rows) >= settings.get("min_drift_rows", 100):
+        scores = profile_drift(profile, drift_rows)
+        feature = max(scores, key=lambda col: scores[col]["psi"])
+        worst_psi = scores[feature]["psi"]
+        if worst_psi > settings.get("max_psi", 0.25):
+            reasons.append(f"{feature} drifted from the last full retrain (PSI {worst_psi:.3f})")
+    if unseen:
+        reasons.append(f"unseen categories {unseen}")
+    return reasons, worst_psi
+
+
+def _archive_path(model_path: str, version: str) -> str:
+    return os.path.join(os.path.dirname(model_path), "versions", f"{version}.pkl")
+
+
+def _quantized_path(model_path: str) -> str:
+    # Where train.py writes the quantized copy of the artifact
+    return os.path.join(os.path.dirname(model_path), "model_quantized.pkl")
+
+
+def _publish(bundle: dict, model_path: str) -> None:
+    # Write next to the target and rename, so serving never reads a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(model_path), suffix=".pkl.tmp")
+    os.close(fd)
+    try:
+        joblib.dump(bundle, tmp_path)
+        os.replace(tmp_path, model_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def incremental_retrain(new_rows: pd.DataFrame, config: dict, model_path: str = MODEL_PATH) -> dict:
+    """
+    Fold newly arrived labelled rows into the published model without a
+    full retrain:
+
+    1. the rows are stored as a partition of the processed data (full
+       retrains pick them up too);
+    2. the feature pipeline's imputer and scaler statistics are updated to
+       what a refit on all rows would give, and the model is re-expressed
+       on the rescaled features;
+    3. forests grow warm-started trees on the new rows and linear models
+       continue with SGD;
+    4. a new artifact version is published and the previous one archived;
+       a quantized copy next to it is rebuilt from the new version.
+
+    Guards against the last full retrain raise ``FullRetrainRequired``
+    instead of publishing: too many updates or rows since it, input drift
+    from its training profile, unseen categories, or predictions moving
+    more than ``max_prediction_shift`` away from its model on those rows.
+    Returns a summary of the update.
+    """
+    start = time.perf_counter()
+    settings = config.get("training", {}).get("incremental", {})
+    bundle = joblib.load(model_path)
+    pipeline = bundle["model"]
+    if "feature_statistics" not in bundle or not (
+        isinstance(pipeline, Pipeline) and "features" in pipeline.named_steps
+    ):
+        raise FullRetrainRequired("artifact has no feature statistics to update")
+    features, final = pipeline.named_steps["features"], pipeline.steps[-1][1]
+
+    rows = prepare_new_rows(new_rows, bundle, config["preprocessing"]["numerical_features"])
+    y = (rows[TARGET] > 0).astype(int).to_numpy()
+    X_raw = rows.drop(columns=[TARGET])
+
+    # Versions name the increment partitions and archives and must sort in
+    # publication order, so a clash or a clock step backwards is refused
+    parent_version = bundle["model_version"]
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    increments_path = resolve_path(config["data"]["increments_path"])
+    if (
+        version <= parent_version
+        or os.path.exists(os.path.join(increments_path, f"{version}.csv"))
+        or os.path.exists(_archive_path(model_path, version))
+    ):
+        raise FileExistsError(f"Model version {version} already exists or is not after {parent_version}")
+    save_processed_increment(rows, increments_path, version)
+    if len(np.unique(y)) < 2:
+        raise ValueError("New rows need both classes to update the model; they were stored for the next retrain")
+
+    lineage = dict(bundle.get("lineage") or {})
+    lineage.setdefault("base_version", parent_version)
+    lineage.setdefault("base_rows", bundle["feature_statistics"]["n_rows"])
+    lineage.setdefault("incremental_updates", 0)
+    lineage.setdefault("rows_since_full", 0)
+
+    stats_before = bundle["feature_statistics"]
+    stats = merge_statistics(stats_before, feature_statistics(features, X_raw))
+    since_full = load_processed_increments(increments_path, after=lineage["base_version"])
+    reasons, worst_psi = guard_reasons(
+        lineage, len(rows), since_full, bundle.get("feature_profile"), new_categories(stats, features), settings
+    )
+    if reasons:
+        raise FullRetrainRequired("; ".join(reasons))
+
+    # The last full retrain's model, archived on the first update after it
+    reference_path = _archive_path(model_path, lineage["base_version"])
+    reference = joblib.load(reference_path if os.path.exists(reference_path) else model_path)["model"]
+
+    scale, shift = refresh_feature_pipeline(features, stats)
+    rescale_inputs(final, scale, shift)
+    final = update_estimator(
+        final, features.transform(X_raw), y, settings, stats_before["n_rows"], stats["n_rows"]
+    )
+    pipeline.steps[-1] = (pipeline.steps[-1][0], final)
+
+    X_since = since_full.drop(columns=[TARGET])
+    prediction_shift = float(
+        np.mean(np.abs(pipeline.predict_proba(X_since)[:, 1] - reference.predict_proba(X_since)[:, 1]))
+    )
+    if prediction_shift > settings.get("max_prediction_shift", 0.1):
+        raise FullRetrainRequired(
+            f"predictions moved {prediction_shift:.3f} from the last full retrain's model"
+        )
+
+    lineage.update(
+        parent_version=parent_version,
+        incremental_updates=lineage["incremental_updates"] + 1,
+        rows_since_full=lineage["rows_since_full"] + len(rows),
+    )
+    archive_path = _archive_path(model_path, parent_version)
+    if not os.path.exists(archive_path):
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        shutil.copyfile(model_path, archive_path)
+    bundle.update(model=pipeline, model_version=version, feature_statistics=stats, lineage=lineage)
+    _publish(bundle, model_path)
+    logger.info("Published model %s (%d new rows on top of %s)", version, len(rows), parent_version)
+    quantized_path = _quantized_path(model_path)
+    if os.path.exists(quantized_path):
+        # Keep the quantized copy on the same version, with its settings
+        settings = joblib.load(quantized_path).get("quantization", {})
+        _publish(quantize_bundle(bundle, **settings), quantized_path)
+        logger.info("Re-quantized %s", quantized_path)
+
+    return {
+        "version": version,
+        "parent_version": parent_version,
+        "base_version": lineage["base_version"],
+        "new_rows": len(rows),
+        "incremental_updates": lineage["incremental_updates"],
+        "rows_since_full": lineage["rows_since_full"],
+        "max_psi": worst_psi,
+        "prediction_shift": prediction_shift,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Fold newly arrived labelled rows into the published model")
+    parser.add_argument("new_rows", help="CSV of new rows with the raw feature columns and target")
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument(
+        "--full-on-guard", action="store_true", help="Run a full retrain when a guard refuses the update"
+    )
+    args = parser.parse_args(argv)
+
+    from src.models import train
+    from src.utils.tracking import batched_run
+
+    config = load_config()
+    try:
+        summary = incremental_retrain(load_raw_data(args.new_rows, typed=False), config, args.model_path)
+    except FullRetrainRequired as exc:
+        print(f"Full retrain required: {exc}")
+        if not args.full_on_guard:
+            sys.exit(FULL_RETRAIN_EXIT_CODE)
+        train.main(config)
+        return
+
+    print(
+        f"Published {summary['version']}: {summary['new_rows']} new rows, "
+        f"update {summary['incremental_updates']} since full retrain {summary['base_version']}"
+    )
+    train.configure_mlflow()
+    with batched_run(run_name="Incremental_Retrain") as tracker:
+        tracker.log_params({key: summary[key] for key in ("version", "parent_version", "base_version")})
+        tracker.log_metrics(
+            {
+                key: summary[key]
+                for key in ("new_rows", "incremental_updates", "rows_since_full", "prediction_shift", "seconds")
+            }
+        )
+        if summary["max_psi"] is not None:
+            tracker.log_metric("max_psi", summary["max_psi"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,15 @@
 import os
-import sys
-import joblib
-import numpy as np
-import pandas as pd
+import threading
+import time
 
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+import numpy as np
 
+from src.data.schema import FEATURE_COLUMNS, get_validator
+from src.models.packed_forest import (PackedForest, get_packed_forest,
+                                      packed_cache_bytes)
+from src.monitoring.drift import DriftMonitor
 from src.utils.logger import get_logger
+from src.utils.memory import rss_bytes
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -16,32 +17,207 @@ DEFAULT_MODEL_PATH = os.path.join(BASE_DIR, "artifacts", "model.pkl")
 
 logger = get_logger(__name__)
 
+# joblib, pandas and sklearn (and the model classes built on it) are
+# imported on first use rather than here: they are only needed once a
+# model is loaded, and importing them costs the API seconds at startup.
+
+# Batches up to this size score faster through the packed forest arrays
+# than through sklearn's per-tree calls (scripts/benchmark_packed_forest.py)
+PACKED_FOREST_MAX_ROWS = 256
+
+# With a deadline, batches are scored in chunks of this many rows and the
+# deadline is checked before each one
+DEADLINE_CHUNK_ROWS = 256
+
 _bundle = None
+_bundle_load_bytes = None
+_drift_monitor = None
+_drift_monitor_lock = threading.Lock()
 
 
 def get_bundle():
-    global _bundle
+    global _bundle, _bundle_load_bytes
     if _bundle is None:
         model_path = os.environ.get("MODEL_PATH", DEFAULT_MODEL_PATH)
         logger.info("Loading model artifact from %s", model_path)
+        import joblib
+
+        rss_before = rss_bytes()
         _bundle = joblib.load(model_path)
+        _bundle_load_bytes = rss_bytes() - rss_before
+        logger.info("Model artifact added %.1f MB of RSS", _bundle_load_bytes / 1024 / 1024)
     return _bundle
 
 
-def predict(input_json: dict):
+def get_model_version() -> str:
+    return get_bundle().get("model_version", "unknown")
+
+
+def get_drift_monitor(bundle: dict):
+    """
+    Drift monitor for the bundle's training profile, or None for bundles
+    saved without one. Recreated when a different bundle is loaded; the
+    swap is locked so concurrent requests start only one monitor.
+    """
+    global _drift_monitor
+    profile = bundle.get("feature_profile")
+    if profile is None:
+        return None
+    monitor = _drift_monitor
+    if monitor is not None and monitor.profile is profile:
+        return monitor
+    with _drift_monitor_lock:
+        if _drift_monitor is None or _drift_monitor.profile is not profile:
+            if _drift_monitor is not None:
+                _drift_monitor.stop()
+            monitor = DriftMonitor(profile, interval=float(os.environ.get("DRIFT_INTERVAL_SECONDS", "30")))
+            monitor.start()
+            _drift_monitor = monitor
+        return _drift_monitor
+
+
+def memory_usage() -> dict:
+    """
+    Bytes held by the serving caches, plus the RSS the model bundle added
+    when it was loaded (None before the first load).
+    """
+    return {
+        "bundle_load": _bundle_load_bytes,
+        "packed_forest": packed_cache_bytes(),
+        "drift_window": _drift_monitor.nbytes if _drift_monitor is not None else 0,
+    }
+
+
+def _final_estimator(model):
+    from sklearn.pipeline import Pipeline
+
+    return model.steps[-1][1] if isinstance(model, Pipeline) else model
+
+
+def _features(model, df, final):
+    return model[:-1].transform(df) if final is not model else df
+
+
+def score(model, df, anytime: dict = None, deadline: float = None) -> list:
+    """
+    Score ``df`` and return one result dict per row. Cascades add whether
+    the row was escalated. Random-forest batches of up to
+    PACKED_FOREST_MAX_ROWS rows with no time budget are scored with
+    ``PackedForest`` (the same probabilities within float rounding), as
+    are quantized forests (see ``src.models.quantize``) of any batch size.
+    Other random-forest batches served in anytime mode (see
+    ``AnytimeForest``) add how many trees were evaluated. Confidence is
+    None when the model has no predict_proba.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    from src.models.anytime_forest import AnytimeForest
+    from src.models.cascade import CascadeClassifier
+
+    final = _final_estimator(model)
+
+    if isinstance(final, CascadeClassifier):
+        proba, escalated = final.predict_proba_with_escalation(_features(model, df, final))
+        return [
+            {"prediction": int(label), "confidence": float(p), "escalated": bool(e)}
+            for label, p, e in zip(final.classes_[np.argmax(proba, axis=1)], proba.max(axis=1), escalated)
+        ]
+
+    # Anytime mode is for requests with a time budget and for batches too
+    # large for the packed forest; small unbudgeted batches take the packed path
+    budgeted = deadline is not None or (anytime is not None and anytime.get("budget_ms") is not None)
+    if isinstance(final, PackedForest) or (
+        isinstance(final, RandomForestClassifier) and len(df) <= PACKED_FOREST_MAX_ROWS and not budgeted
+    ):
+        # Quantized artifacts already hold the packed arrays in place of the forest
+        packed = final if isinstance(final, PackedForest) else get_packed_forest(final)
+        proba = packed.predict_proba(_features(model, df, final))
+        return [
+            {"prediction": int(label), "confidence": float(p)}
+            for label, p in zip(final.classes_[np.argmax(proba, axis=1)], proba.max(axis=1))
+        ]
+
+    if anytime is not None and isinstance(final, RandomForestClassifier):
+        if deadline is None and anytime.get("budget_ms") is not None:
+            deadline = time.perf_counter() + anytime["budget_ms"] / 1000
+        engine = AnytimeForest(final, batch_size=anytime.get("batch_size", 10), delta=anytime.get("delta", 0.01))
+        proba, used = engine.predict_proba_anytime(_features(model, df, final), deadline)
+        return [
+            {"prediction": int(label), "confidence": float(p), "trees_used": int(n)}
+            for label, p, n in zip(final.classes_[np.argmax(proba, axis=1)], proba.max(axis=1), used)
+        ]
+
+    predictions = model.predict(df)
+    confidences = [None] * len(df)
+    if hasattr(model, "predict_proba"):
+        confidences = np.asarray(model.predict_proba(df)).max(axis=1).tolist()
+    return [
+        {"prediction": int(label), "confidence": confidence}
+        for label, confidence in zip(predictions, confidences)
+    ]
+
+
+def predict(input_json: dict, deadline: float = None):
     bundle = get_bundle()
     model = bundle["model"]
     raw_feature_names = bundle.get("raw_feature_names")
 
+    import pandas as pd
+
     df = pd.DataFrame([input_json])
 
     if raw_feature_names is not None:
         df = df.reindex(columns=raw_feature_names, fill_value=np.nan)
 
-    prediction = model.predict(df)
+    [result] = score(model, df, anytime=bundle.get("anytime_forest"), deadline=deadline)
 
-    confidence = None
-    if hasattr(model, "predict_proba"):
-        confidence = float(np.array(model.predict_proba(df)).max())
+    monitor = get_drift_monitor(bundle)
+    if monitor is not None:
+        monitor.observe(input_json)
+
+    return result
+
+
+def predict_batch(records: list, deadline: float = None) -> dict:
+    """
+    Validate and score many records with a single model call. Rows that fail
+    schema validation are not scored and come back as None.
+
+    With a ``deadline`` (a ``time.perf_counter()`` value) rows are scored in
+    chunks, and once it has passed the remaining rows are dropped before
+    any work is done on them: they also come back as None and their
+    indices are listed under ``expired_rows``.
+    """
+    bundle = get_bundle()
+    model = bundle["model"]
+    columns = bundle.get("raw_feature_names") or FEATURE_COLUMNS
+
+    import pandas as pd
+
+    X, report = get_validator().validate_records(records, columns)
+    valid_idx = np.flatnonzero(~report.invalid_rows)
+
+    chunk_rows = len(valid_idx) if deadline is None else DEADLINE_CHUNK_ROWS
+    results = [None] * len(records)
+    scored_idx = []
+    for start in range(0, len(valid_idx), max(chunk_rows, 1)):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        chunk = valid_idx[start : start + chunk_rows]
+        df = pd.DataFrame(X[chunk], columns=columns)
+        scored = score(model, df, anytime=bundle.get("anytime_forest"), deadline=deadline)
+        for i, result in zip(chunk, scored):
+            results[i] = result
+        scored_idx.append(chunk)
+
+    if scored_idx:
+        monitor = get_drift_monitor(bundle)
+        if monitor is not None:
+            monitor.observe_array(X[np.concatenate(scored_idx)], columns)
 
-    return {"prediction": int(prediction[0]), "confidence": confidence}
+    response = {"predictions": results, "validation": report.to_dict()}
+    n_scored = sum(len(chunk) for chunk in scored_idx)
+    if n_scored < len(valid_idx):
+        response["expired_rows"] = valid_idx[n_scored:].tolist()
+        logger.warning("Deadline passed; dropped %d of %d batch rows", len(valid_idx) - n_scored, len(valid_idx))
+    return response
@@ -0,0 +1,111 @@
+import copy
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.pipeline import Pipeline
+
+from src.models.cascade import CascadeClassifier
+from src.models.fold_ensemble import FoldEnsembleClassifier
+from src.models.packed_forest import QuantizedForest
+from src.models.serving_cost import measure_loaded_rss
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def quantize_model(model, thresholds: str = "float32", value_bits: int = 8):
+    """
+    Copy of a fitted model with every random forest replaced by a
+    ``QuantizedForest`` and linear coefficients cast to float32. Pipelines,
+    cascades and fold ensembles are rebuilt around their quantized parts;
+    the input model is not modified.
+    """
+    if isinstance(model, Pipeline):
+        name, final = model.steps[-1]
+        return Pipeline(steps=model.steps[:-1] + [(name, quantize_model(final, thresholds, value_bits))])
+    if isinstance(model, CascadeClassifier):
+        return CascadeClassifier.from_fitted(
+            quantize_model(model.fast_, thresholds, value_bits),
+            quantize_model(model.slow_, thresholds, value_bits),
+            lower=model.lower,
+            upper=model.upper,
+        )
+    if isinstance(model, FoldEnsembleClassifier):
+        return FoldEnsembleClassifier.from_fitted(
+            [quantize_model(member, thresholds, value_bits) for member in model.estimators_]
+        )
+    if isinstance(model, RandomForestClassifier):
+        return QuantizedForest(model, thresholds=thresholds, value_bits=value_bits)
+    if isinstance(model, (LogisticRegression, SGDClassifier)):
+        model = copy.deepcopy(model)
+        model.coef_ = model.coef_.astype(np.float32)
+        model.intercept_ = model.intercept_.astype(np.float32)
+        return model
+    logger.warning("No quantization for %s; keeping it as is", type(model).__name__)
+    return model
+
+
+def quantize_bundle(bundle: dict, thresholds: str = "float32", value_bits: int = 8) -> dict:
+    """
+    Model artifact with its model quantized. Anytime settings are dropped
+    (they apply to sklearn forests only); the serving path scores the
+    quantized forest directly.
+    """
+    quantized = {key: value for key, value in bundle.items() if key != "anytime_forest"}
+    quantized["model"] = quantize_model(bundle["model"], thresholds, value_bits)
+    quantized["quantization"] = {"thresholds": thresholds, "value_bits": value_bits}
+    return quantized
+
+
+def quantization_parity(model, quantized, X, y) -> dict:
+    """
+    Holdout agreement between a model and its quantized copy.
+    """
+    proba = model.predict_proba(X)
+    quantized_proba = quantized.predict_proba(X)
+    diff = np.abs(proba[:, 1] - quantized_proba[:, 1])
+    return {
+        "label_agreement": float(np.mean(np.argmax(proba, axis=1) == np.argmax(quantized_proba, axis=1))),
+        "max_abs_proba_diff": float(diff.max()),
+        "mean_abs_proba_diff": float(diff.mean()),
+        "accuracy": accuracy_score(y, model.classes_[np.argmax(proba, axis=1)]),
+        "quantized_accuracy": accuracy_score(y, model.classes_[np.argmax(quantized_proba, axis=1)]),
+        "roc_auc": roc_auc_score(y, proba[:, 1]),
+        "quantized_roc_auc": roc_auc_score(y, quantized_proba[:, 1]),
+    }
+
+
+def artifact_footprint(path: str, n_loads: int = 5) -> dict:
+    """
+    Size on disk, median in-process ``joblib.load`` time and the RSS a
+    fresh process adds by loading the artifact.
+    """
+    load_times = []
+    for _ in range(n_loads):
+        start = time.perf_counter()
+        joblib.load(path)
+        load_times.append(time.perf_counter() - start)
+    rss = measure_loaded_rss(path)
+    return {
+        "artifact_mb": os.path.getsize(path) / 1e6,
+        "load_ms": float(np.median(load_times) * 1000),
+        "model_memory_mb": rss["loaded_rss_mb"] - rss["base_rss_mb"],
+    }
+
+
+def write_quantization_report(settings: dict, parity: dict, footprints: dict, path: str) -> None:
+    original, quantized = footprints["original"], footprints["quantized"]
+    with open(path, "w") as f:
+        f.write(f"thresholds={settings['thresholds']} value_bits={settings['value_bits']}\n\n")
+        f.write("Holdout parity\n")
+        for key, value in parity.items():
+            f.write(f"  {key}: {value:.6f}\n")
+        f.write("\nFootprint          original   quantized   saving\n")
+        for key in ("artifact_mb", "load_ms", "model_memory_mb"):
+            saving = 1 - quantized[key] / original[key] if original[key] > 0 else 0.0
+            f.write(f"  {key:<16} {original[key]:>9.3f}   {quantized[key]:>9.3f}   {saving:>6.1%}\n")
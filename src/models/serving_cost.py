@@ -0,0 +1,203 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.utils.config import PROJECT_ROOT
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Loads an artifact in a fresh interpreter and reports its RSS before and
+# after, which is what a serving pod's memory limit actually applies to.
+_RSS_PROBE = """
+import json, resource, sys
+import joblib, numpy, pandas, sklearn
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+base = rss_mb()
+model = joblib.load(sys.argv[1])
+print(json.dumps({"base_rss_mb": base, "loaded_rss_mb": rss_mb()}))
+"""
+
+
+def measure_loaded_rss(artifact_path: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run(
+        [sys.executable, "-c", _RSS_PROBE, artifact_path],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT,
+        env=env,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_row_latency(model, X: pd.DataFrame, n_single: int = 200, warmup: int = 10) -> np.ndarray:
+    """
+    Milliseconds per single-row ``predict_proba`` call, over ``n_single``
+    calls cycling through the rows of X after ``warmup`` untimed ones.
+    """
+    rows = [X.iloc[[i % len(X)]] for i in range(n_single + warmup)]
+    for row in rows[:warmup]:
+        model.predict_proba(row)
+    single = []
+    for row in rows[warmup:]:
+        start = time.perf_counter()
+        model.predict_proba(row)
+        single.append(time.perf_counter() - start)
+    return np.asarray(single) * 1000
+
+
+def measure_serving_cost(
+    model,
+    X: pd.DataFrame,
+    n_single: int = 200,
+    batch_size: int = 1000,
+    n_batches: int = 5,
+    warmup: int = 10,
+) -> dict:
+    """
+    Serving cost of a fitted model that takes raw feature rows:
+    single-row latency percentiles, batch latency, serialized size and
+    the RSS of a process that has loaded it.
+    """
+    single_ms = measure_row_latency(model, X, n_single=n_single, warmup=warmup)
+
+    batch = X.iloc[np.arange(batch_size) % len(X)]
+    batch_times = []
+    for _ in range(n_batches):
+        start = time.perf_counter()
+        model.predict_proba(batch)
+        batch_times.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        artifact_path = os.path.join(tmpdir, "model.pkl")
+        joblib.dump(model, artifact_path)
+        artifact_bytes = os.path.getsize(artifact_path)
+        rss = measure_loaded_rss(artifact_path)
+
+    batch_ms = float(np.median(batch_times) * 1000)
+    return {
+        "p50_ms": float(np.percentile(single_ms, 50)),
+        "p99_ms": float(np.percentile(single_ms, 99)),
+        "batch_ms": batch_ms,
+        "batch_rows_per_s": batch_size / (batch_ms / 1000),
+        "artifact_mb": artifact_bytes / 1e6,
+        "model_memory_mb": rss["loaded_rss_mb"] - rss["base_rss_mb"],
+        "rss_mb": rss["loaded_rss_mb"],
+    }
+
+
+# Config key -> measured quantity it caps
+CONSTRAINT_KEYS = {
+    "max_p99_ms": "p99_ms",
+    "max_batch_ms": "batch_ms",
+    "max_artifact_mb": "artifact_mb",
+    "max_rss_mb": "rss_mb",
+}
+
+
+def budget_violations(cost: dict, constraints: dict) -> list:
+    return [
+        f"{metric}={cost[metric]:.2f} > {constraints[key]}"
+        for key, metric in CONSTRAINT_KEYS.items()
+        if constraints.get(key) is not None and cost[metric] > constraints[key]
+    ]
+
+
+def pareto_frontier(candidates: dict, score: str = "roc_auc", cost: str = "p99_ms") -> list:
+    """
+    Names of candidates not dominated on (higher ``score``, lower ``cost``).
+    """
+    frontier = []
+    for name, row in candidates.items():
+        dominated = any(
+            other[score] >= row[score]
+            and other[cost] <= row[cost]
+            and (other[score] > row[score] or other[cost] < row[cost])
+            for other_name, other in candidates.items()
+            if other_name != name
+        )
+        if not dominated:
+            frontier.append(name)
+    return sorted(frontier, key=lambda name: candidates[name][cost])
+
+
+def _cost_key(row: dict) -> tuple:
+    # Artifact size and loaded RSS are stable between runs; a single
+    # process's p99 timing is mostly noise, so it only decides last
+    return row["artifact_mb"], row["rss_mb"], row["p99_ms"]
+
+
+def select_within_budget(candidates: dict, constraints: dict, score: str = "roc_auc") -> tuple:
+    """
+    Pick the best-``score`` candidate that meets every constraint (ties go
+    to the smaller artifact, then the lower RSS, then the lower p99). If
+    none does, fall back to the one with the fewest violations, cheapest
+    by the same order. Returns (name, {name: [violations]}).
+    """
+    violations = {name: budget_violations(row, constraints) for name, row in candidates.items()}
+    feasible = [name for name in candidates if not violations[name]]
+    if feasible:
+        top = max(candidates[name][score] for name in feasible)
+        best = min(
+            (name for name in feasible if candidates[name][score] == top), key=lambda name: _cost_key(candidates[name])
+        )
+    else:
+        best = min(candidates, key=lambda name: (len(violations[name]), _cost_key(candidates[name])))
+        logger.warning("No model meets the serving budget %s; falling back to the cheapest, %s", constraints, best)
+    return best, violations
+
+
+def write_serving_report(candidates: dict, violations: dict, selected: str, path: str) -> None:
+    frontier = pareto_frontier(candidates)
+    columns = ["roc_auc", "accuracy", "p50_ms", "p99_ms", "batch_ms", "artifact_mb", "rss_mb"]
+    table = pd.DataFrame(candidates).T[columns]
+    table["within_budget"] = [not violations[name] for name in table.index]
+    table["pareto"] = [name in frontier for name in table.index]
+
+    with open(path, "w") as f:
+        f.write(f"selected_model={selected}\n\n")
+        f.write(table.to_string(float_format=lambda v: f"{v:.4f}"))
+        f.write("\n\nAccuracy/latency Pareto frontier (ROC-AUC vs p99 latency):\n")
+        for name in frontier:
+            f.write(f"  {name}: roc_auc={candidates[name]['roc_auc']:.4f} p99_ms={candidates[name]['p99_ms']:.2f}\n")
+        for name, problems in violations.items():
+            if problems:
+                f.write(f"\n{name} exceeds the budget: {', '.join(problems)}")
+        f.write("\n")
+
+
+def measure_scoring_allocation(model, X: pd.DataFrame, batch_size: int = 1000) -> dict:
+    """
+    Peak Python/NumPy allocation (MB) while scoring one row and a batch of
+    ``batch_size`` rows, i.e. what each in-flight request adds on top of
+    the loaded model.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        peaks = {}
+        for name, rows in (("single", X.iloc[[0]]), ("batch", X.iloc[np.arange(batch_size) % len(X)])):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            model.predict_proba(rows)
+            peaks[f"{name}_request_peak_mb"] = (tracemalloc.get_traced_memory()[1] - base) / 1024 / 1024
+    finally:
+        if started:
+            tracemalloc.stop()
+    return peaks
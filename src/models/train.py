@@ -1,262 +1,802 @@
+import copy
 import os
-import sys
-
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+import re
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
 
 import joblib
-import matplotlib.pyplot as plt
 import mlflow
 import mlflow.sklearn
 import numpy as np
 import pandas as pd
-from sklearn.metrics import (accuracy_score, auc, precision_score,
-                             recall_score, roc_auc_score, roc_curve)
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, auc, get_scorer, roc_auc_score
 from sklearn.metrics import ConfusionMatrixDisplay, classification_report, confusion_matrix
-from sklearn.model_selection import StratifiedKFold, cross_validate, train_test_split
+from sklearn.model_selection import (StratifiedKFold, cross_validate,
+                                     train_test_split)
 from sklearn.pipeline import Pipeline
 
-import yaml
-from src.features.feature_pipeline import build_feature_pipeline
+from src.data.load_data import (load_processed_data,
+                                load_processed_increments)
+from src.data.schema import SOURCE_COLUMN
+from src.features.feature_pipeline import (build_feature_pipeline,
+                                           feature_groups, get_feature_names)
+from src.features.feature_store import (FeatureStore,
+                                        materialize_training_features)
+from src.features.statistics import (feature_statistics,
+                                     refresh_feature_pipeline)
+from src.models.cascade import (CascadeClassifier, choose_uncertainty_band,
+                                find_cascade)
+from src.models.evaluation import (evaluate_scores, evaluation_metrics,
+                                   write_evaluation_report)
+from src.models.feature_importance import (evaluate_reduced_variants,
+                                           permutation_importance,
+                                           reduced_feature_sets,
+                                           write_feature_importance_report)
+from src.models.fold_ensemble import (FoldEnsembleClassifier, expand_inputs,
+                                      warm_start_fit)
+from src.models.incremental import rescale_inputs
 from src.models.model import build_logestic_model, build_rf_model
-from src.data.download_data import download_dataset
-from src.data.load_data import load_raw_data
-from src.data.preprocess import preprocess_pipeline
+from src.models.quantize import (artifact_footprint, quantization_parity,
+                                 quantize_bundle, write_quantization_report)
+from src.models.serving_cost import (measure_loaded_rss,
+                                     measure_scoring_allocation,
+                                     measure_serving_cost,
+                                     select_within_budget,
+                                     write_serving_report)
+from src.monitoring.drift import build_feature_profile
+from src.utils.config import PROJECT_ROOT, load_config, resolve_path
+from src.utils.memory import (MemoryTracker, recommend_limits,
+                              write_memory_report)
+from src.utils.tracking import batched_run
+
+TARGET = "target"
+
+SERVING_METRICS = ["p50_ms", "p99_ms", "batch_ms", "artifact_mb", "model_memory_mb", "rss_mb"]
+
+ARTIFACTS_DIR = os.path.join(PROJECT_ROOT, "artifacts")
+MODEL_PATH = os.path.join(ARTIFACTS_DIR, "model.pkl")
+QUANTIZED_MODEL_PATH = os.path.join(ARTIFACTS_DIR, "model_quantized.pkl")
+REPORTS_DIR = os.path.join(PROJECT_ROOT, "reports")
 
 
 # function to log model hyperparameters
-def log_model_params(model, model_name):
+def log_model_params(model, model_name, tracker):
     """
     Logs key hyperparameters for each model
     """
     if model_name == "Logistic Regression":
-        mlflow.log_param("C", model.C)
-        mlflow.log_param("penalty", model.penalty)
-        mlflow.log_param("solver", model.solver)
-        mlflow.log_param("max_iter", model.max_iter)
+        tracker.log_params(
+            {
+                "C": model.C,
+                "penalty": model.penalty,
+                "solver": model.solver,
+                "max_iter": model.max_iter,
+            }
+        )
     elif model_name == "Random Forest":
-        mlflow.log_param("n_estimators", model.n_estimators)
-        mlflow.log_param("max_depth", model.max_depth)
-        mlflow.log_param("min_samples_split", model.min_samples_split)
-        mlflow.log_param("min_samples_leaf", model.min_samples_leaf)
-
-
-# Ensure MLflow artifacts land in a repo-local, writable path by default.
-default_tracking_dir = os.environ.get(
-    "MLFLOW_TRACKING_DIR", os.path.join(PROJECT_ROOT, "mlruns")
-)
-tracking_uri = os.environ.get("MLFLOW_TRACKING_URI", f"file://{default_tracking_dir}")
-
-if tracking_uri.startswith("file:"):
-    tracking_path = tracking_uri.replace("file://", "", 1)
-    os.makedirs(tracking_path, exist_ok=True)
-
-mlflow.set_tracking_uri(tracking_uri)
-mlflow.set_experiment(
-    "Heart-Disease-Classification-2"
-)
-
-# Load data (generate if missing)
-processed_csv = os.path.join(PROJECT_ROOT, "data", "processed", "heart_disease_clean.csv")
-if not os.path.exists(processed_csv):
-    with open(os.path.join(PROJECT_ROOT, "configs", "data_config.yaml")) as f:
-        config = yaml.safe_load(f)
-
-    raw_path = os.path.join(PROJECT_ROOT, config["data"]["raw_path"])
-    processed_path = os.path.join(PROJECT_ROOT, config["data"]["processed_path"])
-    os.makedirs(os.path.dirname(processed_path), exist_ok=True)
-    os.makedirs(os.path.dirname(raw_path), exist_ok=True)
-
-    if not os.path.exists(raw_path):
-        download_dataset()
-
-    df_raw = load_raw_data(raw_path)
-    df_clean = preprocess_pipeline(
-        df_raw,
-        config["preprocessing"]["categorical_features"],
-        config["preprocessing"]["numerical_features"],
+        tracker.log_params(
+            {
+                "n_estimators": model.n_estimators,
+                "max_depth": model.max_depth,
+                "min_samples_split": model.min_samples_split,
+                "min_samples_leaf": model.min_samples_leaf,
+            }
+        )
+
+
+def configure_mlflow():
+    """
+    Ensure MLflow artifacts land in a repo-local, writable path by default.
+    """
+    default_tracking_dir = os.environ.get(
+        "MLFLOW_TRACKING_DIR", os.path.join(PROJECT_ROOT, "mlruns")
     )
-    df_clean.to_csv(processed_path, index=False)
+    tracking_uri = os.environ.get("MLFLOW_TRACKING_URI", f"file://{default_tracking_dir}")
 
-df = pd.read_csv(processed_csv)
+    if tracking_uri.startswith("file:"):
+        tracking_path = tracking_uri.replace("file://", "", 1)
+        os.makedirs(tracking_path, exist_ok=True)
 
-TARGET = "target"
-numeric_cols = ["age", "trestbps", "chol", "thalach", "oldpeak", "ca"]
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment(
+        "Heart-Disease-Classification-2"
+    )
 
-categorical_cols = ["sex", "cp", "fbs", "restecg", "exang", "slope", "thal"]
 
-X = df.drop(columns=[TARGET])
-# Convert multi-class target to binary
-df[TARGET] = (df[TARGET] > 0).astype(int)
+def load_training_data(config: dict) -> pd.DataFrame:
+    """
+    Load processed data, running the download/preprocess stages if needed,
+    plus any rows appended since by incremental retraining.
+    """
+    processed_csv = resolve_path(config["data"]["processed_path"])
+    if not os.path.exists(processed_csv):
+        from src.pipeline.stages import build_runner
+
+        build_runner(config, executor="thread").run(targets=["preprocess"])
+
+    df = load_processed_data(processed_csv)
+    increments_path = config["data"].get("increments_path")
+    increments = load_processed_increments(resolve_path(increments_path)) if increments_path else None
+    if increments is not None:
+        print(f"Adding {len(increments)} incrementally appended rows")
+        increments = increments.reindex(columns=df.columns)
+        if SOURCE_COLUMN in df.columns:
+            increments[SOURCE_COLUMN] = increments[SOURCE_COLUMN].fillna("incremental")
+        df = pd.concat([df, increments], ignore_index=True)
+    if SOURCE_COLUMN in df.columns:
+        print("Rows per source: " + ", ".join(f"{name}={n}" for name, n in df[SOURCE_COLUMN].value_counts().items()))
+    return df
+
+
+def build_model_pipeline(model, numeric_cols: list, categorical_cols: list) -> Pipeline:
+    feature_pipeline = build_feature_pipeline(
+        numeric_cols=numeric_cols,
+        categorical_cols=categorical_cols,
+    )
+    return Pipeline(
+        steps=[
+            ("features", feature_pipeline),
+            ("model", model),
+        ]
+    )
 
-y = df[TARGET]
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    stratify=y,
-    random_state=42,
-)
+def memory_stage(memory, name: str):
+    return memory.stage(name) if memory is not None else nullcontext()
 
-models = {
-    "Logistic Regression": build_logestic_model(),
-    "Random Forest": build_rf_model(),
-}
 
-# model.fit(X_features, y)
+def _fit_and_score_fold(model, fold, scorers: dict) -> dict:
+    start = time.perf_counter()
+    model = clone(model).fit(fold.X_train, fold.y_train)
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    scores = {f"test_{metric}": scorer(model, fold.X_valid, fold.y_valid) for metric, scorer in scorers.items()}
+    return {
+        "fit_time": fit_time,
+        "score_time": time.perf_counter() - start,
+        **scores,
+        "estimator": Pipeline(steps=[("features", fold.pipeline), ("model", model)]),
+    }
 
-# Cross-Validation Setup
 
-cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+def cross_validate_folds(model, folds: list, scoring: dict, n_jobs=None) -> dict:
+    """
+    ``cross_validate`` over stored per-fold features (``FoldFeatures``): a
+    clone of the bare ``model`` is fit and scored on each fold's own
+    matrices. Fold estimators come back behind their fold's feature
+    pipeline, so they take raw rows like the ones ``cross_validate`` fits.
+    """
+    scorers = {metric: get_scorer(name) for metric, name in scoring.items()}
+    per_fold = Parallel(n_jobs=n_jobs)(delayed(_fit_and_score_fold)(model, fold, scorers) for fold in folds)
+    return {key: [fold[key] for fold in per_fold] for key in per_fold[0]}
 
-scoring = {
-    "accuracy": "accuracy",
-    "precision": "precision",
-    "recall": "recall",
-    "roc_auc": "roc_auc",
-}
 
-# Train, Evaluate & Compare
+def cross_validate_models(estimators, X_train, y_train, cv, n_jobs=None, memory=None, folds=None):
+    """
+    Cross-validate each candidate, logging one MLflow run per model.
 
-results = {}
+    ``estimators`` maps a model name to either a full model pipeline (raw
+    inputs) or, with ``folds`` from the feature store, a bare model that
+    is scored on each fold's stored features. Returns the mean CV metrics
+    and the fitted estimator of every fold, per model. With a
+    MemoryTracker, each model's CV is recorded as a "cv <name>" stage.
+    """
+    scoring = {
+        "accuracy": "accuracy",
+        "precision": "precision",
+        "recall": "recall",
+        "roc_auc": "roc_auc",
+    }
+
+    results = {}
+    fold_estimators = {}
+
+    for name, estimator in estimators.items():
+        with batched_run(run_name=name) as tracker:
+            model = estimator.named_steps["model"] if isinstance(estimator, Pipeline) else estimator
+
+            # Parameters
+            tracker.log_param("model_type", name)
+            tracker.log_param("cv_folds", cv.n_splits)
+            log_model_params(model, name, tracker)
+
+            # Cross Validation
+            with memory_stage(memory, f"cv {name}"):
+                if folds is not None:
+                    cv_results = cross_validate_folds(estimator, folds, scoring, n_jobs=n_jobs)
+                else:
+                    cv_results = cross_validate(
+                        estimator,
+                        X_train,
+                        y_train,
+                        cv=cv,
+                        scoring=scoring,
+                        return_train_score=False,
+                        return_estimator=True,
+                        n_jobs=n_jobs,
+                    )
+            fold_estimators[name] = cv_results.pop("estimator")
+
+            # Metrics
+            for metric in scoring:
+                mean_value = np.mean(cv_results[f"test_{metric}"])
+                tracker.log_metric(f"cv_{metric}", mean_value)
+
+            results[name] = {
+                metric: np.mean(cv_results[f"test_{metric}"]) for metric in scoring
+            }
+
+            # Save CV Results as Artifact
+            cv_df = pd.DataFrame(cv_results)
+            os.makedirs(REPORTS_DIR, exist_ok=True)
+            cv_results_path = os.path.join(REPORTS_DIR, f"{name}_cv_results.csv")
+            cv_df.to_csv(cv_results_path, index=False)
+            tracker.log_artifact(cv_results_path)
+            if memory is not None:
+                tracker.log_metrics(
+                    {
+                        f"memory_cv_{key}": value
+                        for key, value in memory.stages[f"cv {name}"].items()
+                        if not isinstance(value, bool)
+                    }
+                )
+
+    return results, fold_estimators
+
+
+def select_cascade_band(fold_estimators, X_train, y_train, cv, fast_name, slow_name, tolerance):
+    """
+    Choose the cascade's uncertainty band from out-of-fold probabilities,
+    so the holdout split stays untouched for the final evaluation. The
+    probabilities come from the fold estimators cross_validate_models
+    already fit, each scoring the validation rows of its split of ``cv``,
+    so nothing is refit. Also returns the cascade's CV accuracy and
+    ROC-AUC, averaged over those folds.
+    """
+    y = np.asarray(y_train)
+    folds = [test for _, test in cv.split(X_train, y)]
+    oof = {}
+    for name in (fast_name, slow_name):
+        oof[name] = np.empty(len(y))
+        for estimator, test in zip(fold_estimators[name], folds):
+            oof[name][test] = estimator.predict_proba(X_train.iloc[test])[:, 1]
+    band = choose_uncertainty_band(oof[fast_name], oof[slow_name], y_train, tolerance=tolerance)
+
+    fast, slow = oof[fast_name], oof[slow_name]
+    proba = np.where((fast > band["lower"]) & (fast < band["upper"]), slow, fast)
+    band["cv_roc_auc"] = float(np.mean([roc_auc_score(y[test], proba[test]) for test in folds]))
+    band["cv_accuracy"] = float(np.mean([accuracy_score(y[test], proba[test] > 0.5) for test in folds]))
+    return band
+
+
+def fold_models_on_features(folds: list, features, X_train) -> list:
+    """
+    Bare models of the fold pipelines re-expressed on the stored
+    full-training transform, for warm starts. Each fold's imputer and
+    scaler statistics are swapped for the full split's and its model is
+    rescaled to match (see ``refresh_feature_pipeline``), then mapped onto
+    the full split's one-hot columns, which can include categories the
+    fold never saw (``expand_inputs``).
+    """
+    stats = feature_statistics(features.pipeline, X_train)
+    columns = {name: i for i, name in enumerate(features.feature_names)}
+    aligned = []
+    for fold in folds:
+        fold = copy.deepcopy(fold)
+        scale, shift = refresh_feature_pipeline(fold.named_steps["features"], stats)
+        model = rescale_inputs(fold.named_steps["model"], scale, shift)
+        fold_columns = [columns[name] for name in get_feature_names(fold.named_steps["features"])]
+        aligned.append(expand_inputs(model, fold_columns, len(columns)))
+    return aligned
+
+
+def model_from_folds(model, folds: list, strategy: str, X=None, y=None):
+    """
+    Final model built from the CV fold fits instead of a refit: a
+    soft-voting ensemble of the folds ("fold_ensemble"), or a fit on
+    (X, y) warm-started from them ("warm_start").
+    """
+    if strategy == "fold_ensemble":
+        return FoldEnsembleClassifier.from_fitted(folds)
+    if strategy == "warm_start":
+        return warm_start_fit(model, folds, X, y)
+    raise ValueError(f"Unknown final_fit strategy: {strategy}")
 
-for name, model in models.items():
-    with mlflow.start_run(run_name=name):
-        # Parameters
-        mlflow.log_param("model_type", name)
-        mlflow.log_param("cv_folds", cv.n_splits)
-        log_model_params(model, name)
 
-        feature_pipeline = build_feature_pipeline(
-            numeric_cols=numeric_cols,
-            categorical_cols=categorical_cols,
+def measure_candidates(candidates, serving_models, X_sample):
+    """
+    Add serving-cost measurements to each candidate's CV metrics.
+    """
+    for name, model in serving_models.items():
+        cost = measure_serving_cost(model, X_sample)
+        candidates[name].update(cost)
+        print(
+            f"{name}: p50={cost['p50_ms']:.2f}ms p99={cost['p99_ms']:.2f}ms "
+            f"batch={cost['batch_ms']:.1f}ms artifact={cost['artifact_mb']:.3f}MB rss={cost['rss_mb']:.0f}MB"
         )
-        model_pipeline = Pipeline(
-            steps=[
-                ("features", feature_pipeline),
-                ("model", model),
-            ]
+    return candidates
+
+
+def save_holdout_figures(y_test, y_pred_test, evaluation: dict, figures_dir: str) -> tuple:
+    """
+    Write the holdout ROC curve (from the evaluation's threshold sweep) and
+    confusion matrix; returns their paths.
+    """
+    import matplotlib.pyplot as plt
+
+    sweep = evaluation["sweep"]
+    fpr = np.r_[0.0, sweep["fpr"].to_numpy()]
+    tpr = np.r_[0.0, sweep["recall"].to_numpy()]
+    roc_curve_path = os.path.join(figures_dir, "roc_curve.png")
+
+    plt.figure()
+    plt.plot(fpr, tpr, label=f"ROC AUC = {evaluation['metrics']['roc_auc']:.3f}")
+    plt.plot([0, 1], [0, 1], linestyle="--", color="gray")
+    plt.xlabel("False Positive Rate")
+    plt.ylabel("True Positive Rate")
+    plt.title("ROC Curve (Holdout Test)")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(roc_curve_path)
+
+    cm = confusion_matrix(y_test, y_pred_test)
+    cm_path = os.path.join(figures_dir, "confusion_matrix.png")
+    plt.figure()
+    ConfusionMatrixDisplay(confusion_matrix=cm).plot(cmap="Blues", values_format="d")
+    plt.title("Confusion Matrix (Holdout Test)")
+    plt.tight_layout()
+    plt.savefig(cm_path)
+    return roc_curve_path, cm_path
+
+
+def serving_memory_estimate(model, X_sample, artifact_path: str, memory_config: dict) -> tuple:
+    """
+    Memory a server needs for the saved artifact: RSS after loading it,
+    plus the peak allocation of a single and a ``batch_rows`` request, and
+    the container request/limit that follows for ``concurrency`` in-flight
+    batches.
+    """
+    loaded = measure_loaded_rss(artifact_path)
+    serving = {
+        "base_rss_mb": loaded["base_rss_mb"],
+        "bundle_load_mb": loaded["loaded_rss_mb"] - loaded["base_rss_mb"],
+        "steady_rss_mb": loaded["loaded_rss_mb"],
+    }
+    serving.update(measure_scoring_allocation(model, X_sample, batch_size=memory_config.get("batch_rows", 1000)))
+    recommendation = recommend_limits(
+        serving["steady_rss_mb"],
+        serving["batch_request_peak_mb"],
+        concurrency=memory_config.get("concurrency", 1),
+    )
+    return serving, recommendation
+
+
+def main(config: dict = None):
+    config = config or load_config()
+    configure_mlflow()
+    training_config = config.get("training", {})
+
+    # Peak and retained memory per stage, for MLflow and the sizing report
+    memory_config = training_config.get("memory", {})
+    memory = MemoryTracker() if memory_config.get("enabled") else None
+
+    with memory_stage(memory, "load"):
+        df = load_training_data(config)
+
+    numeric_cols = config["preprocessing"]["numerical_features"]
+    categorical_cols = config["preprocessing"]["categorical_features"]
+
+    with memory_stage(memory, "clean"):
+        # The source tag records provenance only; it is not a model input
+        X = df.drop(columns=[TARGET, SOURCE_COLUMN], errors="ignore")
+        # Convert multi-class target to binary
+        df[TARGET] = (df[TARGET] > 0).astype(int)
+
+        y = df[TARGET]
+
+        X_train, X_test, y_train, y_test = train_test_split(
+            X,
+            y,
+            test_size=0.2,
+            stratify=y,
+            random_state=42,
+        )
+
+    models = {
+        "Logistic Regression": build_logestic_model(),
+        "Random Forest": build_rf_model(),
+    }
+
+    # Cross-Validation Setup
+    cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+
+    # Transformed features are persisted and memory-mapped when enabled, so
+    # CV and evaluation skip re-transforming the same rows on every run.
+    # Every CV fold gets its own transform, fit on that fold's training rows.
+    feature_config = config.get("features", {})
+    features = None
+    if feature_config.get("use_store"):
+        with memory_stage(memory, "features"):
+            store = FeatureStore(resolve_path(feature_config.get("store_path", "data/features")))
+            features = materialize_training_features(
+                X_train,
+                y_train,
+                X_test,
+                y_test,
+                numeric_cols,
+                categorical_cols,
+                store=store,
+                dtype=feature_config.get("dtype", "float32"),
+                splits=list(cv.split(X_train, y_train)),
+            )
+            if feature_config.get("prune", True):
+                store.prune(keep=[features.key] + [fold.key for fold in features.folds])
+        estimators = dict(models)
+    else:
+        estimators = {
+            name: build_model_pipeline(model, numeric_cols, categorical_cols)
+            for name, model in models.items()
+        }
+
+    # Train, Evaluate & Compare
+    results, fold_estimators = cross_validate_models(
+        estimators,
+        X_train,
+        y_train,
+        cv,
+        n_jobs=training_config.get("cv_n_jobs"),
+        memory=memory,
+        folds=features.folds if features is not None else None,
+    )
+
+    # Print Results (Report-Ready)
+    for model_name, metrics in results.items():
+        print(f"\n{model_name}")
+        for metric, value in metrics.items():
+            print(f"{metric}: {value:.4f}")
+
+    # Serving cost is measured on a fitted fold estimator of each candidate;
+    # fold estimators are full pipelines that take raw rows like the saved
+    # artifact.
+    candidates = {name: dict(metrics) for name, metrics in results.items()}
+    serving_models = {name: folds[0] for name, folds in fold_estimators.items()}
+
+    # Optionally offer a cascade: LR for every row, RF only inside the band
+    cascade_config = training_config.get("cascade", {})
+    cascade_name = "Cascade (Logistic Regression -> Random Forest)"
+    cascade_band = None
+    if cascade_config.get("enabled"):
+        with memory_stage(memory, "cascade band"):
+            cascade_band = select_cascade_band(
+                fold_estimators,
+                X_train,
+                y_train,
+                cv,
+                fast_name="Logistic Regression",
+                slow_name="Random Forest",
+                tolerance=cascade_config.get("tolerance", 0.01),
+            )
+    if cascade_band is not None and cascade_band["lower"] >= cascade_band["upper"]:
+        # An empty band never escalates: the cascade would be LR carrying an
+        # RF that never runs, so LR alone stands for it
+        print("Cascade band is empty (no row escalates); not offering the cascade")
+    elif cascade_band is not None:
+        candidates[cascade_name] = {
+            "accuracy": cascade_band["cv_accuracy"],
+            "roc_auc": cascade_band["cv_roc_auc"],
+        }
+        fast_fold = fold_estimators["Logistic Regression"][0]
+        slow_fold = fold_estimators["Random Forest"][0]
+        fold_cascade = CascadeClassifier.from_fitted(
+            fast_fold[-1],
+            slow_fold[-1],
+            lower=cascade_band["lower"],
+            upper=cascade_band["upper"],
+        )
+        # Both fold pipelines were fit on the same fold rows
+        serving_models[cascade_name] = Pipeline(
+            steps=[("features", fast_fold[:-1]), ("model", fold_cascade)]
         )
 
-        # Cross Validation
-        cv_results = cross_validate(
-            model_pipeline,
+    # Select the best ROC-AUC among the models that fit the serving budget
+    constraints = training_config.get("serving_constraints", {})
+    candidates = measure_candidates(candidates, serving_models, X_test)
+    best_model_name, violations = select_within_budget(candidates, constraints)
+    serving_report_path = os.path.join(REPORTS_DIR, "serving_cost_report.txt")
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    write_serving_report(candidates, violations, best_model_name, serving_report_path)
+
+    if best_model_name == cascade_name:
+        best_model = CascadeClassifier(
+            fast=models["Logistic Regression"],
+            slow=models["Random Forest"],
+            lower=cascade_band["lower"],
+            upper=cascade_band["upper"],
+        )
+    else:
+        best_model = models[best_model_name]
+
+    # The final model is refit from scratch or built from the CV fold fits.
+    # Warm starts continue the fold models on the stored full-training
+    # transform, so each fold is first re-expressed on it.
+    final_fit = training_config.get("final_fit", "refit")
+    final_names = ["Logistic Regression", "Random Forest"] if best_model_name == cascade_name else [best_model_name]
+    final_folds = {name: fold_estimators[name] for name in final_names}
+    if final_fit == "warm_start" and features is None:
+        print("final_fit=warm_start needs features.use_store; refitting from scratch")
+        final_fit = "refit"
+    elif final_fit == "warm_start":
+        final_folds = {name: fold_models_on_features(folds, features, X_train) for name, folds in final_folds.items()}
+
+    # Unfitted template of the selected model for the reduced-feature variants
+    selected_model = best_model
+
+    final_fit_start = time.perf_counter()
+    with memory_stage(memory, "final fit"):
+        if final_fit != "refit":
+            fit_X, fit_y = (features.X_train, features.y_train) if features is not None else (None, None)
+            from_folds = {
+                name: model_from_folds(models[name], final_folds[name], final_fit, fit_X, fit_y)
+                for name in final_names
+            }
+            if best_model_name == cascade_name:
+                best_model = CascadeClassifier.from_fitted(
+                    from_folds["Logistic Regression"],
+                    from_folds["Random Forest"],
+                    lower=cascade_band["lower"],
+                    upper=cascade_band["upper"],
+                )
+            else:
+                best_model = from_folds[best_model_name]
+            if final_fit == "warm_start":
+                best_pipeline = Pipeline(steps=[("features", features.pipeline), ("model", best_model)])
+                eval_estimator, eval_X_test = best_model, features.X_test
+            else:
+                # Fold members are full pipelines that take raw rows
+                best_pipeline = best_model
+                eval_estimator, eval_X_test = best_model, X_test
+        elif features is not None:
+            # The stored pipeline was fit on X_train, exactly as Pipeline.fit would.
+            best_model.fit(features.X_train, features.y_train)
+            best_pipeline = Pipeline(
+                steps=[
+                    ("features", features.pipeline),
+                    ("model", best_model),
+                ]
+            )
+            eval_estimator, eval_X_test = best_model, features.X_test
+        else:
+            best_pipeline = build_model_pipeline(best_model, numeric_cols, categorical_cols)
+            best_pipeline.fit(X_train, y_train)
+            eval_estimator, eval_X_test = best_pipeline, X_test
+    final_fit_seconds = time.perf_counter() - final_fit_start
+    print(f"Final model ({final_fit}) ready in {final_fit_seconds:.2f}s")
+
+    figures_dir = os.path.join(REPORTS_DIR, "figures")
+    os.makedirs(figures_dir, exist_ok=True)
+
+    artifact = {
+        "model": best_pipeline,
+        "raw_feature_names": X.columns.tolist(),
+        "model_version": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ"),
+        # Reference histograms for serving-time drift monitoring
+        "feature_profile": build_feature_profile(X_train, X.columns),
+    }
+    if isinstance(best_pipeline, Pipeline) and "features" in best_pipeline.named_steps:
+        # Running statistics and lineage that incremental retraining builds on
+        artifact["feature_statistics"] = feature_statistics(best_pipeline.named_steps["features"], X_train)
+        artifact["lineage"] = {
+            "base_version": artifact["model_version"],
+            "base_rows": len(X_train),
+            "incremental_updates": 0,
+            "rows_since_full": 0,
+        }
+    anytime_config = training_config.get("anytime_forest", {})
+    if anytime_config.get("enabled"):
+        # Serving settings for early-stopping RF inference (AnytimeForest)
+        artifact["anytime_forest"] = {
+            key: anytime_config.get(key) for key in ("batch_size", "delta", "budget_ms")
+        }
+    os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+    joblib.dump(artifact, MODEL_PATH)
+
+    print(f"Best model selected: {best_model_name}")
+
+    memory_report_path = None
+    if memory is not None:
+        memory_report_path = os.path.join(REPORTS_DIR, "memory_report.txt")
+        serving_memory, recommendation = serving_memory_estimate(
+            best_pipeline, X_test, MODEL_PATH, memory_config
+        )
+        write_memory_report(
+            memory.stages, serving_memory, recommendation, memory.peak_rss_mb, memory_report_path
+        )
+        print(
+            f"Recommended serving memory: request {recommendation['request_mi']}Mi, "
+            f"limit {recommendation['limit_mi']}Mi"
+        )
+
+    y_pred_test = eval_estimator.predict(eval_X_test)
+    y_proba_test = eval_estimator.predict_proba(eval_X_test)[:, 1]
+
+    # One sort of the holdout scores gives the point metrics, the threshold
+    # sweep and bootstrap confidence intervals
+    evaluation_config = training_config.get("evaluation", {})
+    evaluation = evaluate_scores(
+        y_test,
+        y_proba_test,
+        n_bootstrap=evaluation_config.get("n_bootstrap", 1000),
+        confidence=evaluation_config.get("confidence", 0.95),
+        seed=evaluation_config.get("seed", 0),
+    )
+    for metric, (low, high) in evaluation["intervals"].items():
+        print(f"Holdout {metric}: {evaluation['metrics'][metric]:.4f} [{low:.4f}, {high:.4f}]")
+    evaluation_report_path = os.path.join(REPORTS_DIR, "evaluation_report.txt")
+    threshold_sweep_path = os.path.join(REPORTS_DIR, "threshold_sweep.csv")
+    write_evaluation_report(evaluation, evaluation_report_path, threshold_sweep_path)
+
+    # Permutation importance per input on the transformed holdout (from the
+    # feature store when enabled, otherwise transformed once here), then the
+    # selected model refit on reduced feature sets to weigh accuracy
+    # against single-row latency.
+    importance_config = training_config.get("feature_importance", {})
+    importances = variants = feature_importance_path = None
+    if (
+        importance_config.get("enabled")
+        and isinstance(best_pipeline, Pipeline)
+        and "features" in best_pipeline.named_steps
+    ):
+        with memory_stage(memory, "feature importance"):
+            feature_step = best_pipeline.named_steps["features"]
+            X_test_features = features.X_test if features is not None else feature_step.transform(X_test)
+            importances = permutation_importance(
+                best_pipeline.named_steps["model"],
+                X_test_features,
+                np.asarray(y_test),
+                feature_groups(feature_step),
+                n_repeats=importance_config.get("n_repeats", 5),
+                n_jobs=importance_config.get("n_jobs"),
+                seed=importance_config.get("seed", 0),
+                scoring=importance_config.get("scoring", "roc_auc"),
+            )
+        # Outside the memory stage: allocation tracing would skew the latencies
+        variants = evaluate_reduced_variants(
+            selected_model,
+            reduced_feature_sets(importances, importance_config.get("keep_top", [])),
             X_train,
             y_train,
-            cv=cv,
-            scoring=scoring,
-            return_train_score=False
+            X_test,
+            y_test,
+            numeric_cols,
+            categorical_cols,
+        )
+        print("\nReduced-feature variants:")
+        print(variants[["n_inputs", "n_columns", "accuracy", "roc_auc", "p50_ms", "p99_ms"]].to_string())
+        feature_importance_path = os.path.join(REPORTS_DIR, "feature_importance.txt")
+        write_feature_importance_report(importances, variants, feature_importance_path)
+
+    # Optional compact copy of the artifact for serving (MODEL_PATH pointed
+    # at it), checked against the original on the holdout
+    quantization_config = training_config.get("quantization", {})
+    quantization = quantization_report_path = None
+    if quantization_config.get("enabled"):
+        quantization_settings = {
+            "thresholds": quantization_config.get("thresholds", "float32"),
+            "value_bits": quantization_config.get("value_bits", 8),
+        }
+        quantized_artifact = quantize_bundle(artifact, **quantization_settings)
+        joblib.dump(quantized_artifact, QUANTIZED_MODEL_PATH)
+        quantization = quantization_parity(best_pipeline, quantized_artifact["model"], X_test, y_test)
+        footprints = {
+            "original": artifact_footprint(MODEL_PATH),
+            "quantized": artifact_footprint(QUANTIZED_MODEL_PATH),
+        }
+        quantization_report_path = os.path.join(REPORTS_DIR, "quantization_report.txt")
+        write_quantization_report(quantization_settings, quantization, footprints, quantization_report_path)
+        print(
+            f"Quantized model: label agreement {quantization['label_agreement']:.4f}, "
+            f"artifact {footprints['original']['artifact_mb']:.3f}MB -> {footprints['quantized']['artifact_mb']:.3f}MB, "
+            f"load {footprints['original']['load_ms']:.1f}ms -> {footprints['quantized']['load_ms']:.1f}ms"
+        )
+        quantization.update(
+            {f"{key}_{which}": value for which, footprint in footprints.items() for key, value in footprint.items()}
         )
 
-        # Metrics
-        for metric in scoring:
-            mean_value = np.mean(cv_results[f"test_{metric}"])
-            mlflow.log_metric(f"cv_{metric}", mean_value)
+    test_escalation_rate = None
+    if find_cascade(eval_estimator) is not None:
+        cascade = find_cascade(eval_estimator)
+        X_eval = eval_X_test if cascade is eval_estimator else eval_estimator[:-1].transform(eval_X_test)
+        _, escalated = cascade.predict_proba_with_escalation(X_eval)
+        test_escalation_rate = float(escalated.mean())
+        print(f"Cascade escalation rate on holdout: {test_escalation_rate:.3f}")
 
-        results[name] = {
-            metric: np.mean(cv_results[f"test_{metric}"]) for metric in scoring
-        }
+    roc_curve_path, cm_path = save_holdout_figures(
+        y_test, y_pred_test, evaluation, figures_dir
+    )
 
-        # Save CV Results as Artifact
-        cv_df = pd.DataFrame(cv_results)
-        reports_dir = os.path.join(PROJECT_ROOT, "reports")
-        os.makedirs(reports_dir, exist_ok=True)
-        cv_results_path = os.path.join(reports_dir, f"{name}_cv_results.csv")
-        cv_df.to_csv(cv_results_path, index=False)
-        mlflow.log_artifact(cv_results_path)
-
-# Print Results (Report-Ready)
-for model_name, metrics in results.items():
-    print(f"\n{model_name}")
-    for metric, value in metrics.items():
-        print(f"{metric}: {value:.4f}")
-
-
-# Select Best Model & Save
-best_model_name = max(results, key=lambda m: results[m]["roc_auc"])
-best_model = models[best_model_name]
-
-best_feature_pipeline = build_feature_pipeline(
-    numeric_cols=numeric_cols,
-    categorical_cols=categorical_cols,
-)
-best_pipeline = Pipeline(
-    steps=[
-        ("features", best_feature_pipeline),
-        ("model", best_model),
-    ]
-)
-best_pipeline.fit(X_train, y_train)
-
-reports_dir = os.path.join(PROJECT_ROOT, "reports")
-figures_dir = os.path.join(reports_dir, "figures")
-os.makedirs(figures_dir, exist_ok=True)
-
-artifact = {
-    "model": best_pipeline,
-    "raw_feature_names": X.columns.tolist(),
-}
-os.makedirs("artifacts", exist_ok=True)
-joblib.dump(artifact, "artifacts/model.pkl")
-
-print(f"Best model selected: {best_model_name}")
-
-y_pred_test = best_pipeline.predict(X_test)
-y_proba_test = best_pipeline.predict_proba(X_test)[:, 1]
-
-test_accuracy = accuracy_score(y_test, y_pred_test)
-test_precision = precision_score(y_test, y_pred_test)
-test_recall = recall_score(y_test, y_pred_test)
-test_roc_auc = roc_auc_score(y_test, y_proba_test)
-
-fpr, tpr, _ = roc_curve(y_test, y_proba_test)
-roc_curve_path = os.path.join(figures_dir, "roc_curve.png")
-
-plt.figure()
-plt.plot(fpr, tpr, label=f"ROC AUC = {test_roc_auc:.3f}")
-plt.plot([0, 1], [0, 1], linestyle="--", color="gray")
-plt.xlabel("False Positive Rate")
-plt.ylabel("True Positive Rate")
-plt.title("ROC Curve (Holdout Test)")
-plt.legend()
-plt.tight_layout()
-plt.savefig(roc_curve_path)
-
-cm = confusion_matrix(y_test, y_pred_test)
-cm_path = os.path.join(figures_dir, "confusion_matrix.png")
-plt.figure()
-ConfusionMatrixDisplay(confusion_matrix=cm).plot(cmap="Blues", values_format="d")
-plt.title("Confusion Matrix (Holdout Test)")
-plt.tight_layout()
-plt.savefig(cm_path)
-
-classification_report_path = os.path.join(reports_dir, "classification_report.txt")
-with open(classification_report_path, "w") as f:
-    f.write("Model: ")
-    f.write(best_model_name)
-    f.write("\n\n")
-    f.write(classification_report(y_test, y_pred_test, digits=4))
-
-metrics_summary_path = os.path.join(reports_dir, "performance_summary.txt")
-with open(metrics_summary_path, "w") as f:
-    f.write(f"selected_model={best_model_name}\n")
-    f.write(f"test_accuracy={test_accuracy:.6f}\n")
-    f.write(f"test_precision={test_precision:.6f}\n")
-    f.write(f"test_recall={test_recall:.6f}\n")
-    f.write(f"test_roc_auc={test_roc_auc:.6f}\n")
-
-# Log final model to MLflow
-with mlflow.start_run(run_name="Best_Model"):
-    mlflow.log_param("selected_model", best_model_name)
-    mlflow.log_metric("test_accuracy", float(test_accuracy))
-    mlflow.log_metric("test_precision", float(test_precision))
-    mlflow.log_metric("test_recall", float(test_recall))
-    mlflow.log_metric("test_roc_auc", float(test_roc_auc))
-    mlflow.sklearn.log_model(best_pipeline, artifact_path="model")
-    mlflow.log_artifact(roc_curve_path)
-    mlflow.log_artifact(cm_path)
-    mlflow.log_artifact(classification_report_path)
-    mlflow.log_artifact(metrics_summary_path)
-    mlflow.log_artifact("artifacts/model.pkl")
+    classification_report_path = os.path.join(REPORTS_DIR, "classification_report.txt")
+    with open(classification_report_path, "w") as f:
+        f.write("Model: ")
+        f.write(best_model_name)
+        f.write("\n\n")
+        f.write(classification_report(y_test, y_pred_test, digits=4))
+
+    metrics_summary_path = os.path.join(REPORTS_DIR, "performance_summary.txt")
+    with open(metrics_summary_path, "w") as f:
+        f.write(f"selected_model={best_model_name}\n")
+        for metric in ["accuracy", "precision", "recall", "roc_auc"]:
+            f.write(f"test_{metric}={evaluation['metrics'][metric]:.6f}\n")
+        if test_escalation_rate is not None:
+            f.write(f"test_escalation_rate={test_escalation_rate:.6f}\n")
+
+    # Log final model to MLflow
+    with batched_run(run_name="Best_Model") as tracker:
+        tracker.log_param("selected_model", best_model_name)
+        tracker.log_param("final_fit", final_fit)
+        tracker.log_metric("final_fit_seconds", final_fit_seconds)
+        tracker.log_metrics(evaluation_metrics(evaluation))
+        tracker.log_metrics(
+            {
+                "test_best_f1_threshold": evaluation["best_f1_threshold"],
+                "test_best_youden_threshold": evaluation["best_youden_threshold"],
+            }
+        )
+        for key, value in constraints.items():
+            if value is not None:
+                tracker.log_param(f"serving_{key}", value)
+        for name, candidate in candidates.items():
+            slug = re.sub(r"[^0-9a-z]+", "_", name.lower()).strip("_")
+            tracker.log_metrics(
+                {f"serving_{slug}_{metric}": candidate[metric] for metric in SERVING_METRICS}
+            )
+        tracker.log_artifact(serving_report_path)
+        if memory is not None:
+            tracker.log_metrics(memory.metrics())
+            tracker.log_metrics({f"memory_serving_{key}": value for key, value in serving_memory.items()})
+            tracker.log_params(
+                {
+                    "recommended_memory_request_mi": recommendation["request_mi"],
+                    "recommended_memory_limit_mi": recommendation["limit_mi"],
+                }
+            )
+            tracker.log_artifact(memory_report_path)
+        if test_escalation_rate is not None:
+            tracker.log_params({"cascade_lower": cascade_band["lower"], "cascade_upper": cascade_band["upper"]})
+            tracker.log_metrics(
+                {
+                    "cv_escalation_rate": cascade_band["escalation_rate"],
+                    "test_escalation_rate": test_escalation_rate,
+                }
+            )
+        tracker.log_artifact(roc_curve_path)
+        tracker.log_artifact(cm_path)
+        tracker.log_artifact(classification_report_path)
+        tracker.log_artifact(metrics_summary_path)
+        tracker.log_artifact(evaluation_report_path)
+        tracker.log_artifact(threshold_sweep_path)
+        if importances is not None:
+            tracker.log_metrics(
+                {f"importance_{name}": value for name, value in importances["importance_mean"].items()}
+            )
+            for variant, row in variants.iterrows():
+                tracker.log_metrics(
+                    {
+                        f"reduced_{variant}_{metric}": float(row[metric])
+                        for metric in ["n_inputs", "n_columns", "accuracy", "roc_auc", "p50_ms", "p99_ms"]
+                    }
+                )
+            tracker.log_artifact(feature_importance_path)
+        if quantization is not None:
+            tracker.log_params({f"quantization_{key}": value for key, value in quantization_settings.items()})
+            tracker.log_metrics({f"quantization_{key}": value for key, value in quantization.items()})
+            tracker.log_artifact(quantization_report_path)
+            tracker.log_artifact(QUANTIZED_MODEL_PATH)
+        tracker.log_artifact(MODEL_PATH)
+        mlflow.sklearn.log_model(best_pipeline, artifact_path="model")
+
+
+if __name__ == "__main__":
+    main()
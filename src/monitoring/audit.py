@@ -0,0 +1,160 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+from prometheus_client import Counter, Gauge
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+AUDIT_LOG_DIR_ENV_VAR = "AUDIT_LOG_DIR"
+
+AUDIT_RECORDS_WRITTEN = Counter("audit_records_written_total", "Prediction audit records written to disk")
+AUDIT_RECORDS_DROPPED = Counter(
+    "audit_records_dropped_total", "Prediction audit records dropped because the queue was full"
+)
+AUDIT_QUEUE_DEPTH = Gauge("audit_queue_depth", "Prediction audit records waiting to be written")
+
+_STOP = object()
+
+
+class AuditSink:
+    """
+    Non-blocking JSONL audit log.
+
+    ``submit`` enqueues a record without waiting; when the bounded queue is
+    full the record is dropped and counted. A background thread drains the
+    queue in batches, appends them to ``audit-<timestamp>.jsonl`` and, once
+    that file exceeds ``max_bytes`` or ``max_age`` seconds, gzips it and
+    starts a new one.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: float = 3600.0,
+        compress: bool = True,
+    ):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._path = None
+        self._opened_at = 0.0
+        self.dropped = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: dict) -> bool:
+        """
+        Queue ``record`` for writing. Returns False if it was dropped.
+        """
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            AUDIT_RECORDS_DROPPED.inc()
+            return False
+        AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    def close(self) -> None:
+        """
+        Write everything still queued, then finalize the active file.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    record = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+
+            try:
+                if batch:
+                    self._write(batch)
+                if stopping or self._should_rotate():
+                    self._rotate()
+            except Exception:  # pragma: no cover - never kill the writer
+                logger.exception("Failed to write %d audit records", len(batch))
+            AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _write(self, batch: list) -> None:
+        if self._file is None:
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+            self._path = os.path.join(self.directory, f"audit-{stamp}.jsonl")
+            self._file = open(self._path, "a", encoding="utf-8")
+            self._opened_at = time.monotonic()
+        self._file.write("".join(json.dumps(record, default=str) + "\n" for record in batch))
+        self._file.flush()
+        AUDIT_RECORDS_WRITTEN.inc(len(batch))
+
+    def _should_rotate(self) -> bool:
+        if self._file is None:
+            return False
+        return (
+            self._file.tell() >= self.max_bytes
+            or time.monotonic() - self._opened_at >= self.max_age
+        )
+
+    def _rotate(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if self.compress:
+            with open(self._path, "rb") as src, gzip.open(f"{self._path}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self._path)
+        logger.info("Rotated audit log %s", self._path)
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_audit_sink():
+    """
+    Shared sink writing under $AUDIT_LOG_DIR, or None when auditing is off.
+    """
+    global _sink
+    directory = os.environ.get(AUDIT_LOG_DIR_ENV_VAR)
+    if not directory:
+        return None
+    with _sink_lock:
+        if _sink is None:
+            _sink = AuditSink(directory)
+            atexit.register(_sink.close)
+    return _sink
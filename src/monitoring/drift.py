@@ -0,0 +1,211 @@
+import threading
+from bisect import bisect_right
+
+import numpy as np
+from prometheus_client import Gauge
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BINS = 10
+# Floor applied to bucket shares so PSI stays finite for empty buckets
+PSI_EPSILON = 1e-4
+
+FEATURE_DRIFT_PSI = Gauge(
+    "feature_drift_psi",
+    "Population stability index of live inputs against the training profile",
+    ["feature"],
+)
+FEATURE_DRIFT_KS = Gauge(
+    "feature_drift_ks",
+    "Binned Kolmogorov-Smirnov distance of live inputs against the training profile",
+    ["feature"],
+)
+DRIFT_WINDOW_SIZE = Gauge(
+    "feature_drift_window_size",
+    "Number of inputs in the window behind the current drift scores",
+)
+
+
+def _bin_edges(values: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Cut points for one feature: midpoints between the distinct values of a
+    low-cardinality column, otherwise training-set quantiles.
+    """
+    unique = np.unique(values)
+    if len(unique) <= 1:
+        return unique.astype(np.float64)
+    if len(unique) <= bins:
+        return (unique[:-1] + unique[1:]) / 2.0
+    quantiles = np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])
+    return np.unique(quantiles)
+
+
+def _bucketize(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Bucket index per value; bucket ``len(edges) + 1`` holds missing values.
+    """
+    idx = np.searchsorted(edges, values, side="right")
+    idx[np.isnan(values)] = len(edges) + 1
+    return idx
+
+
+def build_feature_profile(X, columns: list = None, bins: int = DEFAULT_BINS) -> dict:
+    """
+    Per-feature reference histograms from the training data, stored in the
+    model bundle so serving can measure drift against them.
+    """
+    columns = list(columns if columns is not None else X.columns)
+    features = {}
+    for col in columns:
+        values = np.asarray(X[col], dtype=np.float64)
+        edges = _bin_edges(values[~np.isnan(values)], bins)
+        counts = np.bincount(_bucketize(values, edges), minlength=len(edges) + 2)
+        features[col] = {"edges": edges.tolist(), "counts": counts.tolist()}
+    return {"columns": columns, "features": features}
+
+
+def psi(reference: np.ndarray, current: np.ndarray) -> float:
+    p = np.maximum(current / max(current.sum(), 1), PSI_EPSILON)
+    q = np.maximum(reference / max(reference.sum(), 1), PSI_EPSILON)
+    return float(np.sum((p - q) * np.log(p / q)))
+
+
+def ks_distance(reference: np.ndarray, current: np.ndarray) -> float:
+    p = np.cumsum(current) / max(current.sum(), 1)
+    q = np.cumsum(reference) / max(reference.sum(), 1)
+    return float(np.max(np.abs(p - q)))
+
+
+def profile_drift(profile: dict, X) -> dict:
+    """
+    PSI and KS distance of a batch of rows (a DataFrame with the profile's
+    columns) against the training profile, per feature.
+    """
+    scores = {}
+    for col in profile["columns"]:
+        spec = profile["features"][col]
+        reference = np.asarray(spec["counts"])
+        edges = np.asarray(spec["edges"], dtype=np.float64)
+        counts = np.bincount(
+            _bucketize(np.asarray(X[col], dtype=np.float64), edges), minlength=len(reference)
+        )
+        scores[col] = {"psi": psi(reference, counts), "ks": ks_distance(reference, counts)}
+    return scores
+
+
+class DriftMonitor:
+    """
+    Streaming input histograms on the training profile's bins.
+
+    ``observe`` / ``observe_array`` only bump bucket counters; scores are
+    computed by a background thread every ``interval`` seconds over the
+    inputs seen since the last evaluation (once at least ``min_samples``
+    have arrived) and published as Prometheus gauges.
+    """
+
+    def __init__(self, profile: dict, interval: float = 30.0, min_samples: int = 100):
+        self.profile = profile
+        self.columns = list(profile["columns"])
+        self.interval = interval
+        self.min_samples = min_samples
+
+        specs = [profile["features"][col] for col in self.columns]
+        self._edges = [list(spec["edges"]) for spec in specs]
+        self._edges_np = [np.asarray(edges, dtype=np.float64) for edges in self._edges]
+        width = max(len(edges) + 2 for edges in self._edges)
+        self._reference = np.zeros((len(self.columns), width), dtype=np.int64)
+        for j, spec in enumerate(specs):
+            self._reference[j, : len(spec["counts"])] = spec["counts"]
+
+        self._counts = np.zeros_like(self._reference)
+        self._n = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.scores = {}
+
+    @property
+    def nbytes(self) -> int:
+        return self._reference.nbytes + self._counts.nbytes + sum(edges.nbytes for edges in self._edges_np)
+
+    def observe(self, record: dict) -> None:
+        """
+        Count one request's inputs (a mapping of feature name to value).
+        """
+        with self._lock:
+            counts = self._counts
+            for j, col in enumerate(self.columns):
+                value = record.get(col)
+                edges = self._edges[j]
+                if value is None or value != value:
+                    counts[j, len(edges) + 1] += 1
+                else:
+                    counts[j, bisect_right(edges, value)] += 1
+            self._n += 1
+
+    def observe_array(self, X: np.ndarray, columns: list = None) -> None:
+        """
+        Count a batch of rows. ``columns`` gives the order of X's columns
+        when it differs from the profile's.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) == 0:
+            return
+        if columns is not None and list(columns) != self.columns:
+            X = X[:, [list(columns).index(col) for col in self.columns]]
+
+        width = self._counts.shape[1]
+        batch = np.stack(
+            [
+                np.bincount(_bucketize(X[:, j], self._edges_np[j]), minlength=width)
+                for j in range(len(self.columns))
+            ]
+        )
+        with self._lock:
+            self._counts += batch
+            self._n += len(X)
+
+    def compute(self, force: bool = False) -> dict:
+        """
+        Score the current window and start a new one. Returns the latest
+        scores (unchanged if the window is still too small).
+        """
+        with self._lock:
+            if self._n == 0 or (self._n < self.min_samples and not force):
+                return self.scores
+            counts, n = self._counts, self._n
+            self._counts = np.zeros_like(self._reference)
+            self._n = 0
+
+        scores = {}
+        for j, col in enumerate(self.columns):
+            scores[col] = {
+                "psi": psi(self._reference[j], counts[j]),
+                "ks": ks_distance(self._reference[j], counts[j]),
+            }
+            FEATURE_DRIFT_PSI.labels(col).set(scores[col]["psi"])
+            FEATURE_DRIFT_KS.labels(col).set(scores[col]["ks"])
+        DRIFT_WINDOW_SIZE.set(n)
+        self.scores = scores
+        return scores
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.compute()
+            except Exception:  # pragma: no cover - keep the monitor alive
+                logger.exception("Drift computation failed")
@@ -0,0 +1,120 @@
+import sys
+import threading
+import time
+from collections import Counter
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILING_TOKEN_ENV_VAR = "PROFILING_TOKEN"
+
+# Modules summarized by default: the serving path and the libraries it spends time in
+DEFAULT_MODULE_PREFIXES = ("src.models.predict", "sklearn", "pandas")
+
+# (module, function name) of innermost frames where threads block rather than run
+_IDLE_LEAVES = {
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+    ("selectors", "select"),
+    ("queue", "get"),
+    ("concurrent.futures.thread", "_worker"),
+}
+
+_capture_lock = threading.Lock()
+
+
+class CaptureInProgress(RuntimeError):
+    pass
+
+
+def _frame_label(frame) -> tuple:
+    # co_qualname is Python 3.11+; 3.10 (the serving image) gets the bare name
+    code = frame.f_code
+    return frame.f_globals.get("__name__", "?"), getattr(code, "co_qualname", code.co_name)
+
+
+def _stack(frame) -> tuple:
+    """
+    (module, qualified name) pairs from the outermost frame to ``frame``
+    (the bare function name before Python 3.11).
+    """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return tuple(reversed(labels))
+
+
+def sample_stacks(duration: float, interval: float = 0.005) -> dict:
+    """
+    Sample the Python stack of every other thread every ``interval``
+    seconds for ``duration`` seconds, in the calling thread.
+
+    Returns {"stacks": Counter of stack tuples, "samples": sampling passes,
+    "idle": thread samples dropped because the thread was blocked}. Only
+    one capture runs at a time; nothing is installed or left running
+    outside a capture, so there is no overhead otherwise.
+    """
+    if not _capture_lock.acquire(blocking=False):
+        raise CaptureInProgress("A profile capture is already running")
+    try:
+        own = threading.get_ident()
+        stacks = Counter()
+        samples = idle = 0
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = _stack(frame)
+                module, name = stack[-1]
+                if (module, name.rsplit(".", 1)[-1]) in _IDLE_LEAVES:
+                    idle += 1
+                else:
+                    stacks[stack] += 1
+            samples += 1
+            time.sleep(interval)
+    finally:
+        _capture_lock.release()
+    logger.info("Profile capture: %d passes, %d active and %d idle thread samples", samples, sum(stacks.values()), idle)
+    return {"stacks": stacks, "samples": samples, "idle": idle}
+
+
+def collapsed_stacks(stacks: Counter) -> str:
+    """
+    Stacks in the collapsed ("folded") format read by flamegraph.pl,
+    speedscope and similar tools: ``frame;frame;frame count`` per line.
+    """
+    lines = [
+        ";".join(f"{module}:{name}" for module, name in stack) + f" {count}"
+        for stack, count in sorted(stacks.items(), key=lambda item: -item[1])
+    ]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def top_functions(stacks: Counter, prefixes=DEFAULT_MODULE_PREFIXES, n: int = 20) -> list:
+    """
+    The ``n`` functions from modules starting with any of ``prefixes`` that
+    appear in the most samples. ``self`` counts samples where the function
+    was the innermost frame, ``total`` samples where it was anywhere on the
+    stack; percentages are of all active samples.
+    """
+    total_samples = sum(stacks.values())
+    self_counts, total_counts = Counter(), Counter()
+    for stack, count in stacks.items():
+        if stack[-1][0].startswith(prefixes):
+            self_counts[stack[-1]] += count
+        for label in set(stack):
+            if label[0].startswith(prefixes):
+                total_counts[label] += count
+
+    return [
+        {
+            "function": f"{module}:{name}",
+            "self": self_counts[(module, name)],
+            "total": count,
+            "total_pct": round(100 * count / total_samples, 2),
+        }
+        for (module, name), count in total_counts.most_common(n)
+    ]
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.utils.hashing import hash_file, module_source
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    A unit of pipeline work with declared file inputs and outputs.
+
+    ``code`` lists module names whose source is part of the fingerprint, and
+    ``params`` holds any extra values that should invalidate the cache when
+    they change. Stages with ``trust_existing_outputs`` are considered up to
+    date whenever all their outputs exist (e.g. a one-off download).
+    """
+
+    name: str
+    func: Callable[[], None]
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    deps: list = field(default_factory=list)
+    code: list = field(default_factory=list)
+    params: dict = field(default_factory=dict)
+    trust_existing_outputs: bool = False
+
+
+class PipelineRunner:
+    """
+    Runs stages in dependency order, skipping those whose fingerprint
+    (input contents, code, params) matches the last successful run and whose
+    outputs still exist. Independent stages run concurrently.
+    """
+
+    def __init__(
+        self,
+        stages: list,
+        state_path: str,
+        max_workers: int = 2,
+        executor: str = "process",
+    ):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.max_workers = max_workers
+        self.executor = executor
+
+        for stage in stages:
+            unknown = set(stage.deps) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages {sorted(unknown)}")
+
+    def fingerprint(self, stage: Stage) -> str:
+        digest = hashlib.sha256()
+        for path in sorted(stage.inputs):
+            digest.update(f"input:{path}:".encode())
+            digest.update(hash_file(path).encode() if os.path.exists(path) else b"missing")
+        for module_name in sorted(stage.code):
+            digest.update(f"code:{module_name}:".encode())
+            digest.update(hash_file(module_source(module_name)).encode())
+        digest.update(json.dumps(stage.params, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def is_up_to_date(self, stage: Stage, state: dict) -> bool:
+        if not all(os.path.exists(path) for path in stage.outputs):
+            return False
+        if stage.trust_existing_outputs:
+            return True
+        return state.get(stage.name) == self.fingerprint(stage)
+
+    def run(self, targets: list = None, force: bool = False) -> dict:
+        """
+        Run ``targets`` (default: every stage) plus their upstream stages.
+        Returns a mapping of stage name to "ran" or "skipped".
+        """
+        selected = self._with_upstream(targets or list(self.stages))
+        state = self._load_state()
+        status = {}
+        pending = set(selected)
+        running = {}
+
+        pool_cls = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with pool_cls(max_workers=self.max_workers) as pool:
+            while pending or running:
+                ready = [
+                    name
+                    for name in sorted(pending)
+                    if all(dep in status for dep in self.stages[name].deps)
+                ]
+                for name in ready:
+                    pending.discard(name)
+                    stage = self.stages[name]
+                    if not force and self.is_up_to_date(stage, state):
+                        logger.info("Stage '%s' is up to date, skipping", name)
+                        status[name] = "skipped"
+                        continue
+                    logger.info("Running stage '%s'", name)
+                    running[pool.submit(stage.func)] = name
+
+                if not running:
+                    if not ready:
+                        raise RuntimeError(f"Dependency cycle between stages {sorted(pending)}")
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    exc = future.exception()
+                    if exc is not None:
+                        for other in running:
+                            other.cancel()
+                        logger.error("Stage '%s' failed: %s", name, exc)
+                        raise exc
+
+                    missing = [p for p in self.stages[name].outputs if not os.path.exists(p)]
+                    if missing:
+                        raise RuntimeError(f"Stage '{name}' did not produce outputs {missing}")
+
+                    state[name] = self.fingerprint(self.stages[name])
+                    self._save_state(state)
+                    status[name] = "ran"
+
+        return status
+
+    def _with_upstream(self, targets: list) -> list:
+        selected = []
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            if name not in selected:
+                selected.append(name)
+                stack.extend(self.stages[name].deps)
+        return selected
+
+    def _load_state(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _save_state(self, state: dict) -> None:
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,202 @@
+import os
+from functools import partial
+
+from src.data.download_data import (CACHE_DIR, DATA_URL, download_dataset,
+                                    download_sources)
+from src.data.ingest import ingest_sources
+from src.data.load_data import (load_raw_data, processed_increment_paths,
+                                processed_source, save_processed_data)
+from src.data.preprocess import preprocess_pipeline
+from src.pipeline.runner import PipelineRunner, Stage
+from src.utils.config import (DATA_CONFIG_PATH, PROJECT_ROOT, load_config,
+                              resolve_path)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STATE_PATH = os.path.join(PROJECT_ROOT, ".pipeline", "state.json")
+MODEL_ARTIFACT_PATH = os.path.join(PROJECT_ROOT, "artifacts", "model.pkl")
+
+EDA_FIGURES = [
+    "class_balance.png",
+    "feature_histograms.png",
+    "correlation_heatmap.png",
+]
+
+
+def raw_source_paths(config: dict) -> dict:
+    """
+    Raw CSV per configured download source ({} for the single-file layout).
+    """
+    raw_dir = resolve_path(config["data"].get("raw_sources_dir", "data/raw/sources"))
+    sources = config.get("download", {}).get("sources") or {}
+    return {name: os.path.join(raw_dir, f"{name}.csv") for name in sources}
+
+
+def download_is_pinned(download: dict) -> bool:
+    """
+    True when every configured download has an expected sha256, so an
+    existing raw file cannot go stale and need not be revalidated.
+    """
+    sources = download.get("sources")
+    if not sources:
+        return bool(download.get("sha256"))
+    return all(isinstance(spec, dict) and spec.get("sha256") for spec in sources.values())
+
+
+def run_download(config: dict) -> None:
+    download = config.get("download", {})
+    if download.get("sources"):
+        download_sources(
+            download["sources"],
+            output_dir=resolve_path(config["data"].get("raw_sources_dir", "data/raw/sources")),
+            cache_dir=resolve_path(download.get("cache_dir", CACHE_DIR)),
+            max_workers=download.get("max_workers", 4),
+        )
+        return
+    download_dataset(
+        url=download.get("url", DATA_URL),
+        output_path=resolve_path(config["data"]["raw_path"]),
+        sha256=download.get("sha256"),
+        mirror_url=download.get("mirror_url"),
+        cache_dir=resolve_path(download.get("cache_dir", CACHE_DIR)),
+    )
+
+
+def run_preprocess(config: dict) -> None:
+    raw_path = resolve_path(config["data"]["raw_path"])
+    processed_path = resolve_path(config["data"]["processed_path"])
+    os.makedirs(os.path.dirname(processed_path), exist_ok=True)
+
+    source_paths = raw_source_paths(config)
+    if source_paths:
+        summary = ingest_sources(
+            source_paths,
+            processed_path,
+            partitions_dir=resolve_path(config["data"].get("processed_sources_dir", "data/processed/sources")),
+            numeric_cols=config["preprocessing"]["numerical_features"],
+            max_workers=config.get("download", {}).get("max_workers", 4),
+        )
+        for name, entry in summary.items():
+            logger.info("Source %s: %d rows (%s)", name, entry["rows"], entry["status"])
+        return
+
+    df_raw = load_raw_data(raw_path)
+    df_clean = preprocess_pipeline(
+        df_raw,
+        config["preprocessing"]["categorical_features"],
+        config["preprocessing"]["numerical_features"],
+    )
+    save_processed_data(df_clean, processed_path)
+
+
+def run_eda(config: dict) -> None:
+    from src.data.eda import compute_eda_stats, render_eda_figures
+
+    figures_path = resolve_path(config["eda"]["figures_path"])
+    os.makedirs(figures_path, exist_ok=True)
+
+    source = processed_source(resolve_path(config["data"]["processed_path"]))
+    stats = compute_eda_stats(
+        source,
+        config["schema"]["target"],
+        chunksize=config["eda"].get("chunksize", 500_000),
+    )
+    render_eda_figures(stats, figures_path)
+
+
+def run_training(config: dict) -> None:
+    from src.models import train
+
+    train.main(config)
+
+
+def build_stages(config: dict, config_path: str = DATA_CONFIG_PATH) -> list:
+    """
+    Declare the download -> preprocess -> (EDA, train) stage graph.
+    """
+    raw_path = resolve_path(config["data"]["raw_path"])
+    processed_path = resolve_path(config["data"]["processed_path"])
+    figures_path = resolve_path(config["eda"]["figures_path"])
+    download = config.get("download", {})
+    # With download sources, every source's raw CSV replaces the single raw file
+    raw_paths = list(raw_source_paths(config).values()) or [raw_path]
+    # Rows appended by incremental retraining are training inputs too
+    increments_path = config["data"].get("increments_path")
+    increment_paths = processed_increment_paths(resolve_path(increments_path)) if increments_path else []
+
+    return [
+        Stage(
+            name="download",
+            func=partial(run_download, config),
+            outputs=raw_paths,
+            params={
+                "url": download.get("url", DATA_URL),
+                "sha256": download.get("sha256"),
+                "sources": download.get("sources"),
+            },
+            # Unpinned URLs are revalidated every run (a conditional request
+            # when unchanged), so an upstream change reaches preprocessing
+            trust_existing_outputs=download_is_pinned(download),
+        ),
+        Stage(
+            name="preprocess",
+            func=partial(run_preprocess, config),
+            inputs=raw_paths + [config_path],
+            outputs=[processed_path],
+            deps=["download"],
+            code=["src.data.load_data", "src.data.preprocess", "src.data.schema", "src.data.ingest"],
+        ),
+        Stage(
+            name="eda",
+            func=partial(run_eda, config),
+            inputs=[processed_path, config_path],
+            outputs=[os.path.join(figures_path, name) for name in EDA_FIGURES],
+            deps=["preprocess"],
+            code=["src.data.eda"],
+        ),
+        Stage(
+            name="train",
+            func=partial(run_training, config),
+            inputs=[processed_path, config_path] + increment_paths,
+            outputs=[MODEL_ARTIFACT_PATH],
+            deps=["preprocess"],
+            code=[
+                "src.models.train",
+                "src.models.incremental",
+                "src.data.load_data",
+                "src.data.preprocess",
+                "src.data.schema",
+                "src.utils.config",
+                "src.models.model",
+                "src.features.feature_pipeline",
+                "src.features.feature_store",
+                "src.utils.tracking",
+                "src.monitoring.drift",
+                "src.models.cascade",
+                "src.models.evaluation",
+                "src.models.serving_cost",
+                "src.models.fold_ensemble",
+                "src.utils.memory",
+                "src.features.statistics",
+                "src.models.feature_importance",
+                "src.models.quantize",
+                "src.models.packed_forest",
+            ],
+        ),
+    ]
+
+
+def build_runner(
+    config: dict = None,
+    config_path: str = DATA_CONFIG_PATH,
+    max_workers: int = 2,
+    executor: str = "process",
+) -> PipelineRunner:
+    config = config or load_config(config_path)
+    return PipelineRunner(
+        build_stages(config, config_path),
+        state_path=STATE_PATH,
+        max_workers=max_workers,
+        executor=executor,
+    )
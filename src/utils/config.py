@@ -0,0 +1,21 @@
+import os
+
+import yaml
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+DATA_CONFIG_PATH = os.path.join(PROJECT_ROOT, "configs", "data_config.yaml")
+
+
+def load_config(path: str = DATA_CONFIG_PATH) -> dict:
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def resolve_path(path: str) -> str:
+    """
+    Resolve a path from the config relative to the project root.
+    """
+    if os.path.isabs(path):
+        return path
+    return os.path.join(PROJECT_ROOT, path)
@@ -0,0 +1,22 @@
+import hashlib
+import importlib.util
+
+_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def module_source(module_name: str) -> str:
+    """
+    Path of a module's source file, located without importing it.
+    """
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.origin is None:
+        raise ValueError(f"Cannot locate source for module '{module_name}'")
+    return spec.origin
@@ -0,0 +1,181 @@
+import math
+import os
+import re
+import resource
+import tracemalloc
+from contextlib import contextmanager
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MB = 1024 * 1024
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> int:
+    """
+    Current resident set size of this process.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """
+    Highest resident set size of this process (since the last
+    ``reset_peak_rss`` where the kernel supports it).
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the kernel's RSS high-water mark (Linux 4.0+). Returns False when
+    unsupported, in which case peaks are process-lifetime maxima.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class MemoryTracker:
+    """
+    Peak and retained memory per named stage.
+
+    For each ``stage`` block it records the RSS after it, the peak RSS
+    during it and the peak and retained Python/NumPy allocations. With
+    ``trace=True`` tracemalloc runs only while a stage is open, so code
+    between stages (e.g. latency measurements) is not slowed down. Stages
+    may nest; an inner stage's peak also counts towards the enclosing one.
+    Allocations in worker processes (e.g. CV with ``n_jobs``) are not seen.
+    """
+
+    def __init__(self, trace: bool = True):
+        self.trace = trace
+        self.stages = {}
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name: str):
+        started_tracing = self.trace and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+        if self._stack:
+            self._stack[-1]["peak_rss"] = max(self._stack[-1]["peak_rss"], peak_rss_bytes())
+        frame = {"start": current if tracing else 0, "peak": 0, "peak_rss": 0}
+        self._stack.append(frame)
+        peak_reset = reset_peak_rss()
+        rss_before = rss_bytes()
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            rss_after = rss_bytes()
+            peak_rss = max(peak_rss_bytes(), frame["peak_rss"])
+            if self._stack:
+                self._stack[-1]["peak_rss"] = max(self._stack[-1]["peak_rss"], peak_rss)
+            record = {
+                "rss_mb": rss_after / MB,
+                "rss_delta_mb": (rss_after - rss_before) / MB,
+                "peak_rss_mb": peak_rss / MB,
+            }
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, frame["peak"])
+                record["peak_alloc_mb"] = (peak - frame["start"]) / MB
+                record["retained_alloc_mb"] = (current - frame["start"]) / MB
+                if self._stack:
+                    self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            if started_tracing:
+                tracemalloc.stop()
+            if not peak_reset:
+                record["peak_rss_is_lifetime"] = True
+            self.stages[name] = record
+            logger.info(
+                "Memory [%s]: peak alloc %.1f MB, retained %.1f MB, peak RSS %.0f MB",
+                name,
+                record.get("peak_alloc_mb", float("nan")),
+                record.get("retained_alloc_mb", float("nan")),
+                record["peak_rss_mb"],
+            )
+
+    @property
+    def peak_rss_mb(self) -> float:
+        return max((record["peak_rss_mb"] for record in self.stages.values()), default=rss_bytes() / MB)
+
+    def metrics(self, prefix: str = "memory") -> dict:
+        """
+        Flat ``{prefix}_{stage}_{measure}`` metrics, e.g. for MLflow.
+        """
+        metrics = {}
+        for name, record in self.stages.items():
+            slug = re.sub(r"[^0-9a-z]+", "_", name.lower()).strip("_")
+            for key, value in record.items():
+                if not isinstance(value, bool):
+                    metrics[f"{prefix}_{slug}_{key}"] = float(value)
+        return metrics
+
+
+def _round_up(value_mb: float, step_mb: int = 64) -> int:
+    return int(math.ceil(value_mb / step_mb) * step_mb)
+
+
+def recommend_limits(
+    steady_rss_mb: float,
+    request_peak_mb: float,
+    concurrency: int = 1,
+    request_headroom: float = 1.25,
+    limit_headroom: float = 1.5,
+) -> dict:
+    """
+    Container memory request/limit (MiB, rounded up to 64) for a server
+    whose idle RSS with the model loaded is ``steady_rss_mb`` and that
+    allocates up to ``request_peak_mb`` per in-flight request.
+    """
+    working_set = steady_rss_mb + request_peak_mb * concurrency
+    return {
+        "request_mi": _round_up(steady_rss_mb * request_headroom),
+        "limit_mi": _round_up(working_set * limit_headroom),
+        "working_set_mb": working_set,
+    }
+
+
+def write_memory_report(stages: dict, serving: dict, recommendation: dict, training_peak_mb: float, path: str) -> None:
+    with open(path, "w") as f:
+        f.write("Training stages (MB)\n")
+        for name, record in stages.items():
+            fields = ", ".join(
+                f"{key}={value:.1f}" for key, value in record.items() if not isinstance(value, bool)
+            )
+            f.write(f"  {name}: {fields}\n")
+        f.write(f"\nTraining job: peak RSS {training_peak_mb:.0f} MB -> memory limit >= {_round_up(training_peak_mb * 1.25)}Mi\n")
+
+        f.write("\nServing (MB)\n")
+        for key, value in serving.items():
+            f.write(f"  {key}={value:.1f}\n")
+        f.write(
+            f"\nRecommended serving container: requests.memory={recommendation['request_mi']}Mi "
+            f"limits.memory={recommendation['limit_mi']}Mi "
+            f"(working set {recommendation['working_set_mb']:.0f} MB)\n"
+        )
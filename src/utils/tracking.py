@@ -0,0 +1,146 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import mlflow
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.store.artifact.artifact_repository_registry import \
+    get_artifact_repository
+from mlflow.tracking import MlflowClient
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Per-request limits enforced by the MLflow tracking server for log_batch.
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+MAX_METRICS_PER_BATCH = 1000
+MAX_ENTITIES_PER_BATCH = 1000
+
+
+class BatchedMlflowLogger:
+    """
+    Buffers params, metrics and tags for one MLflow run and sends them with
+    ``log_batch``. Artifact uploads run on a background worker and are
+    awaited by ``close``.
+    """
+
+    def __init__(self, run_id: str, client: MlflowClient = None, max_workers: int = 1):
+        self.run_id = run_id
+        self.client = client or MlflowClient()
+        self.max_workers = max_workers
+        self._params = {}
+        self._tags = {}
+        self._metrics = []
+        self._executor = None
+        self._artifact_repo = None
+        self._uploads = []
+
+    def log_param(self, key: str, value) -> None:
+        self._params[key] = str(value)
+        self._flush_if_full()
+
+    def log_params(self, params: dict) -> None:
+        for key, value in params.items():
+            self.log_param(key, value)
+
+    def set_tag(self, key: str, value) -> None:
+        self._tags[key] = str(value)
+        self._flush_if_full()
+
+    def log_metric(self, key: str, value: float, step: int = 0) -> None:
+        timestamp = int(time.time() * 1000)
+        self._metrics.append(Metric(key, float(value), timestamp, step))
+        self._flush_if_full()
+
+    def log_metrics(self, metrics: dict, step: int = 0) -> None:
+        for key, value in metrics.items():
+            self.log_metric(key, value, step=step)
+
+    def log_artifact(self, local_path: str, artifact_path: str = None) -> None:
+        """
+        Queue an artifact upload. The file must stay unchanged until close().
+        """
+        if self._artifact_repo is None:
+            # Resolve the run's artifact store once, on the calling thread, so
+            # uploads never race buffered writes to the same run.
+            artifact_uri = self.client.get_run(self.run_id).info.artifact_uri
+            self._artifact_repo = get_artifact_repository(artifact_uri)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="mlflow-artifacts"
+            )
+        future = self._executor.submit(
+            self._artifact_repo.log_artifact, local_path, artifact_path
+        )
+        self._uploads.append((local_path, future))
+
+    def flush(self) -> None:
+        """
+        Send everything buffered so far, split to respect batch limits.
+        """
+        params = [Param(k, v) for k, v in self._params.items()]
+        tags = [RunTag(k, v) for k, v in self._tags.items()]
+        metrics = self._metrics
+        self._params, self._tags, self._metrics = {}, {}, []
+
+        while params or tags or metrics:
+            batch_params = params[:MAX_PARAMS_PER_BATCH]
+            batch_tags = tags[:MAX_TAGS_PER_BATCH]
+            room = MAX_ENTITIES_PER_BATCH - len(batch_params) - len(batch_tags)
+            batch_metrics = metrics[: min(room, MAX_METRICS_PER_BATCH)]
+
+            self.client.log_batch(
+                self.run_id,
+                metrics=batch_metrics,
+                params=batch_params,
+                tags=batch_tags,
+            )
+
+            params = params[len(batch_params):]
+            tags = tags[len(batch_tags):]
+            metrics = metrics[len(batch_metrics):]
+
+    def close(self) -> None:
+        """
+        Flush buffered data and wait for queued artifact uploads.
+        """
+        self.flush()
+
+        errors = []
+        for local_path, future in self._uploads:
+            exc = future.exception()
+            if exc is not None:
+                logger.error("Artifact upload failed for %s: %s", local_path, exc)
+                errors.append(exc)
+        self._uploads = []
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if errors:
+            raise errors[0]
+
+    def _flush_if_full(self) -> None:
+        if (
+            len(self._params) >= MAX_PARAMS_PER_BATCH
+            or len(self._tags) >= MAX_TAGS_PER_BATCH
+            or len(self._metrics) >= MAX_METRICS_PER_BATCH
+        ):
+            self.flush()
+
+
+@contextmanager
+def batched_run(run_name: str = None, **kwargs):
+    """
+    Start an MLflow run and yield a BatchedMlflowLogger for it. Buffered data
+    and pending uploads are flushed before the run ends.
+    """
+    with mlflow.start_run(run_name=run_name, **kwargs) as run:
+        tracker = BatchedMlflowLogger(run.info.run_id)
+        try:
+            yield tracker
+        finally:
+            tracker.close()
@@ -1,3 +1,4 @@
+import pytest
 from fastapi.testclient import TestClient
 
 from src.api.app import app
@@ -86,3 +87,162 @@ def test_predict_missing_model_returns_500(monkeypatch):
     resp = client.post("/predict", json=sample)
     assert resp.status_code == 500
     assert "Model artifact" in resp.json().get("detail", "")
+
+
+def test_predict_batch_scores_valid_rows_and_reports_violations(monkeypatch):
+    class _DummyModel:
+        def predict(self, X):
+            return [1] * len(X)
+
+        def predict_proba(self, X):
+            return [[0.3, 0.7]] * len(X)
+
+    sample = {
+        "age": 60,
+        "sex": 1,
+        "cp": 3,
+        "trestbps": 120,
+        "chol": 240,
+        "fbs": 0,
+        "restecg": 1,
+        "thalach": 150,
+        "exang": 0,
+        "oldpeak": 2.3,
+        "slope": 2,
+        "ca": 0,
+        "thal": 2,
+    }
+
+    monkeypatch.setattr(
+        predict_module,
+        "get_bundle",
+        lambda: {"model": _DummyModel(), "raw_feature_names": list(sample.keys())},
+    )
+
+    resp = client.post(
+        "/predict/batch", json={"records": [sample, {**sample, "thal": 5}, sample]}
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["predictions"][0] == {"prediction": 1, "confidence": 0.7}
+    assert body["predictions"][1] is None
+    assert body["validation"]["n_invalid_rows"] == 1
+    assert body["validation"]["violations"][0]["column"] == "thal"
+
+
+def test_predict_batch_rejects_malformed_body():
+    resp = client.post("/predict/batch", json=[{"age": 60}])
+    assert resp.status_code == 422
+
+
+def test_predictions_are_audited(monkeypatch, tmp_path):
+    import gzip
+    import json
+
+    import src.monitoring.audit as audit_module
+
+    class _DummyModel:
+        def predict(self, X):
+            return [1] * len(X)
+
+    sample = {
+        "age": 60,
+        "sex": 1,
+        "cp": 3,
+        "trestbps": 120,
+        "chol": 240,
+        "fbs": 0,
+        "restecg": 1,
+        "thalach": 150,
+        "exang": 0,
+        "oldpeak": 2.3,
+        "slope": 2,
+        "ca": 0,
+        "thal": 2,
+    }
+    monkeypatch.setattr(
+        predict_module,
+        "get_bundle",
+        lambda: {"model": _DummyModel(), "raw_feature_names": list(sample), "model_version": "v1"},
+    )
+    monkeypatch.setenv("AUDIT_LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(audit_module, "_sink", None)
+
+    client.post("/predict", json=sample, headers={"X-Request-ID": "abc"})
+    client.post("/predict/batch", json={"records": [sample, {**sample, "thal": 5}]})
+    audit_module._sink.close()
+
+    [path] = tmp_path.iterdir()
+    with gzip.open(path, "rt") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["endpoint"] for r in records] == ["/predict", "/predict/batch", "/predict/batch"]
+    assert records[0]["request_id"] == "abc"
+    assert records[0]["model_version"] == "v1"
+    assert records[0]["inputs"] == sample
+    assert records[0]["output"]["prediction"] == 1
+    assert records[2]["output"] is None
+    assert all(r["latency_ms"] >= 0 for r in records)
+
+
+def test_expired_deadline_skips_inference(monkeypatch):
+    from prometheus_client import REGISTRY
+
+    monkeypatch.setattr(predict_module, "get_bundle", lambda: pytest.fail("inference ran after its deadline"))
+    before = REGISTRY.get_sample_value("inference_expired_total", {"endpoint": "/predict/batch"}) or 0
+
+    resp = client.post("/predict/batch", json={"records": [{"age": 60}]}, headers={"X-Request-Timeout": "0"})
+
+    assert resp.status_code == 504
+    assert REGISTRY.get_sample_value("inference_expired_total", {"endpoint": "/predict/batch"}) == before + 1
+    assert client.post("/predict/batch", json={"records": []}, headers={"X-Request-Timeout": "soon"}).status_code == 400
+
+
+def test_queued_inference_is_cancelled_at_deadline(monkeypatch):
+    import asyncio
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from prometheus_client import REGISTRY
+
+    import src.api.app as app_module
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(app_module, "_executor", executor)
+    release = threading.Event()
+    executor.submit(release.wait)
+    before = REGISTRY.get_sample_value("inference_cancelled_total", {"endpoint": "/predict"}) or 0
+    calls = []
+
+    try:
+        with pytest.raises(app_module.DeadlineExceeded):
+            asyncio.run(app_module.run_inference("/predict", time.perf_counter() + 0.05, calls.append, 1))
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+    assert calls == []
+    assert REGISTRY.get_sample_value("inference_cancelled_total", {"endpoint": "/predict"}) == before + 1
+
+
+def test_profile_endpoint_is_gated_by_token(monkeypatch):
+    monkeypatch.delenv("PROFILING_TOKEN", raising=False)
+    assert client.post("/admin/profile?seconds=0.05").status_code == 404
+
+    monkeypatch.setenv("PROFILING_TOKEN", "secret")
+    assert client.post("/admin/profile?seconds=0.05", headers={"X-Profiling-Token": "wrong"}).status_code == 403
+    assert client.post("/admin/profile?seconds=600", headers={"X-Profiling-Token": "secret"}).status_code == 422
+
+    resp = client.post("/admin/profile?seconds=0.1&top=5", headers={"X-Profiling-Token": "secret"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["samples"] > 0
+    assert isinstance(body["top"], list) and len(body["top"]) <= 5
+    assert isinstance(body["collapsed"], str)
+
+
+def test_metrics_export_memory_gauges():
+    text = client.get("/metrics").text
+
+    assert "process_peak_resident_memory_bytes" in text
+    assert 'serving_memory_bytes{component="packed_forest"}' in text
@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def test_serving_import_stays_within_budget():
+    """
+    The API must import without sklearn, pandas and the training stack,
+    within the budget in scripts/benchmark_cold_start.py.
+    """
+    result = subprocess.run(
+        [sys.executable, os.path.join(PROJECT_ROOT, "scripts", "benchmark_cold_start.py"), "--repeats", "3", "--skip-startup"],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,122 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+class FakeHTTPServer(ThreadingHTTPServer):
+    """
+    Local stand-in for a remote file host.
+
+    ``files`` maps URL paths to bytes. ``failures`` maps a path to a number
+    of requests that should get a 503 first, and ``truncate`` maps a path
+    to a byte count after which the next response is cut off. Responses
+    carry an ETag of the body, honoured by ``If-None-Match`` and
+    ``If-Range``. Every request's path and headers are recorded in
+    ``requests``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _FakeHandler)
+        self.files = {}
+        self.failures = {}
+        self.truncate = {}
+        self.requests = []
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def hits(self, path: str) -> int:
+        return sum(1 for request_path, _ in self.requests if request_path == path)
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+
+        if server.failures.get(self.path, 0) > 0:
+            server.failures[self.path] -= 1
+            self.send_error(503)
+            return
+        if self.path not in server.files:
+            self.send_error(404)
+            return
+
+        body = server.files[self.path]
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        start = 0
+        range_header = self.headers.get("Range")
+        if self.headers.get("If-Range") not in (None, etag):
+            # The client's partial copy is of another version; send it all
+            range_header = None
+        if range_header:
+            start = int(range_header.split("=")[1].split("-")[0])
+            if start >= len(body):
+                self.send_error(416)
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+
+        payload = body[start:]
+        cutoff = server.truncate.pop(self.path, None)
+        if cutoff is not None:
+            payload = payload[:cutoff]
+            self.close_connection = True
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = FakeHTTPServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def heart_frame():
+    """
+    Factory for synthetic heart-disease rows within the features' usual
+    ranges: ``heart_frame(n_rows, seed=0, n_cp=4, target=False)``. With
+    ``target``, a label mostly determined by ``thalach`` is added.
+    """
+
+    def make(n_rows: int, seed: int = 0, n_cp: int = 4, target: bool = False) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        df = pd.DataFrame(
+            {
+                "age": rng.integers(30, 80, n_rows),
+                "sex": rng.integers(0, 2, n_rows),
+                "cp": rng.integers(1, 1 + n_cp, n_rows),
+                "trestbps": rng.integers(100, 180, n_rows),
+                "chol": rng.integers(150, 350, n_rows),
+                "thalach": rng.integers(90, 200, n_rows),
+            }
+        )
+        if target:
+            df["target"] = ((df["thalach"] < 145) ^ (rng.random(n_rows) < 0.1)).astype(int)
+        return df
+
+    return make
@@ -1,27 +1,143 @@
+import hashlib
 import os
-import tempfile
 
 import pandas as pd
 import pytest
 
 from src.data import download_data
 
+RAW_ROWS = (
+    b"63.0,1.0,1.0,145.0,233.0,1.0,2.0,150.0,0.0,2.3,3.0,0.0,6.0,0\n"
+    b"67.0,1.0,4.0,160.0,286.0,0.0,2.0,108.0,1.0,1.5,2.0,3.0,3.0,2\n"
+    b"37.0,1.0,3.0,130.0,250.0,0.0,0.0,187.0,0.0,3.5,3.0,?,3.0,0\n"
+)
+RAW_SHA256 = hashlib.sha256(RAW_ROWS).hexdigest()
 
-def test_download_dataset(monkeypatch):
-    """Fakes download of the dataset and
-    checks if the output file has the right structure"""
 
-    tmpdir = tempfile.mkdtemp()
-    fake_file = os.path.join(tmpdir, "heart_disease.csv")
+def _download(http_server, tmp_path, path="/heart.data", **kwargs):
+    return download_data.download_dataset(
+        url=http_server.url(path),
+        output_path=str(tmp_path / "raw" / "heart_disease.csv"),
+        cache_dir=str(tmp_path / "cache"),
+        **kwargs,
+    )
 
-    def fake_urlretrieve(url, filename):
-        with open(filename, "w") as f:
-            f.write("1,1,1,120,240,0,1,150,0,2.3,2,0,2,1\n")
 
-    monkeypatch.setattr(download_data.urllib.request, "urlretrieve", fake_urlretrieve)
-    monkeypatch.setattr(download_data, "RAW_DATA_DIR", tmpdir)
+def test_download_dataset(http_server, tmp_path):
+    """Downloads from a local server and checks the output has headers and every row"""
+    http_server.files["/heart.data"] = RAW_ROWS
 
-    download_data.download_dataset()
-    df = pd.read_csv(fake_file)
-    assert set(download_data.COLUMN_NAMES).issubset(df.columns)
-    assert df.shape[0] == 1
+    output_path = _download(http_server, tmp_path, sha256=RAW_SHA256)
+
+    df = pd.read_csv(output_path)
+    assert list(df.columns) == download_data.COLUMN_NAMES
+    assert df.shape[0] == 3
+    with open(output_path, "rb") as f:
+        assert f.read().split(b"\n", 1)[1] == RAW_ROWS
+
+
+def test_download_is_served_from_cache(http_server, tmp_path):
+    http_server.files["/heart.data"] = RAW_ROWS
+
+    _download(http_server, tmp_path, sha256=RAW_SHA256)
+    os.remove(tmp_path / "raw" / "heart_disease.csv")
+    _download(http_server, tmp_path, sha256=RAW_SHA256)
+
+    assert http_server.hits("/heart.data") == 1
+    assert os.path.exists(tmp_path / "cache" / "objects" / RAW_SHA256[:2] / RAW_SHA256)
+
+
+def test_url_keyed_cache_is_revalidated(http_server, tmp_path):
+    http_server.files["/heart.data"] = RAW_ROWS
+    _download(http_server, tmp_path)
+    _download(http_server, tmp_path)
+
+    # The unchanged file is confirmed with a conditional request, not re-sent
+    etag = http_server.requests[0][1].get("If-None-Match")
+    assert etag is None and http_server.requests[1][1].get("If-None-Match")
+
+    updated = RAW_ROWS + b"41.0,0.0,2.0,130.0,204.0,0.0,2.0,172.0,0.0,1.4,1.0,0.0,3.0,0\n"
+    http_server.files["/heart.data"] = updated
+    output_path = _download(http_server, tmp_path)
+
+    assert pd.read_csv(output_path).shape[0] == 4
+    assert os.path.exists(download_data.DownloadCache(str(tmp_path / "cache")).object_path(
+        hashlib.sha256(updated).hexdigest()
+    ))
+
+
+def test_unreachable_server_falls_back_to_revalidated_copy(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(download_data.time, "sleep", lambda _: None)
+    http_server.files["/heart.data"] = RAW_ROWS
+    _download(http_server, tmp_path)
+    http_server.failures["/heart.data"] = 10
+
+    output_path = _download(http_server, tmp_path)
+
+    assert pd.read_csv(output_path).shape[0] == 3
+
+
+def test_checksum_mismatch_is_rejected(http_server, tmp_path):
+    http_server.files["/heart.data"] = RAW_ROWS
+
+    with pytest.raises(download_data.ChecksumError):
+        _download(http_server, tmp_path, sha256="0" * 64)
+
+    assert not os.path.exists(tmp_path / "raw" / "heart_disease.csv")
+    assert not os.path.exists(tmp_path / "cache" / "objects")
+
+
+def test_truncated_download_resumes_with_range(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(download_data.time, "sleep", lambda _: None)
+    http_server.files["/heart.data"] = RAW_ROWS
+    http_server.truncate["/heart.data"] = 40
+
+    output_path = _download(http_server, tmp_path, sha256=RAW_SHA256)
+
+    ranges = [headers.get("Range") for _, headers in http_server.requests]
+    assert ranges == [None, "bytes=40-"]
+    assert pd.read_csv(output_path).shape[0] == 3
+
+
+def test_resume_is_conditional_on_the_partial_copy_being_current(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(download_data.time, "sleep", lambda _: None)
+    http_server.files["/heart.data"] = b"0,0,0\n" * 20
+    http_server.truncate["/heart.data"] = 40
+    cache = download_data.DownloadCache(str(tmp_path / "cache"))
+    with pytest.raises(download_data.DownloadError):
+        download_data.fetch(http_server.url("/heart.data"), cache=cache, retries=0)
+
+    # The file changes before the resume; If-Range gets the whole new version
+    http_server.files["/heart.data"] = RAW_ROWS
+    path = download_data.fetch(http_server.url("/heart.data"), cache=cache, retries=0)
+
+    resume = http_server.requests[-1][1]
+    assert resume.get("Range") == "bytes=40-" and resume.get("If-Range")
+    with open(path, "rb") as f:
+        assert f.read() == RAW_ROWS
+
+
+def test_transient_errors_are_retried(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(download_data.time, "sleep", lambda _: None)
+    http_server.files["/heart.data"] = RAW_ROWS
+    http_server.failures["/heart.data"] = 2
+
+    _download(http_server, tmp_path, sha256=RAW_SHA256)
+
+    assert http_server.hits("/heart.data") == 3
+
+
+def test_mirror_is_preferred_and_primary_is_fallback(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(download_data.time, "sleep", lambda _: None)
+    http_server.files["/primary.data"] = RAW_ROWS
+    http_server.files["/mirror.data"] = RAW_ROWS
+
+    _download(http_server, tmp_path, path="/primary.data", mirror_url=http_server.url("/mirror.data"))
+    assert http_server.hits("/mirror.data") == 1
+    assert http_server.hits("/primary.data") == 0
+
+    # A missing mirror is not retried; the primary URL is used instead
+    monkeypatch.setenv(download_data.MIRROR_ENV_VAR, http_server.url("/missing.data"))
+    _download(http_server, tmp_path / "other", path="/primary.data")
+    assert http_server.hits("/missing.data") == 1
+    assert http_server.hits("/primary.data") == 1
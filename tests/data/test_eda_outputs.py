@@ -1,6 +1,7 @@
 import os
 import tempfile
 
+import numpy as np
 import pandas as pd
 
 from src.data import eda
@@ -38,3 +39,73 @@ def test_eda_outputs():
     assert "class_balance.png" in files
     assert "feature_histograms.png" in files
     assert "correlation_heatmap.png" in files
+
+
+def _random_frame(n_rows=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "age": rng.uniform(30, 80, n_rows),
+            "chol": rng.normal(240, 40, n_rows) + 1e4,
+            "oldpeak": rng.uniform(0, 5, n_rows),
+            "cp": rng.integers(1, 5, n_rows).astype(float),
+            "target": rng.integers(0, 2, n_rows),
+        }
+    )
+    df.loc[rng.random(n_rows) < 0.1, "chol"] = np.nan
+    df.loc[rng.random(n_rows) < 0.05, "oldpeak"] = np.nan
+    return df
+
+
+def test_streaming_correlation_matches_pandas():
+    df = _random_frame()
+    stats = eda.compute_eda_stats(df, "target", chunksize=97)
+
+    pd.testing.assert_frame_equal(stats.correlation(), df.corr(), atol=1e-10)
+
+
+def test_streaming_counts_and_histograms():
+    df = _random_frame()
+    stats = eda.compute_eda_stats(df, "target", chunksize=128)
+
+    assert stats.n_rows == len(df)
+    assert stats.class_counts.to_dict() == df["target"].value_counts().to_dict()
+
+    # Edges span the observed values, not the schema's 1-120 domain
+    counts, edges = stats.histogram("age")
+    assert len(counts) == eda.HISTOGRAM_BINS and len(edges) == eda.HISTOGRAM_BINS + 1
+    assert (edges[0], edges[-1]) == (df["age"].min(), df["age"].max())
+    expected, _ = np.histogram(df["age"], bins=edges)
+    np.testing.assert_array_equal(counts, expected)
+    cp_counts, cp_edges = stats.histogram("cp")
+    assert (cp_edges[0], cp_edges[-1]) == (0.5, 4.5)
+    assert (cp_counts > 0).sum() == 4
+
+    # The domain still clamps the edges: out-of-domain values land in the
+    # outer bins, NaNs are skipped
+    chol_counts, chol_edges = stats.histogram("chol")
+    assert chol_edges[-1] <= 1000.5
+    assert chol_counts.sum() == chol_counts[-1] == df["chol"].notna().sum()
+
+
+def test_histogram_edges_follow_the_data_across_chunks():
+    df = _random_frame()
+    df.loc[900:, "age"] += 10
+
+    stats = eda.compute_eda_stats(df, "target", chunksize=100)
+
+    counts, edges = stats.histogram("age")
+    assert edges[-1] == df["age"].max() > 80
+    expected, _ = np.histogram(df["age"], bins=edges)
+    np.testing.assert_array_equal(counts, expected)
+
+
+def test_render_eda_figures_in_parallel(tmp_path):
+    stats = eda.compute_eda_stats(_random_frame(), "target")
+
+    paths = eda.render_eda_figures(stats, str(tmp_path), max_workers=3)
+
+    assert sorted(os.path.basename(p) for p in paths) == sorted(
+        ["class_balance.png", "feature_histograms.png", "correlation_heatmap.png"]
+    )
+    assert all(os.path.getsize(p) > 0 for p in paths)
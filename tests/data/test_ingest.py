@@ -0,0 +1,93 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.data import download_data
+from src.data.ingest import MANIFEST_FILE, ingest_sources
+from src.data.schema import EXPECTED_COLUMNS, SOURCE_COLUMN
+
+NUMERIC = ["age", "trestbps", "chol", "thalach", "oldpeak", "ca"]
+
+SOURCES = {
+    "cleveland": (
+        b"63.0,1.0,1.0,145.0,233.0,1.0,2.0,150.0,0.0,2.3,3.0,0.0,6.0,0\n"
+        b"67.0,1.0,4.0,160.0,286.0,0.0,2.0,108.0,1.0,1.5,2.0,3.0,3.0,2\n"
+    ),
+    "hungarian": (
+        b"28,1,2,130,132,0,2,185,0,0,?,?,?,0\n"
+        b"29,1,2,120,243,0,0,160,0,0,?,?,?,0\n"
+        b"30,0,1,170,237,0,1,170,0,0,?,?,6,0\n"
+    ),
+    # Switzerland records every cholesterol value as 0
+    "switzerland": b"32,1,1,95,0,?,0,127,0,.7,1,?,?,1\n34,1,4,115,0,?,?,154,0,.2,1,?,?,1\n",
+}
+
+
+def _run(http_server, tmp_path, sources):
+    raw_paths = download_data.download_sources(
+        sources, output_dir=str(tmp_path / "raw"), cache_dir=str(tmp_path / "cache")
+    )
+    summary = ingest_sources(
+        raw_paths,
+        str(tmp_path / "processed" / "heart.csv"),
+        partitions_dir=str(tmp_path / "processed" / "sources"),
+        numeric_cols=NUMERIC,
+    )
+    return summary, pd.read_csv(tmp_path / "processed" / "heart.csv")
+
+
+def test_sources_are_fetched_normalized_and_tagged(http_server, tmp_path):
+    for name, body in SOURCES.items():
+        http_server.files[f"/{name}.data"] = body
+
+    summary, df = _run(http_server, tmp_path, {name: http_server.url(f"/{name}.data") for name in SOURCES})
+
+    assert list(df.columns) == EXPECTED_COLUMNS + [SOURCE_COLUMN]
+    assert df[SOURCE_COLUMN].tolist() == ["cleveland"] * 2 + ["hungarian"] * 3 + ["switzerland"] * 2
+    assert {entry["status"] for entry in summary.values()} == {"processed"}
+    # Zero cholesterol is missing, then imputed with the median over all sources
+    assert (df["chol"] > 0).all()
+    assert df.loc[df[SOURCE_COLUMN] == "switzerland", "chol"].eq(df["chol"].iloc[:5].median()).all()
+    assert df[NUMERIC].notna().all().all()
+    # Categorical gaps are left for the feature pipeline's imputer
+    assert df.loc[df[SOURCE_COLUMN] == "hungarian", "slope"].isna().all()
+
+
+def test_only_changed_sources_are_reprocessed(http_server, tmp_path):
+    for name, body in SOURCES.items():
+        http_server.files[f"/{name}.data"] = body
+    sources = {name: {"url": http_server.url(f"/{name}.data")} for name in SOURCES}
+    _run(http_server, tmp_path, sources)
+
+    updated = SOURCES["hungarian"] + b"31,0,2,100,219,0,1,150,0,0,?,?,?,0\n"
+    http_server.files["/hungarian.data"] = updated
+    summary, df = _run(http_server, tmp_path, sources)
+
+    assert {name: entry["status"] for name, entry in summary.items()} == {
+        "cleveland": "unchanged",
+        "hungarian": "processed",
+        "switzerland": "unchanged",
+    }
+    # Unchanged sources are revalidated (304) rather than downloaded again
+    assert http_server.hits("/cleveland.data") == 2
+    assert http_server.hits("/hungarian.data") == 2
+    assert (df[SOURCE_COLUMN] == "hungarian").sum() == 4
+    with open(tmp_path / "processed" / "sources" / MANIFEST_FILE) as f:
+        assert json.load(f)["hungarian"] == {"sha256": summary["hungarian"]["sha256"], "rows": 4}
+
+
+def test_failed_sources_are_reported_together(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(download_data.time, "sleep", lambda _: None)
+    http_server.files["/cleveland.data"] = SOURCES["cleveland"]
+
+    with pytest.raises(download_data.DownloadError) as excinfo:
+        download_data.download_sources(
+            {name: http_server.url(f"/{name}.data") for name in ("cleveland", "va", "hungarian")},
+            output_dir=str(tmp_path / "raw"),
+            cache_dir=str(tmp_path / "cache"),
+        )
+
+    message = str(excinfo.value)
+    assert "va:" in message and "hungarian:" in message and "cleveland:" not in message
+    assert (tmp_path / "raw" / "cleveland.csv").exists()
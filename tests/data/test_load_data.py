@@ -1,8 +1,12 @@
+import os
+import sys
 import tempfile
 
 import pandas as pd
 
-from src.data.load_data import load_raw_data
+from src.data import load_data
+from src.data.load_data import (load_processed_data, load_raw_data,
+                                parquet_path_for, save_processed_data)
 from src.data.schema import EXPECTED_COLUMNS
 
 
@@ -17,3 +21,60 @@ def test_load_raw_data(tmp_path):
     df = load_raw_data(file)
     assert list(df.columns) == EXPECTED_COLUMNS
     assert df.shape[0] == 1
+
+
+def test_load_raw_data_uses_compact_dtypes(tmp_path):
+    """
+    Measurements load as float32, complete category codes as int8 and
+    missing markers as NaN
+    """
+    file = tmp_path / "heart.csv"
+    file.write_text(
+        ",".join(EXPECTED_COLUMNS)
+        + "\n63,1,1,145,233,1,2,150,0,2.3,3,0,6,0\n67,1,4,160,286,0,2,108,1,1.5,2,?,3,2\n"
+    )
+    df = load_raw_data(file)
+    assert df["age"].dtype == "float32"
+    assert df["cp"].dtype == "int8"
+    assert df["ca"].dtype == "float32"
+    assert df["ca"].isnull().sum() == 1
+
+    subset = load_raw_data(file, usecols=["age", "target"])
+    assert list(subset.columns) == ["age", "target"]
+
+
+def test_processed_data_prefers_fresh_parquet(tmp_path):
+    """
+    save_processed_data writes a Parquet copy that load_processed_data picks
+    up, falling back to the CSV once the Parquet copy is stale
+    """
+    path = tmp_path / "clean.csv"
+    df = pd.DataFrame(
+        [[60, 1, 3, 120, 240, 0, 1, 150, 0, 2.3, 2, 0, 2, 1]], columns=EXPECTED_COLUMNS
+    ).astype("float64")
+    save_processed_data(df, str(path))
+
+    assert os.path.exists(parquet_path_for(str(path)))
+    loaded = load_processed_data(str(path))
+    assert loaded["thal"].dtype == "int8"
+    assert loaded["chol"].dtype == "float32"
+
+    os.utime(parquet_path_for(str(path)), (0, 0))
+    path.write_text(path.read_text().replace("240", "250"))
+    assert load_processed_data(str(path))["chol"].iloc[0] == 250
+
+
+def test_missing_pyarrow_falls_back_with_a_warning(tmp_path, monkeypatch, caplog):
+    """
+    Without pyarrow, processed data is written as CSV only and a warning
+    says so
+    """
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    load_data._has_pyarrow.cache_clear()
+    try:
+        path = str(tmp_path / "clean.csv")
+        save_processed_data(pd.DataFrame([[60, 1]], columns=["age", "target"]), path)
+        assert not os.path.exists(parquet_path_for(path))
+        assert "pyarrow is not installed" in caplog.text
+    finally:
+        load_data._has_pyarrow.cache_clear()
@@ -1,8 +1,9 @@
 import numpy as np
 import pandas as pd
 
-from src.data.preprocess import (clean_data, encode_categorical,
-                                 impute_missing, preprocess_pipeline)
+from src.data.preprocess import (clean_csv_in_chunks, clean_data,
+                                 encode_categorical, impute_missing,
+                                 preprocess_pipeline)
 
 
 def test_clean_data_replaces_missing():
@@ -62,3 +63,43 @@ def test_preprocess_pipeline_runs():
     )
     assert "target" in processed.columns
     assert processed.shape[0] == 2
+
+
+def test_preprocess_pipeline_leaves_the_input_frame_unchanged():
+    """
+    Imputation writes to the pipeline's own frame, even when every column
+    is already numeric
+    """
+    df = pd.DataFrame({"age": [60.0, np.nan, 50.0], "chol": [240.0, 250.0, np.nan], "target": [1, 0, 1]})
+    original = df.copy()
+
+    processed = preprocess_pipeline(df, [], ["age", "chol"])
+
+    pd.testing.assert_frame_equal(df, original)
+    assert processed[["age", "chol"]].notna().all().all()
+
+
+def test_clean_data_keeps_numeric_columns_without_copy():
+    """
+    Already-numeric columns are passed through as-is rather than rebuilt
+    """
+    df = pd.DataFrame({"age": [60.0, 55.0], "ca": ["0", "?"]})
+    cleaned = clean_data(df)
+    assert np.shares_memory(cleaned["age"].to_numpy(), df["age"].to_numpy())
+    assert cleaned["ca"].isnull().tolist() == [False, True]
+    assert df["ca"].tolist() == ["0", "?"]
+
+
+def test_clean_csv_in_chunks_matches_full_clean(tmp_path):
+    """
+    Chunked cleaning yields the same rows as cleaning the whole file at once
+    """
+    src = tmp_path / "raw.csv"
+    dst = tmp_path / "clean.csv"
+    src.write_text("age,ca,thal\n60,0,3\n55,?,7\n41,1,?\n38,NA,6\n")
+
+    n_rows = clean_csv_in_chunks(str(src), str(dst), chunksize=3)
+
+    expected = clean_data(pd.read_csv(src))
+    assert n_rows == 4
+    pd.testing.assert_frame_equal(pd.read_csv(dst), expected, check_dtype=False)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from src.data.schema import (EXPECTED_COLUMNS, FEATURE_COLUMNS, ColumnSpec,
+                             SchemaValidator)
+
+
+def _valid_frame():
+    return pd.DataFrame(
+        [
+            [63, 1, 1, 145, 233, 1, 2, 150, 0, 2.3, 3, 0, 6, 0],
+            [67, 1, 4, 160, 286, 0, 2, 108, 1, 1.5, 2, 3, 3, 2],
+        ],
+        columns=EXPECTED_COLUMNS,
+    )
+
+
+def test_valid_frame_has_no_violations():
+    """
+    A frame within every declared domain passes validation
+    """
+    report = SchemaValidator().validate_frame(_valid_frame())
+    assert report.valid
+    assert not report.invalid_rows.any()
+
+
+def test_range_and_category_violations_are_reported():
+    """
+    Out-of-range values and unknown category codes produce structured violations
+    """
+    df = _valid_frame()
+    df.loc[0, "age"] = 250
+    df.loc[1, "thal"] = 5
+    df.loc[1, "cp"] = 1.5
+
+    report = SchemaValidator().validate_frame(df)
+    found = {(v.column, v.rule): v.rows for v in report.violations}
+
+    assert found[("age", "above_max")] == [0]
+    assert found[("thal", "not_allowed")] == [1]
+    assert found[("cp", "not_allowed")] == [1]
+    assert report.invalid_rows.tolist() == [True, True]
+
+
+def test_missing_and_non_numeric_columns():
+    """
+    Absent columns and string columns are flagged, nulls only where not nullable
+    """
+    df = _valid_frame().drop(columns=["chol"])
+    df["ca"] = ["0", "?"]
+    df.loc[0, "target"] = np.nan
+
+    report = SchemaValidator().validate_frame(df).to_dict()
+    rules = {(v["column"], v["rule"]) for v in report["violations"]}
+
+    assert ("chol", "missing_column") in rules
+    assert ("ca", "not_numeric") in rules
+    assert ("target", "null") in rules
+
+
+def test_validate_records_parses_json_rows():
+    """
+    Records are parsed into one array; bad values are NaN and reported
+    """
+    validator = SchemaValidator(
+        [ColumnSpec("age", "float32", min_value=1, max_value=120), ColumnSpec("sex", "int8", allowed=(0, 1))]
+    )
+    X, report = validator.validate_records(
+        [{"age": 60, "sex": 1}, {"age": "old", "sex": 0}, {"sex": 3}],
+        columns=["age", "sex"],
+    )
+
+    assert X.shape == (3, 2)
+    assert np.isnan(X[1, 0]) and np.isnan(X[2, 0])
+    assert report.invalid_rows.tolist() == [False, True, True]
+    assert {(v.column, v.rule) for v in report.violations} == {("age", "not_numeric"), ("sex", "not_allowed")}
+    assert FEATURE_COLUMNS == EXPECTED_COLUMNS[:-1]
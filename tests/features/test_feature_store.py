@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+
+from src.features.feature_store import (FeatureStore, hash_frame,
+                                        materialize_training_features)
+
+
+def test_store_roundtrip_is_memory_mapped(tmp_path):
+    """
+    Saved arrays come back memory-mapped with their metadata
+    """
+    store = FeatureStore(str(tmp_path))
+    X = np.arange(12, dtype=np.float32).reshape(4, 3)
+    store.save("abc", {"X": X}, {"feature_names": ["a", "b", "c"]})
+
+    arrays, metadata, pipeline = store.load("abc")
+    assert isinstance(arrays["X"], np.memmap)
+    np.testing.assert_array_equal(arrays["X"], X)
+    assert metadata["feature_names"] == ["a", "b", "c"]
+    assert metadata["arrays"]["X"]["dtype"] == "float32"
+    assert pipeline is None
+
+
+def test_materialize_training_features_caches_by_data_and_config(tmp_path, monkeypatch, heart_frame):
+    """
+    The second call with the same data and config is served from the store;
+    changing the data produces a new entry
+    """
+    store = FeatureStore(str(tmp_path))
+    X_train, X_test = heart_frame(40, seed=1), heart_frame(10, seed=2)
+    y_train = pd.Series(np.arange(40) % 2, name="target")
+    y_test = pd.Series(np.arange(10) % 2, name="target")
+    args = (["age", "trestbps", "chol", "thalach"], ["sex", "cp"])
+
+    first = materialize_training_features(X_train, y_train, X_test, y_test, *args, store=store)
+    assert first.X_train.dtype == np.float32
+    assert first.X_train.shape[0] == 40
+    assert len(first.feature_names) == first.X_train.shape[1]
+    np.testing.assert_allclose(first.pipeline.transform(X_test), first.X_test)
+
+    saves = []
+    monkeypatch.setattr(store, "save", lambda *a, **k: saves.append(a))
+    second = materialize_training_features(X_train, y_train, X_test, y_test, *args, store=store)
+    assert saves == []
+    assert second.key == first.key
+
+    X_train.loc[0, "age"] += 1
+    assert hash_frame(X_train) != hash_frame(heart_frame(40, seed=1))
+
+
+def test_fold_features_are_fit_on_each_folds_training_rows(tmp_path, heart_frame):
+    """
+    Every CV fold gets its own entry whose pipeline saw only the fold's
+    training rows, so validation rows do not shape the scaler
+    """
+    store = FeatureStore(str(tmp_path))
+    X_train, X_test = heart_frame(60, seed=3), heart_frame(10, seed=4)
+    y_train = pd.Series(np.arange(60) % 2, name="target")
+    y_test = pd.Series(np.arange(10) % 2, name="target")
+    splits = list(StratifiedKFold(n_splits=3, shuffle=True, random_state=0).split(X_train, y_train))
+    args = (["age", "trestbps", "chol", "thalach"], ["sex", "cp"])
+
+    features = materialize_training_features(X_train, y_train, X_test, y_test, *args, store=store, splits=splits)
+
+    assert len({fold.key for fold in features.folds} | {features.key}) == 4
+    for fold, (train_index, valid_index) in zip(features.folds, splits):
+        np.testing.assert_array_equal(fold.valid_index, valid_index)
+        np.testing.assert_allclose(fold.X_train[:, 0].mean(), 0, atol=1e-5)
+        np.testing.assert_allclose(fold.pipeline.transform(X_train.iloc[valid_index]), fold.X_valid)
+        assert abs(fold.X_valid[:, 0].mean()) > 1e-3
+
+
+def test_prune_removes_stale_entries_only(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    for key in ("old", "current"):
+        store.save(key, {"X": np.zeros((2, 2))}, {})
+    os.makedirs(tmp_path / ".current-inflight")
+
+    assert store.prune(keep=["current"]) == ["old"]
+    assert store.exists("current") and not store.exists("old")
+    assert os.path.isdir(tmp_path / ".current-inflight")
@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 
@@ -100,3 +101,53 @@ def test_feature_engineering_pipeline_runs_end_to_end():
 
     # Row count preserved
     assert processed.shape[0] == df.shape[0]
+
+
+def test_create_features_shares_input_columns():
+    """
+    Engineered columns are added without copying or mutating the input
+    """
+    df = pd.DataFrame(
+        {
+            "age": np.array([60, 55], dtype=np.float32),
+            "thalach": np.array([150, 160], dtype=np.float32),
+            "chol": np.array([240, 250], dtype=np.float32),
+            "trestbps": np.array([120, 130], dtype=np.float32),
+        }
+    )
+    engineered = create_features(df)
+
+    assert np.shares_memory(engineered["age"].to_numpy(), df["age"].to_numpy())
+    assert engineered["age_thalach_ratio"].dtype == np.float32
+    assert "age_thalach_ratio" not in df.columns
+
+
+def test_feature_engineering_pipeline_lean_outputs():
+    """
+    float32 dense and sparse array outputs from the allocation-lean path
+    """
+    df = pd.DataFrame(
+        {
+            "age": [60, 55, 41],
+            "sex": [1, 0, 1],
+            "cp": [3, 2, 1],
+            "trestbps": [120, 130, 110],
+            "chol": [240, 250, 200],
+            "thalach": [150, 160, 170],
+        }
+    )
+    numeric_cols = ["age", "trestbps", "chol", "thalach"]
+    categorical_cols = ["sex", "cp"]
+
+    dense = feature_engineering_pipeline(
+        df, numeric_cols, categorical_cols, dtype=np.float32, as_frame=False
+    )
+    sparse = feature_engineering_pipeline(
+        df, numeric_cols, categorical_cols, dtype=np.float32, sparse=True, as_frame=False
+    )
+    reference = feature_engineering_pipeline(df, numeric_cols, categorical_cols)
+
+    assert isinstance(dense, np.ndarray) and dense.dtype == np.float32
+    assert sp.issparse(sparse) and sparse.dtype == np.float32
+    np.testing.assert_allclose(sparse.toarray(), reference.to_numpy(), rtol=1e-6)
+    np.testing.assert_allclose(dense, reference.to_numpy(), rtol=1e-6)
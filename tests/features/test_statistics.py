@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from src.features.feature_pipeline import build_feature_pipeline
+from src.features.statistics import (feature_statistics, merge_statistics,
+                                     new_categories, refresh_feature_pipeline)
+
+NUMERIC = ["age", "trestbps", "chol", "thalach"]
+CATEGORICAL = ["sex", "cp"]
+
+
+def _with_missing_chol(df):
+    df["chol"] = df["chol"].astype(float)
+    df.loc[::17, "chol"] = np.nan
+    return df
+
+
+def test_refreshed_pipeline_matches_a_full_refit(heart_frame):
+    old, new = _with_missing_chol(heart_frame(200, seed=0)), _with_missing_chol(heart_frame(101, seed=1))
+    pipeline = build_feature_pipeline(NUMERIC, CATEGORICAL).fit(old)
+    before = pipeline.transform(new)
+
+    stats = merge_statistics(feature_statistics(pipeline, old), feature_statistics(pipeline, new))
+    scale, shift = refresh_feature_pipeline(pipeline, stats)
+
+    full = build_feature_pipeline(NUMERIC, CATEGORICAL).fit(pd.concat([old, new]))
+    np.testing.assert_allclose(pipeline.transform(new), full.transform(new), atol=1e-12)
+    # Non-missing rows map back to the old outputs
+    after = pipeline.transform(new)
+    n_scaled = len(scale)
+    rows = new["chol"].notna().to_numpy()
+    np.testing.assert_allclose(scale * after[rows, :n_scaled] + shift, before[rows, :n_scaled])
+
+
+def test_new_categories_are_reported_but_not_encoded(heart_frame):
+    old, new = _with_missing_chol(heart_frame(200, n_cp=3)), _with_missing_chol(heart_frame(50, seed=1, n_cp=4))
+    pipeline = build_feature_pipeline(NUMERIC, CATEGORICAL).fit(old)
+    width = pipeline.transform(old).shape[1]
+
+    stats = merge_statistics(feature_statistics(pipeline, old), feature_statistics(pipeline, new))
+    refresh_feature_pipeline(pipeline, stats)
+
+    assert new_categories(stats, pipeline) == {"cp": [4.0]}
+    assert pipeline.transform(new).shape[1] == width
@@ -0,0 +1,92 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.models import predict as predict_module
+from src.models.anytime_forest import AnytimeForest
+
+
+def _forest(n_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, 4))
+    y = (X[:, 0] + 0.3 * rng.normal(size=n_rows) > 0).astype(int)
+    forest = RandomForestClassifier(n_estimators=60, random_state=0).fit(X, y)
+    return forest, X
+
+
+def test_exact_rule_matches_full_forest_predictions():
+    forest, X = _forest()
+    engine = AnytimeForest(forest, batch_size=5, delta=0.0)
+
+    proba, used = engine.predict_proba_anytime(X)
+
+    np.testing.assert_array_equal(proba.argmax(axis=1), forest.predict(X))
+    assert used.max() <= 60 and used.min() >= 5
+    # Rows that needed every tree get exactly the forest's probability
+    full = used == 60
+    np.testing.assert_allclose(proba[full], forest.predict_proba(X)[full], rtol=0, atol=1e-12)
+
+
+def test_statistical_rule_uses_fewer_trees():
+    forest, X = _forest()
+
+    _, exact_used = AnytimeForest(forest, batch_size=5, delta=0.0).predict_proba_anytime(X)
+    proba, used = AnytimeForest(forest, batch_size=5, delta=0.05).predict_proba_anytime(X)
+
+    assert used.mean() < exact_used.mean()
+    assert (proba.argmax(axis=1) == forest.predict(X)).mean() > 0.95
+
+
+def test_expired_deadline_stops_after_one_batch():
+    forest, X = _forest()
+    engine = AnytimeForest(forest, batch_size=5, delta=0.0)
+
+    _, used = engine.predict_proba_anytime(X, deadline=time.perf_counter())
+
+    assert (used == 5).all()
+
+
+def test_multiclass_forest_is_rejected():
+    X = np.arange(30, dtype=float).reshape(-1, 1)
+    forest = RandomForestClassifier(n_estimators=3).fit(X, np.arange(30) % 3)
+    with pytest.raises(ValueError):
+        AnytimeForest(forest)
+
+
+def test_predict_reports_trees_used(monkeypatch):
+    forest, X = _forest()
+    columns = ["a", "b", "c", "d"]
+    bundle = {
+        "model": forest,
+        "raw_feature_names": columns,
+        "anytime_forest": {"batch_size": 10, "delta": 0.01, "budget_ms": 1000},
+    }
+    monkeypatch.setattr(predict_module, "get_bundle", lambda: bundle)
+    record = dict(zip(columns, X[0]))
+
+    single = predict_module.predict(record)
+    batch = predict_module.predict_batch([record])
+
+    assert 10 <= single["trees_used"] <= 60
+    assert single["prediction"] == forest.predict(pd.DataFrame([record]).to_numpy())[0]
+    assert batch["predictions"][0] == single
+
+
+def test_small_batches_without_budget_use_the_packed_forest(monkeypatch):
+    forest, X = _forest()
+    columns = ["a", "b", "c", "d"]
+    bundle = {
+        "model": forest,
+        "raw_feature_names": columns,
+        "anytime_forest": {"batch_size": 10, "delta": 0.01, "budget_ms": None},
+    }
+    monkeypatch.setattr(predict_module, "get_bundle", lambda: bundle)
+    monkeypatch.setattr(AnytimeForest, "predict_proba_anytime", lambda *a, **k: pytest.fail("anytime path used"))
+
+    result = predict_module.predict(dict(zip(columns, X[0])))
+
+    assert "trees_used" not in result
+    assert result["prediction"] == forest.predict(X[:1])[0]
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import (StratifiedKFold, cross_val_predict,
+                                     cross_validate)
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from src.models import predict as predict_module
+from src.models import train as train_module
+from src.models.cascade import CascadeClassifier, choose_uncertainty_band
+
+
+def _data(n_rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, 3))
+    y = (X[:, 0] + 0.5 * X[:, 1] ** 2 > 0.3).astype(int)
+    return X, y
+
+
+def test_band_escalates_only_where_the_fast_model_is_unsure():
+    rng = np.random.default_rng(1)
+    y = rng.integers(0, 2, 1000)
+    # Fast model: confident and right on most rows, coin-flip near 0.5
+    fast = np.where(y == 1, 0.9, 0.1)
+    unsure = rng.random(1000) < 0.2
+    fast[unsure] = rng.uniform(0.4, 0.6, unsure.sum())
+    slow = np.where(y == 1, 0.7, 0.3)
+
+    band = choose_uncertainty_band(fast, slow, y, tolerance=0.0)
+
+    assert band["lower"] < 0.5 < band["upper"]
+    assert band["escalation_rate"] <= unsure.mean() + 1e-9
+    assert band["accuracy"] >= band["target_accuracy"]
+    escalated = (fast > band["lower"]) & (fast < band["upper"])
+    assert escalated.mean() == band["escalation_rate"]
+
+
+def test_no_band_when_the_fast_model_is_already_better():
+    rng = np.random.default_rng(2)
+    y = rng.integers(0, 2, 500)
+    fast = np.where(y == 1, 0.8, 0.2)
+    slow = rng.random(500)
+
+    band = choose_uncertainty_band(fast, slow, y)
+
+    assert (band["lower"], band["upper"]) == (0.5, 0.5)
+    assert band["escalation_rate"] == 0.0
+
+
+def test_cascade_routes_rows_by_fast_confidence():
+    X, y = _data()
+    cascade = CascadeClassifier(
+        fast=LogisticRegression(),
+        slow=RandomForestClassifier(n_estimators=20, random_state=0),
+        lower=0.3,
+        upper=0.7,
+    ).fit(X, y)
+
+    proba, escalated = cascade.predict_proba_with_escalation(X)
+    fast_proba = cascade.fast_.predict_proba(X)
+    expected_mask = (fast_proba[:, 1] > 0.3) & (fast_proba[:, 1] < 0.7)
+
+    np.testing.assert_array_equal(escalated, expected_mask)
+    np.testing.assert_array_equal(proba[~escalated], fast_proba[~escalated])
+    np.testing.assert_array_equal(proba[escalated], cascade.slow_.predict_proba(X[escalated]))
+    np.testing.assert_array_equal(cascade.predict(X), proba.argmax(axis=1))
+
+    no_band = CascadeClassifier(LogisticRegression(), DummyClassifier()).fit(X, y)
+    assert not no_band.predict_proba_with_escalation(X)[1].any()
+
+
+def test_predict_reports_escalation_for_cascade_bundles(monkeypatch):
+    X, y = _data()
+    columns = ["a", "b", "c"]
+    model = Pipeline(
+        [
+            ("features", StandardScaler()),
+            ("model", CascadeClassifier(LogisticRegression(), DummyClassifier(), lower=0.0, upper=1.0)),
+        ]
+    ).fit(pd.DataFrame(X, columns=columns), y)
+    monkeypatch.setattr(
+        predict_module, "get_bundle", lambda: {"model": model, "raw_feature_names": columns}
+    )
+
+    single = predict_module.predict({"a": 0.1, "b": 0.2, "c": 0.3})
+    batch = predict_module.predict_batch([{"a": 0.1, "b": 0.2, "c": 0.3}])
+
+    assert single["escalated"] is True
+    assert batch["predictions"][0] == single
+
+
+def test_cascade_band_reuses_the_cv_fold_estimators(monkeypatch):
+    X, y = _data()
+    X = pd.DataFrame(X, columns=["a", "b", "c"])
+    cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=0)
+    models = {"fast": LogisticRegression(), "slow": RandomForestClassifier(n_estimators=20, random_state=0)}
+    folds = {
+        name: cross_validate(model, X, y, cv=cv, return_estimator=True)["estimator"] for name, model in models.items()
+    }
+    expected = {
+        name: cross_val_predict(model, X, y, cv=cv, method="predict_proba")[:, 1] for name, model in models.items()
+    }
+
+    captured = {}
+
+    def fake_band(fast, slow, y_true, tolerance):
+        captured.update(fast=fast, slow=slow)
+        return {"lower": 0.4, "upper": 0.6}
+
+    monkeypatch.setattr(train_module, "choose_uncertainty_band", fake_band)
+    monkeypatch.setattr(RandomForestClassifier, "fit", lambda *a, **k: pytest.fail("refit"))
+    band = train_module.select_cascade_band(folds, X, y, cv, "fast", "slow", tolerance=0.01)
+
+    np.testing.assert_allclose(captured["fast"], expected["fast"])
+    np.testing.assert_allclose(captured["slow"], expected["slow"])
+    assert 0.5 < band["cv_roc_auc"] <= 1.0
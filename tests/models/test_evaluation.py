@@ -0,0 +1,63 @@
+import numpy as np
+from sklearn.metrics import (accuracy_score, f1_score, precision_score,
+                             recall_score, roc_auc_score, roc_curve)
+
+from src.models import evaluation
+from src.models.evaluation import (SortedScores, bootstrap_metrics,
+                                   evaluate_scores, evaluation_metrics,
+                                   write_evaluation_report)
+
+
+def _scores(n_rows=500):
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, n_rows)
+    # Rounded so that scores tie, including at the 0.5 threshold
+    return y, np.round(np.clip(rng.normal(0.35 + 0.3 * y, 0.2), 0, 1), 2)
+
+
+def test_point_metrics_and_sweep_match_sklearn():
+    y, scores = _scores()
+
+    result = evaluate_scores(y, scores, n_bootstrap=0)
+
+    predicted = scores > 0.5
+    assert np.isclose(result["metrics"]["accuracy"], accuracy_score(y, predicted))
+    assert np.isclose(result["metrics"]["precision"], precision_score(y, predicted))
+    assert np.isclose(result["metrics"]["recall"], recall_score(y, predicted))
+    assert np.isclose(result["metrics"]["f1"], f1_score(y, predicted))
+    assert np.isclose(result["metrics"]["roc_auc"], roc_auc_score(y, scores))
+    fpr, tpr, thresholds = roc_curve(y, scores, drop_intermediate=False)
+    np.testing.assert_allclose(result["sweep"]["threshold"], thresholds[1:])
+    np.testing.assert_allclose(result["sweep"]["fpr"], fpr[1:])
+    np.testing.assert_allclose(result["sweep"]["recall"], tpr[1:])
+    assert result["intervals"] == {}
+
+
+def test_bootstrap_resamples_match_explicit_resampling(monkeypatch):
+    y, scores = _scores(200)
+    # One resample per chunk exercises the chunking too
+    monkeypatch.setattr(evaluation, "BOOTSTRAP_CHUNK_CELLS", 200)
+
+    samples = bootstrap_metrics(SortedScores(y, scores), 0.5, n_bootstrap=3, seed=7)
+
+    s = SortedScores(y, scores)
+    rng = np.random.default_rng(7)
+    for b in range(3):
+        idx = rng.integers(0, s.n, s.n)
+        assert np.isclose(samples["roc_auc"][b], roc_auc_score(s.y[idx], s.scores[idx]))
+        assert np.isclose(samples["accuracy"][b], accuracy_score(s.y[idx], s.scores[idx] > 0.5))
+
+
+def test_intervals_cover_point_estimate_and_are_logged(tmp_path):
+    y, scores = _scores()
+
+    result = evaluate_scores(y, scores, n_bootstrap=200, seed=1)
+
+    for metric, (low, high) in result["intervals"].items():
+        assert low <= result["metrics"][metric] <= high
+    metrics = evaluation_metrics(result)
+    assert metrics["test_roc_auc"] == result["metrics"]["roc_auc"]
+    assert metrics["test_roc_auc_ci_low"] == result["intervals"]["roc_auc"][0]
+    write_evaluation_report(result, tmp_path / "report.txt", tmp_path / "sweep.csv")
+    assert "95% CI" in (tmp_path / "report.txt").read_text()
+    assert (tmp_path / "sweep.csv").exists()
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from src.features.feature_pipeline import build_feature_pipeline, feature_groups
+from src.models.feature_importance import (evaluate_reduced_variants,
+                                           permutation_importance,
+                                           reduced_feature_sets)
+
+NUMERIC = ["age", "trestbps", "chol", "thalach"]
+CATEGORICAL = ["cp", "sex"]
+
+
+def _data(n_rows=400):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(
+        {
+            "age": rng.normal(55, 9, n_rows),
+            "trestbps": rng.normal(130, 15, n_rows),
+            "chol": rng.normal(240, 40, n_rows),
+            "thalach": rng.normal(150, 20, n_rows),
+            "cp": rng.integers(1, 5, n_rows).astype(float),
+            "sex": rng.integers(0, 2, n_rows).astype(float),
+        }
+    )
+    # Only thalach and cp carry signal
+    logit = -(X["thalach"] - 150) / 10 + 1.5 * (X["cp"] == 4) - 0.5
+    y = pd.Series((rng.random(n_rows) < 1 / (1 + np.exp(-logit))).astype(int))
+    return X, y
+
+
+def test_feature_groups_cover_transformed_columns():
+    X, _ = _data()
+    pipeline = build_feature_pipeline(NUMERIC, CATEGORICAL).fit(X)
+
+    groups = feature_groups(pipeline)
+
+    width = pipeline.transform(X).shape[1]
+    assert sorted(i for columns in groups.values() for i in columns) == list(range(width))
+    assert len(groups["cp"]) == 4
+    assert len(groups["age_thalach_ratio"]) == 1
+
+
+def test_permutation_importance_ranks_informative_features_first():
+    X, y = _data()
+    pipeline = build_feature_pipeline(NUMERIC, CATEGORICAL).fit(X)
+    X_features = pipeline.transform(X)
+    model = LogisticRegression().fit(X_features, y)
+
+    importances = permutation_importance(
+        model, X_features, y, feature_groups(pipeline), n_repeats=3, n_jobs=2
+    )
+
+    assert set(importances.index[:2]) <= {"thalach", "cp", "age_thalach_ratio"}
+    assert importances.loc["thalach", "importance_mean"] > importances.loc["chol", "importance_mean"]
+    assert importances.loc["cp", "n_columns"] == 4
+    again = permutation_importance(model, X_features, y, feature_groups(pipeline), n_repeats=3, n_jobs=1)
+    pd.testing.assert_frame_equal(importances, again)
+
+
+def test_reduced_variants_need_fewer_inputs():
+    X, y = _data()
+    importances = pd.DataFrame(
+        {"importance_mean": [0.2, 0.1, 0.05, 0.0, 0.0, -0.01, 0.0, 0.0]},
+        index=["thalach", "cp", "age_thalach_ratio", "age", "sex", "chol", "trestbps", "chol_bp_product"],
+    )
+
+    sets = reduced_feature_sets(importances, keep_top=[3, 2])
+
+    assert list(sets) == ["all", "positive_importance", "top_2"]
+    variants = evaluate_reduced_variants(
+        LogisticRegression(), sets, X[:300], y[:300], X[300:], y[300:], NUMERIC, CATEGORICAL
+    )
+    # age_thalach_ratio still needs age as an input
+    assert variants.loc["positive_importance", "n_inputs"] == 3
+    assert variants.loc["top_2", "n_inputs"] == 2
+    assert variants.loc["top_2", "n_columns"] < variants.loc["all", "n_columns"]
+    assert variants.loc["top_2", "accuracy"] > 0.6
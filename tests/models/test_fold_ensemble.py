@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_validate
+
+from src.features.feature_store import (FeatureStore,
+                                        materialize_training_features)
+from src.models.fold_ensemble import (FoldEnsembleClassifier, expand_inputs,
+                                      warm_start_fit)
+from src.models.train import (cross_validate_folds, fold_models_on_features,
+                              model_from_folds)
+
+
+def _folds(model, n_rows=300):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n_rows, 4))
+    y = (X[:, 0] + 0.5 * rng.normal(size=n_rows) > 0).astype(int)
+    cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=0)
+    return cross_validate(model, X, y, cv=cv, return_estimator=True)["estimator"], X, y
+
+
+def test_fold_ensemble_averages_fold_probabilities():
+    folds, X, _ = _folds(LogisticRegression())
+
+    ensemble = FoldEnsembleClassifier.from_fitted(folds)
+
+    expected = np.mean([fold.predict_proba(X) for fold in folds], axis=0)
+    np.testing.assert_allclose(ensemble.predict_proba(X), expected)
+    np.testing.assert_array_equal(ensemble.predict(X), expected.argmax(axis=1))
+    assert model_from_folds(LogisticRegression(), folds, "fold_ensemble").estimators_ == folds
+
+
+def test_warm_started_forest_reuses_fold_trees():
+    model = RandomForestClassifier(n_estimators=30, random_state=0)
+    folds, X, y = _folds(model)
+
+    forest = warm_start_fit(model, folds, X, y)
+
+    fold_trees = {id(tree) for fold in folds for tree in fold.estimators_}
+    reused = sum(id(tree) in fold_trees for tree in forest.estimators_)
+    assert len(forest.estimators_) == 30 and reused == 20
+    assert not forest.warm_start
+    assert (forest.predict(X) == y).mean() > 0.9
+
+
+def test_warm_started_linear_model_matches_cold_fit():
+    model = LogisticRegression(solver="lbfgs")
+    folds, X, y = _folds(model)
+
+    warm = warm_start_fit(model, folds, X, y)
+
+    cold = LogisticRegression(solver="lbfgs").fit(X, y)
+    np.testing.assert_allclose(warm.coef_, cold.coef_, atol=5e-3)
+    # Starting from the mean fold coefficients leaves little to optimize
+    assert warm.n_iter_[0] < cold.n_iter_[0]
+    assert not warm.warm_start
+
+
+def test_expanded_inputs_ignore_the_added_columns():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(200, 3))
+    y = (X[:, 0] - X[:, 2] > 0).astype(int)
+    X_wide = np.column_stack([X[:, 0], rng.normal(size=200), X[:, 1], rng.normal(size=200), X[:, 2]])
+
+    for model in (LogisticRegression().fit(X, y), RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)):
+        expected = model.predict_proba(X)
+        expanded = expand_inputs(model, [0, 2, 4], 5)
+        np.testing.assert_allclose(expanded.predict_proba(X_wide), expected)
+        assert expanded.n_features_in_ == 5
+
+
+def test_fold_models_on_features_match_their_fold_pipelines(tmp_path):
+    """
+    Fold fits re-expressed on the full training transform predict as their
+    own fold pipelines do, including for a category one fold never saw
+    (forest splits within float32 rounding of an input can still flip)
+    """
+    rng = np.random.default_rng(2)
+    X = pd.DataFrame(
+        {
+            "age": rng.integers(30, 80, 90),
+            "trestbps": rng.integers(100, 180, 90),
+            "chol": rng.integers(150, 350, 90),
+            "thalach": rng.integers(90, 200, 90),
+            "cp": rng.integers(1, 4, 90),
+        }
+    )
+    X.loc[0, "cp"] = 9
+    y = pd.Series((X["thalach"] + rng.normal(0, 20, 90) > 145).astype(int))
+    cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=0)
+    features = materialize_training_features(
+        X, y, X.head(5), y.head(5), ["age", "trestbps", "chol", "thalach"], ["cp"],
+        store=FeatureStore(str(tmp_path)), splits=list(cv.split(X, y)),
+    )
+
+    for model in (LogisticRegression(), RandomForestClassifier(n_estimators=10, random_state=0)):
+        folds = cross_validate_folds(model, features.folds, {"roc_auc": "roc_auc"})["estimator"]
+        aligned = fold_models_on_features(folds, features, X)
+        for fold, fold_model in zip(folds, aligned):
+            after, before = fold_model.predict_proba(features.X_train), fold.predict_proba(X)
+            assert np.abs(after - before).mean() < 0.01
+            np.testing.assert_allclose(after, before, atol=1e-5 if isinstance(model, LogisticRegression) else 0.1)
@@ -0,0 +1,143 @@
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+
+from src.features.feature_pipeline import build_feature_pipeline
+from src.features.statistics import (feature_statistics, merge_statistics,
+                                     refresh_feature_pipeline)
+from src.models import incremental as incremental_module
+from src.models.incremental import (FullRetrainRequired, incremental_retrain,
+                                    rescale_inputs)
+from src.models.quantize import quantize_bundle
+from src.monitoring.drift import build_feature_profile
+
+NUMERIC = ["age", "trestbps", "chol", "thalach"]
+CATEGORICAL = ["sex", "cp"]
+VERSION = "20260101T000000Z"
+
+
+def _publish_bundle(model, df, path):
+    X = df.drop(columns=["target"])
+    features = build_feature_pipeline(NUMERIC, CATEGORICAL, dtype=np.float32).fit(X)
+    model.fit(features.transform(X), df["target"])
+    bundle = {
+        "model": Pipeline(steps=[("features", features), ("model", model)]),
+        "raw_feature_names": list(X.columns),
+        "model_version": VERSION,
+        "feature_profile": build_feature_profile(X),
+        "feature_statistics": feature_statistics(features, X),
+        "lineage": {"base_version": VERSION, "base_rows": len(X), "incremental_updates": 0, "rows_since_full": 0},
+    }
+    joblib.dump(bundle, path)
+    return bundle
+
+
+def _config(tmp_path, **settings):
+    return {
+        "data": {"increments_path": str(tmp_path / "increments")},
+        "preprocessing": {"numerical_features": NUMERIC, "categorical_features": CATEGORICAL},
+        "training": {"incremental": settings},
+    }
+
+
+@pytest.mark.parametrize("model", [LogisticRegression(), RandomForestClassifier(n_estimators=50, random_state=0)])
+def test_rescaled_model_predicts_as_before(model, heart_frame):
+    old, new = heart_frame(300, target=True), heart_frame(150, seed=1, target=True)
+    X_old, X_new = old.drop(columns=["target"]), new.drop(columns=["target"])
+    features = build_feature_pipeline(NUMERIC, CATEGORICAL, dtype=np.float32).fit(X_old)
+    model.fit(features.transform(X_old), old["target"])
+    before = model.predict_proba(features.transform(X_new))
+
+    stats = merge_statistics(feature_statistics(features, X_old), feature_statistics(features, X_new))
+    rescale_inputs(model, *refresh_feature_pipeline(features, stats))
+
+    after = model.predict_proba(features.transform(X_new))
+    # A forest may flip a tree or two on inputs within float32 rounding of a split
+    assert np.abs(after - before).mean() < 0.01
+    np.testing.assert_allclose(after, before, atol=0.05)
+
+
+def test_update_publishes_a_new_version(tmp_path, heart_frame):
+    model_path = tmp_path / "model.pkl"
+    _publish_bundle(LogisticRegression(), heart_frame(400, target=True), model_path)
+    new = heart_frame(40, seed=1, target=True)
+
+    summary = incremental_retrain(new, _config(tmp_path), str(model_path))
+
+    bundle = joblib.load(model_path)
+    assert bundle["model_version"] == summary["version"] != VERSION
+    assert bundle["lineage"]["parent_version"] == VERSION
+    assert bundle["lineage"]["incremental_updates"] == 1 and bundle["lineage"]["rows_since_full"] == 40
+    assert bundle["feature_statistics"]["n_rows"] == 440
+    assert isinstance(bundle["model"].steps[-1][1], SGDClassifier)
+    assert summary["prediction_shift"] < 0.1
+    assert joblib.load(tmp_path / "versions" / f"{VERSION}.pkl")["model_version"] == VERSION
+    stored = pd.read_csv(tmp_path / "increments" / f"{summary['version']}.csv")
+    assert len(stored) == 40
+
+
+def test_forest_grows_trees_on_new_rows(tmp_path, heart_frame):
+    model_path = tmp_path / "model.pkl"
+    _publish_bundle(RandomForestClassifier(n_estimators=50, random_state=0), heart_frame(400, target=True), model_path)
+
+    new = heart_frame(40, seed=1, target=True)
+    incremental_retrain(new, _config(tmp_path, min_new_trees=10, max_trees=55), str(model_path))
+
+    forest = joblib.load(model_path)["model"].steps[-1][1]
+    assert len(forest.estimators_) == forest.n_estimators == 55
+    assert not forest.warm_start
+
+
+def test_guard_refuses_without_publishing(tmp_path, heart_frame):
+    model_path = tmp_path / "model.pkl"
+    _publish_bundle(LogisticRegression(), heart_frame(400, target=True), model_path)
+
+    with pytest.raises(FullRetrainRequired, match="incremental updates"):
+        incremental_retrain(heart_frame(40, seed=1, target=True), _config(tmp_path, max_updates=0), str(model_path))
+
+    assert joblib.load(model_path)["model_version"] == VERSION
+    # The rows are kept for the full retrain
+    assert len(list((tmp_path / "increments").glob("*.csv"))) == 1
+
+
+def test_existing_version_is_not_published_over(tmp_path, monkeypatch, heart_frame):
+    model_path = tmp_path / "model.pkl"
+    _publish_bundle(LogisticRegression(), heart_frame(400, target=True), model_path)
+    config = _config(tmp_path)
+
+    class _FrozenClock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 1, 2, 12, 0, 0, 123456, tzinfo=tz)
+
+    monkeypatch.setattr(incremental_module, "datetime", _FrozenClock)
+    first = incremental_retrain(heart_frame(40, seed=1, target=True), config, str(model_path))
+    assert first["version"] == "20260102T120000123456Z"
+
+    with pytest.raises(FileExistsError):
+        incremental_retrain(heart_frame(40, seed=2, target=True), config, str(model_path))
+
+    assert joblib.load(model_path)["model_version"] == first["version"]
+    assert len(list((tmp_path / "increments").glob("*.csv"))) == 1
+
+
+def test_update_requantizes_the_quantized_copy(tmp_path, heart_frame):
+    model_path = tmp_path / "model.pkl"
+    forest = RandomForestClassifier(n_estimators=20, random_state=0)
+    bundle = _publish_bundle(forest, heart_frame(400, target=True), model_path)
+    joblib.dump(quantize_bundle(bundle, thresholds="float16", value_bits=8), tmp_path / "model_quantized.pkl")
+
+    new = heart_frame(40, seed=1, target=True)
+    summary = incremental_retrain(new, _config(tmp_path, min_new_trees=5), str(model_path))
+
+    quantized = joblib.load(tmp_path / "model_quantized.pkl")
+    assert quantized["model_version"] == summary["version"]
+    assert quantized["quantization"] == {"thresholds": "float16", "value_bits": 8}
+    forest = joblib.load(model_path)["model"].steps[-1][1]
+    assert quantized["model"].steps[-1][1].n_trees == len(forest.estimators_) == 25
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.models import predict as predict_module
+from src.models.packed_forest import PackedForest
+
+
+def _data(n_rows=300, n_classes=2, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, 5))
+    y = np.digitize(X[:, 0] + 0.3 * rng.normal(size=n_rows), np.linspace(-1, 1, n_classes - 1))
+    return X, y
+
+
+def test_probabilities_are_bit_identical():
+    X, y = _data()
+    forest = RandomForestClassifier(n_estimators=40, max_depth=8, random_state=0).fit(X, y)
+    X_new = np.random.default_rng(1).normal(size=(2000, 5))
+
+    np.testing.assert_array_equal(PackedForest(forest).predict_proba(X_new), forest.predict_proba(X_new))
+
+
+def test_chunked_threaded_multiclass_scoring_matches():
+    X, y = _data(n_classes=3)
+    forest = RandomForestClassifier(n_estimators=25, random_state=0).fit(X, y)
+    packed = PackedForest(forest)
+
+    proba = packed.predict_proba(X, n_threads=2, chunk_rows=37)
+
+    np.testing.assert_array_equal(proba, forest.predict_proba(X))
+    np.testing.assert_array_equal(packed.predict(X), forest.predict(X))
+
+
+def test_missing_values_follow_learned_direction():
+    X, y = _data()
+    X[np.random.default_rng(2).random(X.shape) < 0.1] = np.nan
+    forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+
+    np.testing.assert_array_equal(PackedForest(forest).predict_proba(X), forest.predict_proba(X))
+
+
+def test_wrong_feature_count_is_rejected():
+    X, y = _data()
+    packed = PackedForest(RandomForestClassifier(n_estimators=3).fit(X, y))
+    with pytest.raises(ValueError):
+        packed.predict_proba(X[:, :3])
+
+
+def test_small_batches_are_served_from_packed_forest(monkeypatch):
+    X, y = _data()
+    forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+    monkeypatch.setattr(forest, "predict_proba", lambda X: pytest.fail("sklearn path used"))
+    X_small = X[:5]
+
+    results = predict_module.score(forest, X_small)
+
+    expected = RandomForestClassifier.predict_proba(forest, X_small)
+    assert [r["prediction"] for r in results] == list(expected.argmax(axis=1))
+    assert [r["confidence"] for r in results] == list(expected.max(axis=1))
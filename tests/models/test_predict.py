@@ -1,10 +1,15 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 
 from src.features.feature_pipeline import build_feature_pipeline
 from src.models import predict as predict_module
+from src.monitoring.drift import build_feature_profile
 
 
 def test_predict_uses_saved_pipeline(tmp_path, monkeypatch):
@@ -77,3 +82,74 @@ def test_predict_uses_saved_pipeline(tmp_path, monkeypatch):
 
     assert "confidence" in result
     assert result["confidence"] is None or 0.0 <= result["confidence"] <= 1.0
+
+
+def test_predict_feeds_drift_monitor(monkeypatch):
+    class _DummyModel:
+        def predict(self, X):
+            return np.zeros(len(X), dtype=int)
+
+    X = pd.DataFrame({"age": [40.0, 50.0, 60.0, 70.0], "chol": [200.0, 220.0, 240.0, 260.0]})
+    bundle = {
+        "model": _DummyModel(),
+        "raw_feature_names": ["age", "chol"],
+        "feature_profile": build_feature_profile(X),
+    }
+    monkeypatch.setattr(predict_module, "get_bundle", lambda: bundle)
+
+    predict_module.predict({"age": 45.0, "chol": 210.0})
+    predict_module.predict_batch([{"age": 65.0, "chol": 250.0}, {"age": 55.0, "chol": "bad"}])
+
+    monitor = predict_module.get_drift_monitor(bundle)
+    # The invalid batch row is not scored and not counted
+    assert monitor._n == 2
+    monitor.stop()
+
+
+def test_predict_batch_drops_rows_once_deadline_passes(monkeypatch):
+    clock = {"now": 0.0}
+    scored_rows = []
+
+    def fake_score(model, df, anytime=None, deadline=None):
+        scored_rows.append(len(df))
+        clock["now"] += 1.0
+        return [{"prediction": 0, "confidence": None}] * len(df)
+
+    monkeypatch.setattr(predict_module, "get_bundle", lambda: {"model": None, "raw_feature_names": ["age"]})
+    monkeypatch.setattr(predict_module, "score", fake_score)
+    monkeypatch.setattr(predict_module, "DEADLINE_CHUNK_ROWS", 2)
+    monkeypatch.setattr(predict_module.time, "perf_counter", lambda: clock["now"])
+
+    result = predict_module.predict_batch([{"age": 40.0 + i} for i in range(7)], deadline=1.5)
+
+    # Two chunks run before the deadline; the last three rows never reach the model
+    assert scored_rows == [2, 2]
+    assert result["expired_rows"] == [4, 5, 6]
+    assert result["predictions"][4:] == [None] * 3
+    assert "expired_rows" not in predict_module.predict_batch([{"age": 40.0}])
+
+
+def test_concurrent_requests_share_one_drift_monitor(monkeypatch):
+    started = []
+
+    class _Monitor:
+        def __init__(self, profile, interval):
+            time.sleep(0.01)
+            self.profile = profile
+            started.append(self)
+
+        def start(self):
+            pass
+
+        def stop(self):
+            pass
+
+    monkeypatch.setattr(predict_module, "DriftMonitor", _Monitor)
+    monkeypatch.setattr(predict_module, "_drift_monitor", None)
+    bundle = {"feature_profile": {}}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        monitors = list(pool.map(lambda _: predict_module.get_drift_monitor(bundle), range(16)))
+
+    assert len(started) == 1
+    assert all(monitor is started[0] for monitor in monitors)
@@ -0,0 +1,80 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from src.models import predict as predict_module
+from src.models.cascade import CascadeClassifier
+from src.models.packed_forest import PackedForest, QuantizedForest
+from src.models.quantize import quantization_parity, quantize_bundle
+
+
+def _data(n_rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    # Rounded like clinical measurements, so many rows sit on split values
+    X = np.round(rng.normal(size=(n_rows, 5)), 1)
+    y = (X[:, 0] + 0.5 * X[:, 1] + 0.3 * rng.normal(size=n_rows) > 0).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize("thresholds", ["float32", "codebook"])
+def test_exact_thresholds_keep_every_leaf(thresholds):
+    X, y = _data()
+    forest = RandomForestClassifier(n_estimators=30, random_state=0).fit(X, y)
+    X_new = np.vstack([X, np.random.default_rng(1).normal(size=(500, 5))])
+
+    quantized = QuantizedForest(forest, thresholds=thresholds, value_bits=8)
+
+    reference = forest.predict_proba(X_new)
+    assert np.abs(quantized.predict_proba(X_new) - reference).max() <= 0.5 / 255 + 1e-12
+    np.testing.assert_allclose(
+        QuantizedForest(forest, thresholds=thresholds, value_bits=16).predict_proba(X_new), reference, atol=1e-5
+    )
+    assert quantized.nodes["feature"].dtype == np.uint8
+    if thresholds == "codebook":
+        assert quantized.nodes["threshold"].dtype in (np.uint8, np.uint16)
+    assert quantized.nbytes < PackedForest(forest).nbytes / 2
+
+
+def test_float16_thresholds_round_down():
+    X, y = _data()
+    forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+
+    quantized = QuantizedForest(forest, thresholds="float16")
+
+    raw = np.concatenate([tree.tree_.threshold for tree in forest.estimators_])
+    assert quantized.nodes["threshold"].dtype == np.float16
+    assert np.all(quantized.nodes["threshold"].astype(np.float64) <= raw)
+    assert np.mean(quantized.predict(X) == forest.predict(X)) > 0.98
+
+
+def test_quantized_bundle_serves_through_predict(tmp_path, monkeypatch):
+    X, y = _data()
+    columns = [f"f{i}" for i in range(5)]
+    frame = pd.DataFrame(X, columns=columns)
+    cascade = CascadeClassifier(
+        LogisticRegression(), RandomForestClassifier(n_estimators=20, random_state=0), lower=0.2, upper=0.8
+    ).fit(X, y)
+    bundle = {"model": cascade, "raw_feature_names": columns, "anytime_forest": {"batch_size": 10}}
+
+    quantized = quantize_bundle(bundle)
+
+    assert isinstance(quantized["model"].slow_, QuantizedForest)
+    assert quantized["model"].fast_.coef_.dtype == np.float32
+    assert cascade.fast_.coef_.dtype == np.float64
+    assert "anytime_forest" not in quantized
+    parity = quantization_parity(cascade, quantized["model"], X, y)
+    assert parity["label_agreement"] > 0.99
+
+    path = tmp_path / "model_quantized.pkl"
+    joblib.dump(quantized, path)
+    monkeypatch.setenv("MODEL_PATH", str(path))
+    monkeypatch.setattr(predict_module, "_bundle", None)
+    monkeypatch.setattr(predict_module, "get_drift_monitor", lambda bundle: None)
+    result = predict_module.predict(dict(zip(columns, X[0])))
+
+    expected = quantized["model"].predict_proba(frame.iloc[[0]].to_numpy())
+    assert result["prediction"] == int(np.argmax(expected))
+    assert np.isclose(result["confidence"], expected.max())
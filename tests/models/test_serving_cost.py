@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from src.models.serving_cost import (measure_serving_cost, pareto_frontier,
+                                     select_within_budget, write_serving_report)
+
+CANDIDATES = {
+    "fast": {"roc_auc": 0.85, "accuracy": 0.80, "p50_ms": 1.0, "p99_ms": 2.0, "batch_ms": 3.0,
+             "artifact_mb": 0.01, "rss_mb": 150.0},
+    "slow": {"roc_auc": 0.90, "accuracy": 0.84, "p50_ms": 8.0, "p99_ms": 12.0, "batch_ms": 30.0,
+             "artifact_mb": 5.0, "rss_mb": 190.0},
+    "dominated": {"roc_auc": 0.84, "accuracy": 0.79, "p50_ms": 5.0, "p99_ms": 9.0, "batch_ms": 9.0,
+                  "artifact_mb": 1.0, "rss_mb": 160.0},
+}
+
+
+def test_pareto_frontier_drops_dominated_models():
+    assert pareto_frontier(CANDIDATES) == ["fast", "slow"]
+
+
+def test_selection_respects_the_budget():
+    assert select_within_budget(CANDIDATES, {})[0] == "slow"
+
+    best, violations = select_within_budget(CANDIDATES, {"max_p99_ms": 10, "max_rss_mb": None})
+    assert best == "fast"
+    assert violations["slow"] == ["p99_ms=12.00 > 10"]
+    assert violations["fast"] == []
+
+    # Nothing fits: fall back to the cheapest model
+    assert select_within_budget(CANDIDATES, {"max_rss_mb": 100})[0] == "fast"
+
+
+def test_score_ties_go_to_the_smaller_artifact_not_the_noisier_p99():
+    candidates = {
+        "plain": dict(CANDIDATES["fast"], p99_ms=2.1),
+        "padded": dict(CANDIDATES["fast"], p99_ms=1.9, artifact_mb=0.8, rss_mb=157.0),
+    }
+
+    assert select_within_budget(candidates, {})[0] == "plain"
+    assert select_within_budget(candidates, {"max_p99_ms": 1.0})[0] == "plain"
+
+
+def test_serving_report_lists_the_frontier(tmp_path):
+    _, violations = select_within_budget(CANDIDATES, {"max_p99_ms": 10})
+    path = tmp_path / "report.txt"
+
+    write_serving_report(CANDIDATES, violations, "fast", str(path))
+
+    text = path.read_text()
+    assert text.startswith("selected_model=fast")
+    assert "slow exceeds the budget: p99_ms=12.00 > 10" in text
+    frontier = text.split("Pareto frontier")[1]
+    assert "fast:" in frontier and "slow:" in frontier and "dominated:" not in frontier
+
+
+def test_measure_serving_cost():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(50, 3)), columns=["a", "b", "c"])
+    model = LogisticRegression().fit(X, (X["a"] > 0).astype(int))
+
+    cost = measure_serving_cost(model, X, n_single=20, batch_size=100, n_batches=2)
+
+    assert 0 < cost["p50_ms"] <= cost["p99_ms"]
+    assert cost["batch_ms"] > 0 and cost["batch_rows_per_s"] > 0
+    assert cost["artifact_mb"] > 0
+    assert cost["rss_mb"] > 0 and cost["rss_mb"] >= cost["model_memory_mb"]
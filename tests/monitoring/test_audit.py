@@ -0,0 +1,54 @@
+import gzip
+import json
+import threading
+
+from src.monitoring.audit import AuditSink
+
+
+def _read_records(directory):
+    records = []
+    for path in sorted(directory.iterdir()):
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def test_records_are_written_as_jsonl_and_compressed_on_close(tmp_path):
+    sink = AuditSink(str(tmp_path), flush_interval=0.05)
+    for i in range(25):
+        assert sink.submit({"request_id": f"r{i}", "output": {"prediction": i % 2}})
+    sink.close()
+
+    assert all(path.name.endswith(".jsonl.gz") for path in tmp_path.iterdir())
+    records = _read_records(tmp_path)
+    assert [r["request_id"] for r in records] == [f"r{i}" for i in range(25)]
+
+
+def test_files_rotate_by_size(tmp_path):
+    sink = AuditSink(str(tmp_path), batch_size=10, flush_interval=0.05, max_bytes=200)
+    for i in range(100):
+        sink.submit({"request_id": f"r{i}", "inputs": {"age": 60}})
+    sink.close()
+
+    assert len(list(tmp_path.iterdir())) > 1
+    assert len(_read_records(tmp_path)) == 100
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    release = threading.Event()
+    sink = AuditSink(str(tmp_path), max_queue=5, batch_size=1, flush_interval=0.05)
+    original_write = sink._write
+
+    def slow_write(batch):
+        release.wait()
+        original_write(batch)
+
+    sink._write = slow_write
+    accepted = [sink.submit({"request_id": f"r{i}"}) for i in range(50)]
+    release.set()
+    sink.close()
+
+    assert not all(accepted)
+    assert sink.dropped == accepted.count(False)
+    assert len(_read_records(tmp_path)) == accepted.count(True)
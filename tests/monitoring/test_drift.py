@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+from prometheus_client import REGISTRY
+
+from src.monitoring.drift import DriftMonitor, build_feature_profile
+
+
+def _training_frame(n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "age": rng.normal(55, 9, n_rows),
+            "cp": rng.integers(1, 5, n_rows).astype(float),
+            "ca": np.where(rng.random(n_rows) < 0.05, np.nan, rng.integers(0, 4, n_rows)),
+        }
+    )
+
+
+def test_profile_bins_cover_training_data():
+    df = _training_frame()
+    profile = build_feature_profile(df)
+
+    assert profile["columns"] == ["age", "cp", "ca"]
+    # Low-cardinality columns get one bucket per value, plus one for missing
+    assert profile["features"]["cp"]["edges"] == [1.5, 2.5, 3.5]
+    assert profile["features"]["ca"]["counts"][-1] == df["ca"].isna().sum()
+    for spec in profile["features"].values():
+        assert sum(spec["counts"]) == len(df)
+
+
+def test_single_and_batch_observations_agree():
+    profile = build_feature_profile(_training_frame())
+    live = _training_frame(300, seed=1)
+
+    single = DriftMonitor(profile)
+    for record in live.to_dict(orient="records"):
+        single.observe(record)
+    batch = DriftMonitor(profile)
+    batch.observe_array(live[["ca", "age", "cp"]].to_numpy(), columns=["ca", "age", "cp"])
+
+    np.testing.assert_array_equal(single._counts, batch._counts)
+    assert single._n == batch._n == 300
+
+
+def test_drift_scores_detect_shift_and_publish_gauges():
+    profile = build_feature_profile(_training_frame())
+    monitor = DriftMonitor(profile, min_samples=100)
+
+    monitor.observe_array(_training_frame(1000, seed=2).to_numpy(), columns=["age", "cp", "ca"])
+    stable = monitor.compute()
+    assert stable["age"]["psi"] < 0.05 and stable["age"]["ks"] < 0.1
+
+    shifted = _training_frame(1000, seed=3)
+    shifted["age"] += 15
+    monitor.observe_array(shifted.to_numpy(), columns=["age", "cp", "ca"])
+    drifted = monitor.compute()
+
+    assert drifted["age"]["psi"] > 1.0 and drifted["age"]["ks"] > 0.5
+    assert drifted["cp"]["psi"] < 0.05
+    assert REGISTRY.get_sample_value("feature_drift_psi", {"feature": "age"}) == drifted["age"]["psi"]
+    assert REGISTRY.get_sample_value("feature_drift_window_size") == 1000
+
+
+def test_small_windows_keep_accumulating():
+    monitor = DriftMonitor(build_feature_profile(_training_frame()), min_samples=100)
+    monitor.observe({"age": 50.0, "cp": 2.0, "ca": None})
+
+    assert monitor.compute() == {}
+    assert monitor._n == 1
+    assert "age" in monitor.compute(force=True)
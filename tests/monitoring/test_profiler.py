@@ -0,0 +1,43 @@
+import threading
+
+import pytest
+
+from src.monitoring import profiler
+
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=_spin, args=(stop,), daemon=True)
+    thread.start()
+    return thread, stop
+
+
+def test_capture_finds_busy_function_and_skips_idle_threads():
+    thread, stop = _busy_thread()
+    waiter = threading.Thread(target=threading.Event().wait, args=(1.0,), daemon=True)
+    waiter.start()
+    try:
+        capture = profiler.sample_stacks(0.3, interval=0.002)
+    finally:
+        stop.set()
+        thread.join()
+
+    top = profiler.top_functions(capture["stacks"], prefixes=(__name__,))
+    assert top[0]["function"] == f"{__name__}:_spin"
+    assert top[0]["total"] > 0 and top[0]["total_pct"] > 50
+    assert capture["idle"] > 0
+
+    folded = profiler.collapsed_stacks(capture["stacks"]).splitlines()
+    assert any(line.rsplit(" ", 1)[0].endswith(f"{__name__}:_spin") for line in folded)
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in folded)
+
+
+def test_only_one_capture_at_a_time():
+    with profiler._capture_lock:
+        with pytest.raises(profiler.CaptureInProgress):
+            profiler.sample_stacks(0.01)
@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+
+from src.pipeline.runner import PipelineRunner, Stage
+
+
+def _writer(path, text, calls):
+    def run():
+        calls.append(path.name)
+        path.write_text(text)
+
+    return run
+
+
+def _copier(src, dst, calls):
+    def run():
+        calls.append(dst.name)
+        dst.write_text(src.read_text().upper())
+
+    return run
+
+
+def _build(tmp_path, calls):
+    raw = tmp_path / "raw.txt"
+    clean = tmp_path / "clean.txt"
+    raw.write_text("rows")
+    stages = [
+        Stage(
+            name="preprocess",
+            func=_copier(raw, clean, calls),
+            inputs=[str(raw)],
+            outputs=[str(clean)],
+        ),
+        Stage(
+            name="report",
+            func=_copier(clean, tmp_path / "report.txt", calls),
+            inputs=[str(clean)],
+            outputs=[str(tmp_path / "report.txt")],
+            deps=["preprocess"],
+        ),
+    ]
+    runner = PipelineRunner(
+        stages, state_path=str(tmp_path / "state.json"), executor="thread"
+    )
+    return runner, raw
+
+
+def test_second_run_skips_up_to_date_stages(tmp_path):
+    """
+    Stages whose inputs are unchanged are not executed again.
+    """
+    calls = []
+    runner, _ = _build(tmp_path, calls)
+
+    assert runner.run() == {"preprocess": "ran", "report": "ran"}
+    assert runner.run() == {"preprocess": "skipped", "report": "skipped"}
+    assert calls == ["clean.txt", "report.txt"]
+
+
+def test_changed_input_reruns_downstream(tmp_path):
+    """
+    Editing the raw input invalidates the stage and everything after it.
+    """
+    calls = []
+    runner, raw = _build(tmp_path, calls)
+    runner.run()
+
+    raw.write_text("more rows")
+    assert runner.run() == {"preprocess": "ran", "report": "ran"}
+    assert (tmp_path / "report.txt").read_text() == "MORE ROWS"
+
+
+def test_missing_output_and_force_trigger_rerun(tmp_path):
+    """
+    Deleted outputs or force=True cause the stage to run again.
+    """
+    calls = []
+    runner, _ = _build(tmp_path, calls)
+    runner.run()
+
+    (tmp_path / "report.txt").unlink()
+    assert runner.run() == {"preprocess": "skipped", "report": "ran"}
+    assert runner.run(targets=["preprocess"], force=True) == {"preprocess": "ran"}
+
+
+def test_independent_stages_run_concurrently(tmp_path):
+    """
+    Two stages with no dependency between them execute at the same time.
+    """
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_then_write(path):
+        def run():
+            barrier.wait()
+            path.write_text("done")
+
+        return run
+
+    stages = [
+        Stage(name="eda", func=wait_then_write(tmp_path / "eda.png"), outputs=[str(tmp_path / "eda.png")]),
+        Stage(name="train", func=wait_then_write(tmp_path / "model.pkl"), outputs=[str(tmp_path / "model.pkl")]),
+    ]
+    runner = PipelineRunner(
+        stages, state_path=str(tmp_path / "state.json"), max_workers=2, executor="thread"
+    )
+
+    assert runner.run() == {"eda": "ran", "train": "ran"}
+
+
+def test_unknown_dependency_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        PipelineRunner(
+            [Stage(name="train", func=lambda: None, deps=["missing"])],
+            state_path=str(tmp_path / "state.json"),
+        )
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from src.data.load_data import save_processed_increment
+from src.pipeline.runner import PipelineRunner
+from src.pipeline.stages import build_stages
+from src.utils.config import load_config
+
+
+def test_train_stage_reruns_when_increments_arrive(tmp_path):
+    config = load_config()
+    config["data"]["increments_path"] = str(tmp_path / "increments")
+
+    def train_fingerprint():
+        stages = build_stages(config)
+        runner = PipelineRunner(stages, state_path=str(tmp_path / "state.json"))
+        return runner.fingerprint(next(stage for stage in stages if stage.name == "train"))
+
+    before = train_fingerprint()
+    save_processed_increment(pd.DataFrame({"age": [50.0], "target": [1]}), config["data"]["increments_path"], "v1")
+
+    assert train_fingerprint() != before
+
+
+def test_download_stage_trusts_existing_outputs_only_when_pinned():
+    config = load_config()
+
+    def download_stage():
+        return next(stage for stage in build_stages(config) if stage.name == "download")
+
+    assert not download_stage().trust_existing_outputs
+    for spec in config["download"]["sources"].values():
+        spec["sha256"] = "0" * 64
+    assert download_stage().trust_existing_outputs
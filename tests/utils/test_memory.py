@@ -0,0 +1,40 @@
+import tracemalloc
+
+import numpy as np
+
+from src.utils.memory import MemoryTracker, recommend_limits, write_memory_report
+
+
+def test_stages_record_peak_and_retained_allocations():
+    memory = MemoryTracker()
+    kept = []
+
+    with memory.stage("outer"):
+        with memory.stage("temporary"):
+            np.ones(4_000_000).sum()  # ~32 MB freed before the stage ends
+        with memory.stage("retained"):
+            kept.append(np.ones(1_000_000))  # ~8 MB still alive afterwards
+
+    temporary, retained, outer = memory.stages["temporary"], memory.stages["retained"], memory.stages["outer"]
+    assert temporary["peak_alloc_mb"] > 25 and temporary["retained_alloc_mb"] < 1
+    assert 6 < retained["retained_alloc_mb"] < 10
+    # The inner peak counts towards the enclosing stage
+    assert outer["peak_alloc_mb"] >= temporary["peak_alloc_mb"]
+    assert outer["peak_rss_mb"] >= temporary["peak_rss_mb"]
+    # Tracing only runs inside stages
+    assert not tracemalloc.is_tracing()
+    assert memory.metrics()["memory_retained_retained_alloc_mb"] == retained["retained_alloc_mb"]
+
+
+def test_recommendation_and_report(tmp_path):
+    recommendation = recommend_limits(steady_rss_mb=180, request_peak_mb=10, concurrency=4)
+
+    assert recommendation["request_mi"] == 256  # 180 * 1.25 = 225, rounded up to 64
+    assert recommendation["limit_mi"] == 384  # (180 + 40) * 1.5 = 330
+    assert recommendation["working_set_mb"] == 220
+
+    path = tmp_path / "memory_report.txt"
+    write_memory_report({"load": {"rss_mb": 100.0}}, {"steady_rss_mb": 180.0}, recommendation, 300.0, str(path))
+    text = path.read_text()
+    assert "load: rss_mb=100.0" in text
+    assert "requests.memory=256Mi limits.memory=384Mi" in text
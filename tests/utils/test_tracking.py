@@ -0,0 +1,84 @@
+import mlflow
+import pytest
+from mlflow.tracking import MlflowClient
+
+from src.utils import tracking
+from src.utils.tracking import BatchedMlflowLogger, batched_run
+
+
+@pytest.fixture
+def file_store(tmp_path):
+    """
+    Point MLflow at a throwaway local file store for the duration of a test.
+    """
+    previous_uri = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri(f"file://{tmp_path / 'mlruns'}")
+    mlflow.set_experiment("tracking-tests")
+    yield MlflowClient()
+    mlflow.set_tracking_uri(previous_uri)
+
+
+def test_batched_run_logs_params_metrics_tags_and_artifacts(file_store, tmp_path):
+    """
+    Everything logged through the tracker ends up on the run once it closes.
+    """
+    artifact = tmp_path / "cv_results.csv"
+    artifact.write_text("fold,score\n0,0.9\n")
+
+    with batched_run(run_name="unit") as tracker:
+        tracker.log_params({"C": 1.0, "solver": "liblinear"})
+        tracker.log_metric("cv_accuracy", 0.85)
+        tracker.set_tag("stage", "cv")
+        tracker.log_artifact(str(artifact))
+        run_id = tracker.run_id
+
+    run = file_store.get_run(run_id)
+    assert run.data.params == {"C": "1.0", "solver": "liblinear"}
+    assert run.data.metrics["cv_accuracy"] == pytest.approx(0.85)
+    assert run.data.tags["stage"] == "cv"
+    assert [f.path for f in file_store.list_artifacts(run_id)] == ["cv_results.csv"]
+
+
+def test_buffered_values_are_sent_in_a_single_batch(file_store, monkeypatch):
+    """
+    Many params and metrics collapse into one log_batch round trip.
+    """
+    calls = []
+
+    with mlflow.start_run() as run:
+        tracker = BatchedMlflowLogger(run.info.run_id)
+        original = tracker.client.log_batch
+
+        def counting_log_batch(*args, **kwargs):
+            calls.append(kwargs)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(tracker.client, "log_batch", counting_log_batch)
+        tracker.log_params({f"p{i}": i for i in range(10)})
+        tracker.log_metrics({f"m{i}": i for i in range(10)})
+        tracker.close()
+
+    assert len(calls) == 1
+    assert len(calls[0]["params"]) == 10
+    assert len(calls[0]["metrics"]) == 10
+
+
+def test_flush_respects_batch_limits(file_store, monkeypatch):
+    """
+    Buffers larger than the server limits are split across requests.
+    """
+    monkeypatch.setattr(tracking, "MAX_PARAMS_PER_BATCH", 3)
+    sizes = []
+
+    with mlflow.start_run() as run:
+        tracker = BatchedMlflowLogger(run.info.run_id)
+        monkeypatch.setattr(
+            tracker.client,
+            "log_batch",
+            lambda run_id, metrics, params, tags: sizes.append(len(params)),
+        )
+        tracker.log_params({f"p{i}": i for i in range(7)})
+        tracker.close()
+
+    assert sum(sizes) == 7
+    assert max(sizes) <= 3